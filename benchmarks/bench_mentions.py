@@ -0,0 +1,98 @@
+"""Benchmark name-mention matching: per-name ``in`` scans vs. Aho-Corasick.
+
+The name list is the NER organizations and people plus company and person
+names harvested from the corpus itself, up to ``--names`` entries, so the
+automaton is exercised with thousands of patterns that really occur.
+
+    python benchmarks/bench_mentions.py [--names 5000] [--limit 3000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from declaration_store import open_source
+from full_pipeline.mentions import MentionMatcher, ahocorasick
+
+_NAME_RE = re.compile(r"<(?:nom|nomSociete|nomStructure)>([^<]{3,60})</")
+
+
+def load_texts(source_path: Path, limit: int) -> list[str]:
+    source = open_source(source_path)
+    names = source.names()[:limit]
+    return [source.read(name).decode("utf-8", errors="ignore") for name in names]
+
+
+def build_names(texts: list[str], count: int) -> list[str]:
+    """Return NER names topped up with names found in ``texts``."""
+    names = pd.read_csv("avis/NER/organizations.csv")["name"].dropna().tolist()
+    names += pd.read_csv("avis/NER/people.csv")["name"].dropna().tolist()
+    seen = set(names)
+    for text in texts:
+        if len(names) >= count:
+            break
+        for match in _NAME_RE.finditer(text):
+            name = " ".join(match.group(1).split())
+            if name and name not in seen:
+                seen.add(name)
+                names.append(name)
+    return names[:count]
+
+
+def naive(names: list[str], texts: list[str]) -> list[set]:
+    return [{name for name in names if name in text} for text in texts]
+
+
+def automaton(names: list[str], texts: list[str], use_c: bool) -> list[set]:
+    matcher = MentionMatcher(names, use_c=use_c)
+    return [matcher.find(text) for text in texts]
+
+
+def best_of(repeat: int, func, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=Path, default=Path("split_declarations"))
+    parser.add_argument("--names", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=3000, help="Declarations to scan")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = load_texts(args.source, args.limit)
+    names = build_names(texts, args.names)
+    print(f"{len(texts)} declarations, {len(names)} names (best of {args.repeat})")
+
+    runs = {
+        "name in text": lambda: naive(names, texts),
+        "aho-corasick (python)": lambda: automaton(names, texts, use_c=False),
+    }
+    if ahocorasick is not None:
+        runs["aho-corasick (pyahocorasick)"] = lambda: automaton(names, texts, use_c=True)
+
+    baseline = None
+    for label, run in runs.items():
+        elapsed, hits = best_of(args.repeat, run)
+        if baseline is None:
+            baseline, expected = elapsed, hits
+        elif hits != expected:
+            raise SystemExit(f"{label} found different mentions")
+        print(f"{label:<30} {elapsed:7.2f}s  x{baseline / elapsed:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
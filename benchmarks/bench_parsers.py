@@ -0,0 +1,66 @@
+"""Benchmark the ElementTree and lxml backends on the record extractors.
+
+Every declaration is parsed and run through all five record extractors
+with each backend; the run fails if the backends disagree on any record.
+
+    python benchmarks/bench_parsers.py [--source split_declarations] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from declaration_store import open_source
+from full_pipeline.backends import get_backend, lxml_etree
+
+
+def extract_all(backend, documents) -> list:
+    rows = []
+    for name, data in documents:
+        root = backend.parse_declaration(name, data)
+        rows.append(
+            (
+                backend.personal_info_record(root, name),
+                backend.spouse_activity_records(root, name),
+                backend.stock_records(root),
+                list(backend.financial_participation_records(root, name)),
+                backend.external_role_records(root, name),
+            )
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=Path, default=Path("split_declarations"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if lxml_etree is None:
+        raise SystemExit("lxml is not installed; nothing to compare")
+
+    documents = list(open_source(args.source))
+    results = {}
+    for name in ("etree", "lxml"):
+        backend = get_backend(name)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            rows = extract_all(backend, documents)
+            best = min(best, time.perf_counter() - start)
+        results[name] = (best, rows)
+
+    if results["etree"][1] != results["lxml"][1]:
+        raise SystemExit("Backends produced different records")
+    print(f"{len(documents)} declarations, identical records (best of {args.repeat})")
+    baseline = results["etree"][0]
+    for name, (elapsed, _) in results.items():
+        print(f"{name:<6} {elapsed:7.2f}s  x{baseline / elapsed:4.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Measure throughput and peak memory of the main stages across corpus sizes.
+
+For each ``--sizes`` entry a synthetic corpus (``synthetic_corpus.py``) is
+generated once as a bulk dump and as split files under ``--workdir``, then
+every stage runs in a fresh process so its peak RSS is its own:
+
+* ``split``: ``split_declarations_raw`` on the bulk dump;
+* ``pipeline``: ``DeclarationPipeline.run`` with the NER name lists;
+* ``stocks``: stock and personal-info extraction, ``normalize_stocks`` and
+  ``build_person_reports``;
+* ``mentions``: ``MentionMatcher.find`` over every split file.
+
+Results are written as JSON to ``--output``; ``--compare`` prints the time
+and memory ratios against an earlier results file.
+
+    python benchmarks/bench_scaling.py --sizes 1000 10000 50000 --workdir /tmp/scaling
+    python benchmarks/bench_scaling.py --compare scaling_results.json --output new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from queue import Empty
+
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+# Allow running the script directly without installing the package.
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "benchmarks"))
+from synthetic_corpus import SyntheticCorpus
+
+STAGES = ("split", "pipeline", "stocks", "mentions")
+
+
+def _ner_names() -> tuple[list[str], list[str]]:
+    import pandas as pd
+
+    ner = ROOT / "avis" / "NER"
+    return (
+        pd.read_csv(ner / "organizations.csv")["name"].dropna().tolist(),
+        pd.read_csv(ner / "people.csv")["name"].dropna().tolist(),
+    )
+
+
+def _dir_bytes(directory: Path) -> int:
+    return sum(p.stat().st_size for p in directory.glob("*.xml"))
+
+
+def stage_split(corpus: Path, scratch: Path) -> dict:
+    from script_to_split_declarations import split_declarations_raw
+
+    bulk = corpus / "declarations.xml"
+    start = time.perf_counter()
+    count = split_declarations_raw(str(bulk), str(scratch / "split"))
+    return {"seconds": time.perf_counter() - start, "files": count, "bytes": bulk.stat().st_size}
+
+
+def stage_pipeline(corpus: Path, scratch: Path) -> dict:
+    from full_pipeline import DeclarationPipeline
+
+    split = corpus / "split"
+    organizations, people = _ner_names()
+    start = time.perf_counter()
+    pipeline = DeclarationPipeline(split, organizations, people)
+    data = pipeline.run()
+    seconds = time.perf_counter() - start
+    records = sum(len(df) for df in vars(data).values())
+    files = len(data.personal_info)
+    return {"seconds": seconds, "files": files, "bytes": _dir_bytes(split), "records": records}
+
+
+def stage_stocks(corpus: Path, scratch: Path) -> dict:
+    from full_pipeline import DeclarationPipeline
+    from stock_analysis.generate_person_stock_report import build_person_reports
+    from stock_analysis.normalize_stocks import normalize_stocks
+
+    split = corpus / "split"
+    start = time.perf_counter()
+    data = DeclarationPipeline(split, datasets=("personal_info", "stocks")).run()
+    stocks = normalize_stocks(data.stocks)
+    report, _ = build_person_reports(stocks, data.personal_info[["uuid", "nom", "prenom"]])
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "files": len(data.personal_info),
+        "bytes": _dir_bytes(split),
+        "records": len(stocks) + len(report),
+    }
+
+
+def stage_mentions(corpus: Path, scratch: Path) -> dict:
+    from full_pipeline.mentions import MentionMatcher
+
+    paths = sorted((corpus / "split").glob("*.xml"))
+    texts = [p.read_text(encoding="utf-8", errors="ignore") for p in paths]
+    organizations, people = _ner_names()
+    start = time.perf_counter()
+    matcher = MentionMatcher(organizations + people)
+    hits = sum(len(matcher.find(text)) for text in texts)
+    return {
+        "seconds": time.perf_counter() - start,
+        "files": len(texts),
+        "bytes": sum(len(text.encode("utf-8")) for text in texts),
+        "records": hits,
+    }
+
+
+def _run_stage(name: str, corpus: str, scratch: str, queue) -> None:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        result = globals()[f"stage_{name}"](Path(corpus), Path(scratch))
+    except Exception:
+        queue.put({"error": traceback.format_exc()})
+        return
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    unit = 1 if sys.platform == "darwin" else 1024
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20
+    result["start_rss_mb"] = baseline * unit / 2**20
+    queue.put(result)
+
+
+def measure(name: str, corpus: Path) -> dict:
+    """Run stage ``name`` on ``corpus`` in a fresh process and return its result."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    with tempfile.TemporaryDirectory() as scratch:
+        process = context.Process(target=_run_stage, args=(name, str(corpus), scratch, queue))
+        process.start()
+        result = None
+        # Poll so that a child killed before reporting (e.g. out of memory)
+        # does not leave the parent waiting forever; whatever a dead child
+        # put is already readable, so the get after it exits still sees it.
+        while result is None:
+            alive = process.is_alive()
+            try:
+                result = queue.get(timeout=1)
+            except Empty:
+                if not alive:
+                    break
+        process.join()
+    if result is None:
+        raise SystemExit(f"Stage {name} failed with exit code {process.exitcode}")
+    if "error" in result:
+        raise SystemExit(f"Stage {name} failed:\n{result['error']}")
+    seconds = max(result["seconds"], 1e-9)
+    result["files_per_s"] = result["files"] / seconds
+    result["mb_per_s"] = result["bytes"] / 2**20 / seconds
+    return result
+
+
+def prepare_corpus(workdir: Path, size: int, seed: int, attachments: float) -> Path:
+    """Generate (or reuse) the bulk and split corpora for ``size`` declarations."""
+    corpus = workdir / f"n{size}-s{seed}-a{attachments:g}"
+    done = corpus / ".complete"
+    if not done.exists():
+        generator = SyntheticCorpus(seed, attachments)
+        generator.write_bulk(corpus / "declarations.xml", size)
+        generator.write_split(corpus / "split", size)
+        done.touch()
+    return corpus
+
+
+def compare(results: dict, previous: dict) -> None:
+    print(f"\nCompared with {previous['meta']['created']}: time and peak RSS ratios (new / old)")
+    old = {(r["size"], r["stage"]): r for r in previous["results"]}
+    for row in results["results"]:
+        before = old.get((row["size"], row["stage"]))
+        if before is None:
+            continue
+        time_ratio = row["seconds"] / max(before["seconds"], 1e-9)
+        rss_ratio = row["peak_rss_mb"] / max(before["peak_rss_mb"], 1e-9)
+        print(f"{row['stage']:<10} {row['size']:>8}  time x{time_ratio:5.2f}  rss x{rss_ratio:5.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--workdir", type=Path, help="Keep generated corpora here between runs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--attachments", type=float, default=0.0, help="Share with a payload")
+    parser.add_argument("--output", type=Path, default=Path("scaling_results.json"))
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare with")
+    args = parser.parse_args()
+
+    previous = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    results = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "attachments": args.attachments,
+        },
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or Path(tmp)
+        print(f"{'stage':<10} {'size':>8} {'seconds':>8} {'files/s':>9} {'MB/s':>7} {'peak MB':>8}")
+        for size in args.sizes:
+            corpus = prepare_corpus(workdir, size, args.seed, args.attachments)
+            for stage in args.stages:
+                row = {"stage": stage, "size": size, **measure(stage, corpus)}
+                results["results"].append(row)
+                print(
+                    f"{stage:<10} {size:>8} {row['seconds']:8.2f} {row['files_per_s']:9.0f} "
+                    f"{row['mb_per_s']:7.1f} {row['peak_rss_mb']:8.0f}"
+                )
+
+    with args.output.open("w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"\nResults written to {args.output}")
+    if previous is not None:
+        compare(results, previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark the ElementTree splitter against the raw byte-slice splitter.
+
+Without ``--input`` a bulk file is rebuilt from ``split_declarations/`` so
+the benchmark runs on the checked-in sample corpus. ``--workers`` adds runs
+of the parallel splitter with each given pool size.
+
+    python benchmarks/bench_split.py [--input declarations.xml] [--repeat 3] [--workers 2 4 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from declaration_store.spans import iter_declaration_spans
+from script_to_split_declarations import (
+    split_declarations,
+    split_declarations_parallel,
+    split_declarations_raw,
+)
+
+
+def build_bulk_file(decl_dir: Path, dest: Path) -> int:
+    """Concatenate split declaration files back into one bulk dump."""
+    count = 0
+    with dest.open("wb") as out:
+        out.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<declarations>')
+        for path in sorted(decl_dir.glob("*.xml")):
+            with path.open("rb") as f:
+                for _, data in iter_declaration_spans(f):
+                    out.write(data)
+                    out.write(b"\n\t")
+                    count += 1
+        out.write(b"</declarations>\n")
+    return count
+
+
+def time_split(name: str, split, input_file: Path, workdir: Path, repeat: int) -> float:
+    best = float("inf")
+    for i in range(repeat):
+        out = workdir / f"{name}-{i}"
+        start = time.perf_counter()
+        split(str(input_file), str(out))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare_outputs(left: Path, right: Path) -> tuple[int, int]:
+    """Return ``(files, byte_identical)`` for two split directories."""
+    names = sorted(p.name for p in left.glob("*.xml"))
+    if names != sorted(p.name for p in right.glob("*.xml")):
+        raise SystemExit("Splitters produced different file sets")
+    same = sum((left / n).read_bytes() == (right / n).read_bytes() for n in names)
+    return len(names), same
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, help="Bulk declarations.xml to split")
+    parser.add_argument("--decl-dir", type=Path, default=Path("split_declarations"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="*", default=[])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        input_file = args.input
+        if input_file is None:
+            input_file = workdir / "declarations.xml"
+            build_bulk_file(args.decl_dir, input_file)
+        size_mb = input_file.stat().st_size / (1024 * 1024)
+
+        splits = {
+            "split_declarations": split_declarations,
+            "split_declarations_raw": split_declarations_raw,
+        }
+        for workers in args.workers:
+            splits[f"parallel_{workers}"] = partial(split_declarations_parallel, workers=workers)
+        results = {
+            name: time_split(name, split, input_file, workdir, args.repeat)
+            for name, split in splits.items()
+        }
+
+        files, same = compare_outputs(
+            workdir / "split_declarations-0", workdir / "split_declarations_raw-0"
+        )
+        for workers in args.workers:
+            n, identical = compare_outputs(
+                workdir / "split_declarations_raw-0", workdir / f"parallel_{workers}-0"
+            )
+            if identical != n:
+                raise SystemExit(f"Parallel split with {workers} workers differs from raw split")
+
+    print(f"\nInput: {size_mb:.1f} MB, {files} declarations (best of {args.repeat})")
+    for name, elapsed in results.items():
+        print(f"{name:<24} {elapsed:7.2f}s  {size_mb / elapsed:8.1f} MB/s")
+    baseline = results["split_declarations"]
+    for name, elapsed in results.items():
+        if name != "split_declarations":
+            print(f"Speed-up {name}: {baseline / elapsed:.1f}x")
+    print(f"Byte-identical outputs: {same}/{files}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""Generate synthetic HATVP declarations for scaling benchmarks.
+
+Declarations follow the layout of the real exports: the ``general`` block
+with the declarant, every interest section (``activProfCinqDerniereDto``,
+``activProfConjointDto``, ``mandatElectifDto``, ``participationDirigeantDto``,
+``participationFinanciereDto``, ...), occasional asset sections, and
+optionally ``attachedFiles`` carrying base64 payloads. Item counts, free-text
+lengths and the share of ``[Données non publiées]`` placeholders are drawn
+so that file sizes have roughly the median and tail of the checked-in
+corpus. Output is deterministic for a given seed.
+
+    python benchmarks/synthetic_corpus.py --count 100000 --output synthetic/declarations.xml
+    python benchmarks/synthetic_corpus.py --count 5000 --split synthetic/split --attachments 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import random
+import sys
+import uuid
+from pathlib import Path
+from typing import Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from declaration_store.spans import declaration_filename, wrap_declaration
+
+XML_HEADER = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+PLACEHOLDER = "\n            [Données non publiées]\n        "
+
+MALE_NAMES = [
+    "Jean", "Pierre", "Michel", "Alain", "Philippe", "Nicolas", "Christophe", "Patrick",
+    "François", "Laurent", "Éric", "Olivier", "Thierry", "Julien", "Sébastien", "Hervé",
+]
+FEMALE_NAMES = [
+    "Marie", "Nathalie", "Isabelle", "Sylvie", "Catherine", "Christine", "Sophie",
+    "Valérie", "Sandrine", "Anne", "Céline", "Hélène", "Agnès", "Brigitte", "Élodie",
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand",
+    "Leroy", "Moreau", "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "David",
+    "Bertrand", "Roux", "Vincent", "Fournier", "Morel", "Girard", "André", "Mercier",
+]
+COMPANIES = [
+    "TotalEnergies", "Air Liquide", "LVMH", "BNP Paribas", "Société Générale", "AXA",
+    "Orange", "Sanofi", "Engie", "Veolia", "Crédit Agricole", "Vinci", "Danone",
+    "Microsoft", "Amazon", "Accenture", "SCI Les Tilleuls", "SARL Dupont et Fils",
+    "Coopérative agricole du Val", "SAS Horizon Conseil", "EDF", "Bouygues",
+]
+ORGANIZATIONS = [
+    "Association des maires ruraux", "Fondation de France", "Croix-Rouge française",
+    "Secours populaire", "Club de football municipal", "Office de tourisme",
+    "Centre communal d'action sociale", "Syndicat intercommunal des eaux",
+]
+OCCUPATIONS = [
+    "Professeur des écoles", "Médecin généraliste", "Avocate", "Infirmière",
+    "Directeur commercial", "Ingénieur", "Assistante de direction", "Agent immobilier",
+    "Secrétaire médicale", "Chef d'entreprise", "Pharmacien", "Fonctionnaire territorial",
+    "Retraité", "Sans profession", "Architecte", "Comptable", "Notaire", "Agricultrice",
+]
+MANDATES = [
+    "Maire de {town}", "Conseiller municipal de {town}", "Adjoint au maire de {town}",
+    "Conseiller départemental", "Vice-président de la communauté de communes",
+    "Député", "Sénateur", "Conseiller régional",
+]
+TOWNS = [
+    "Soissons", "Lyon", "Rennes", "Bordeaux", "Lille", "Nantes", "Tours", "Metz",
+    "Pau", "Brest", "Nancy", "Dijon", "Angers", "Reims", "Nîmes", "Annecy",
+]
+ACTIVITIES = [
+    "Holding", "Conseil en gestion", "Enseignement privé", "Société civile immobilière",
+    "Commerce de détail", "Production audiovisuelle", "Exploitation agricole",
+]
+WORDS = (
+    "mandat en cours depuis le pas de rémunération indemnité mensuelle nette fonction "
+    "exercée à titre bénévole démission des fonctions de président cession des parts "
+    "sociales au profit de la société gérant associé administrateur membre du conseil "
+    "de surveillance versement de dividendes pour l'année frais de déplacement"
+).split()
+
+SECTIONS = [
+    "activConsultantDto",
+    "activProfCinqDerniereDto",
+    "activProfConjointDto",
+    "fonctionBenevoleDto",
+    "mandatElectifDto",
+    "participationDirigeantDto",
+    "participationFinanciereDto",
+    "activCollaborateursDto",
+    "observationInteretDto",
+]
+ASSET_SECTIONS = [
+    "immeubleDto", "sciDto", "valeursNonEnBourseDto", "valeursEnBourseDto",
+    "assuranceVieDto", "comptesBancaireDto", "bienDiverDto", "vehiculeDto",
+    "fondDto", "autreBienDto", "bienEtrangerDto", "passifDto",
+]
+
+
+def _element(tag: str, text: Optional[str], indent: str) -> str:
+    if not text:
+        return f"{indent}<{tag} />\n"
+    return f"{indent}<{tag}>{escape(text)}</{tag}>\n"
+
+
+class SyntheticCorpus:
+    """Deterministic generator of HATVP-like declarations.
+
+    ``attachments`` is the share of declarations carrying a base64 payload of
+    about ``attachment_size`` decoded bytes; ``assets`` the share that also
+    have the asset (patrimoine) sections.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        attachments: float = 0.0,
+        attachment_size: int = 60_000,
+        assets: float = 0.01,
+    ) -> None:
+        self.seed = seed
+        self.attachments = attachments
+        self.attachment_size = attachment_size
+        self.assets = assets
+
+    # -- values -----------------------------------------------------------
+
+    @staticmethod
+    def _count(rng: random.Random, mean: float) -> int:
+        """Item count with a long tail, like the real sections."""
+        return min(int(rng.expovariate(1 / mean)) if mean else 0, 40)
+
+    @staticmethod
+    def _sentence(rng: random.Random, mean_words: float) -> str:
+        n = max(1, int(rng.lognormvariate(0, 0.8) * mean_words))
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+
+    @staticmethod
+    def _maybe_hidden(rng: random.Random, value: str, rate: float) -> str:
+        return PLACEHOLDER if rng.random() < rate else value
+
+    def _remuneration(self, rng: random.Random, indent: str) -> str:
+        lines = [f"{indent}<remuneration>\n", _element("brutNet", rng.choice(["Brut", "Net"]), indent + "\t")]
+        years = self._count(rng, 3)
+        if years:
+            lines.append(f"{indent}\t<montant>\n")
+            first = rng.randint(2012, 2022)
+            base = rng.choice([0, 0, 1200, 8500, 24000, 65000, 182000])
+            for year in range(first, first + years):
+                lines.append(f"{indent}\t\t<montant>\n")
+                lines.append(_element("annee", str(year), indent + "\t\t\t"))
+                lines.append(_element("montant", str(int(base * rng.uniform(0.8, 1.2))), indent + "\t\t\t"))
+                lines.append(f"{indent}\t\t</montant>\n")
+            lines.append(f"{indent}\t</montant>\n")
+        lines.append(f"{indent}</remuneration>\n")
+        return "".join(lines)
+
+    def _period(self, rng: random.Random, indent: str) -> str:
+        start = rng.randint(2000, 2022)
+        end = rng.choice([None, start + rng.randint(0, 4)])
+        return _element("dateDebut", f"{rng.randint(1, 12):02d}/{start}", indent) + _element(
+            "dateFin", f"{rng.randint(1, 12):02d}/{end}" if end else None, indent
+        )
+
+    def _item(self, rng: random.Random, section: str, indent: str) -> str:
+        lines = [
+            f"{indent}<motif>\n",
+            _element("id", "CREATION", indent + "\t"),
+            _element("label", None, indent + "\t"),
+            f"{indent}</motif>\n",
+            _element("commentaire", rng.choice([None, self._sentence(rng, 12)]), indent),
+        ]
+        add = lines.append
+        if section == "activProfConjointDto":
+            add(_element("nomConjoint", self._maybe_hidden(rng, rng.choice(LAST_NAMES), 0.6), indent))
+            add(_element("employeurConjoint", self._maybe_hidden(rng, rng.choice(COMPANIES), 0.3), indent))
+            add(_element("activiteProf", self._maybe_hidden(rng, rng.choice(OCCUPATIONS), 0.2), indent))
+        elif section == "participationFinanciereDto":
+            add(_element("nomSociete", self._maybe_hidden(rng, rng.choice(COMPANIES), 0.2), indent))
+            add(_element("evaluation", str(rng.choice([500, 2400, 10000, 57000, 1450000])), indent))
+            add(_element("remuneration", rng.choice([None, self._sentence(rng, 8)]), indent))
+            add(_element("capitalDetenu", rng.choice([None, str(rng.randint(0, 100))]), indent))
+            add(_element("nombreParts", str(rng.randint(1, 5000)), indent))
+        elif section == "participationDirigeantDto":
+            add(_element("conservee", "false", indent))
+            add(_element("nomSociete", self._maybe_hidden(rng, rng.choice(COMPANIES), 0.2), indent))
+            add(_element("activite", rng.choice(ACTIVITIES), indent))
+            add(self._remuneration(rng, indent))
+            add(self._period(rng, indent))
+        elif section == "fonctionBenevoleDto":
+            add(_element("nomStructure", rng.choice(ORGANIZATIONS), indent))
+            add(_element("descriptionActivite", rng.choice(["Trésorier", "Président", "Membre du bureau"]), indent))
+            add(self._period(rng, indent))
+        elif section == "mandatElectifDto":
+            add(_element("descriptionMandat", rng.choice(MANDATES).format(town=rng.choice(TOWNS)), indent))
+            add(self._remuneration(rng, indent))
+            add(self._period(rng, indent))
+        elif section == "activCollaborateursDto":
+            add(_element("nom", f"{rng.choice(FEMALE_NAMES + MALE_NAMES)} {rng.choice(LAST_NAMES)}", indent))
+            add(_element("employeur", rng.choice(COMPANIES), indent))
+            add(_element("descriptionActivite", self._sentence(rng, 5), indent))
+        elif section == "observationInteretDto":
+            add(_element("contenu", self._sentence(rng, 40), indent))
+        else:  # professional activities, consulting and asset sections
+            add(_element("description", self._sentence(rng, 6), indent))
+            add(_element("employeur", rng.choice(COMPANIES), indent))
+            add(self._remuneration(rng, indent))
+            add(self._period(rng, indent))
+        return "".join(lines)
+
+    def _section(self, rng: random.Random, section: str, mean_items: float) -> str:
+        count = self._count(rng, mean_items)
+        if not count:
+            return f"\t\t<{section}>\n\t\t\t<items />\n\t\t\t<neant>true</neant>\n\t\t</{section}>\n"
+        items = "".join(
+            f"\t\t\t\t<items>\n{self._item(rng, section, chr(9) * 5)}\t\t\t\t</items>\n"
+            for _ in range(count)
+        )
+        return f"\t\t<{section}>\n\t\t\t<items>\n{items}\t\t\t</items>\n\t\t\t<neant>false</neant>\n\t\t</{section}>\n"
+
+    def _attached_files(self, rng: random.Random, uid: str) -> str:
+        files = ["\t\t<attachedFiles>\n"]
+        if rng.random() < self.attachments:
+            size = max(1, int(rng.uniform(0.5, 1.5) * self.attachment_size))
+            payload = base64.b64encode(rng.randbytes(size)).decode("ascii")
+            files.append(
+                "\t\t\t<attachedFiles>\n"
+                + _element("fileName", "Justificatif.pdf", "\t\t\t\t")
+                + _element("serverFileName", f"{uid}_pj01", "\t\t\t\t")
+                + f"\t\t\t\t<base64EncodedContent>{payload}</base64EncodedContent>\n"
+                + "\t\t\t</attachedFiles>\n"
+            )
+        files.append(
+            "\t\t\t<attachedFiles>\n"
+            + _element("fileName", "VUE_PDF_DU_RECEPISSE_DU_DEPOT_XML", "\t\t\t\t")
+            + _element("serverFileName", None, "\t\t\t\t")
+            + "\t\t\t\t<base64EncodedContent />\n"
+            + "\t\t\t</attachedFiles>\n"
+        )
+        files.append("\t\t</attachedFiles>\n")
+        return "".join(files)
+
+    def _general(self, rng: random.Random) -> str:
+        female = rng.random() < 0.35
+        first = rng.choice(FEMALE_NAMES if female else MALE_NAMES)
+        civilite = "Mme" if female else "M."
+        town = rng.choice(TOWNS)
+        born = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(1940, 1995)}"
+        hidden = PLACEHOLDER
+        return (
+            "\t\t<general>\n"
+            "\t\t\t<typeDeclaration>\n\t\t\t\t<id>DI</id>\n"
+            "\t\t\t\t<label>Déclaration d'intérêts</label>\n\t\t\t</typeDeclaration>\n"
+            + _element("qualiteDeclarant", rng.choice(["Maire", "Député", "Conseiller"]), "\t\t\t")
+            + "\t\t\t<organe>\n"
+            + _element("labelOrgane", f"{town} ({rng.randint(1, 95):02d})", "\t\t\t\t")
+            + "\t\t\t</organe>\n"
+            + _element("dateDebutMandat", f"01/0{rng.randint(1, 9)}/{rng.randint(2014, 2022)}", "\t\t\t")
+            + "\t\t\t<declarant>\n"
+            + _element("civilite", civilite, "\t\t\t\t")
+            + _element("nom", rng.choice(LAST_NAMES), "\t\t\t\t")
+            + _element("prenom", first, "\t\t\t\t")
+            + _element("email", hidden, "\t\t\t\t")
+            + _element("dateNaissance", born, "\t\t\t\t")
+            + _element("telephoneDec", hidden, "\t\t\t\t")
+            + "\t\t\t\t<adresseDec>\n"
+            + "".join(
+                _element(tag, hidden, "\t\t\t\t\t")
+                for tag in ("voie", "complement", "codePostal", "ville", "pays")
+            )
+            + "\t\t\t\t</adresseDec>\n"
+            + "\t\t\t</declarant>\n"
+            "\t\t</general>\n"
+        )
+
+    # -- documents --------------------------------------------------------
+
+    def declaration(self, index: int) -> bytes:
+        """Return the ``<declaration>`` element number ``index`` as UTF-8 bytes."""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        uid = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        deposit = (
+            f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2014, 2025)} "
+            f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+        )
+        parts = [
+            "<declaration>\n",
+            _element("dateDepot", deposit, "\t\t"),
+            _element("uuid", uid, "\t\t"),
+            _element("origine", "ADEL", "\t\t"),
+            _element("complete", "true", "\t\t"),
+            self._attached_files(rng, uid),
+            _element("declarationVersion", rng.choice(["20171221", "20171221", "20230907"]), "\t\t"),
+        ]
+        means = {
+            "activProfCinqDerniereDto": 3.0,
+            "activProfConjointDto": 1.0,
+            "mandatElectifDto": 3.0,
+            "participationDirigeantDto": 2.0,
+            "participationFinanciereDto": 2.0,
+            "fonctionBenevoleDto": 1.0,
+            "activCollaborateursDto": 0.5,
+            "observationInteretDto": 0.5,
+            "activConsultantDto": 0.5,
+        }
+        for section in SECTIONS:
+            parts.append(self._section(rng, section, means[section]))
+        if rng.random() < self.assets:
+            for section in ASSET_SECTIONS:
+                parts.append(self._section(rng, section, 1.0))
+        parts.append(self._general(rng))
+        parts.append("\t</declaration>")
+        return "".join(parts).encode("utf-8")
+
+    def declarations(self, count: int, start: int = 0) -> Iterator[bytes]:
+        for index in range(start, start + count):
+            yield self.declaration(index)
+
+    def write_bulk(self, path: Path, count: int) -> int:
+        """Write ``count`` declarations as one bulk dump; return its size in bytes."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as out:
+            out.write(XML_HEADER + b"<declarations>")
+            for data in self.declarations(count):
+                out.write(data)
+                out.write(b"\n\t")
+            out.write(b"</declarations>\n")
+        return path.stat().st_size
+
+    def write_split(self, directory: Path, count: int) -> List[str]:
+        """Write ``count`` split declaration files; return their names."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        names = []
+        for data in self.declarations(count):
+            uid = data.split(b"<uuid>", 1)[1].split(b"<", 1)[0].decode("ascii")
+            version = data.split(b"<declarationVersion>", 1)[1].split(b"<", 1)[0].decode("ascii")
+            name = declaration_filename(uid, version)
+            (directory / name).write_bytes(wrap_declaration(data))
+            names.append(name)
+        return names
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--output", type=Path, help="Bulk declarations.xml to write")
+    parser.add_argument("--split", type=Path, help="Directory of split files to write")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--attachments", type=float, default=0.0, help="Share with a payload")
+    parser.add_argument("--attachment-size", type=int, default=60_000)
+    args = parser.parse_args()
+    if args.output is None and args.split is None:
+        parser.error("pass --output and/or --split")
+
+    corpus = SyntheticCorpus(args.seed, args.attachments, args.attachment_size)
+    if args.output is not None:
+        size = corpus.write_bulk(args.output, args.count)
+        print(f"Wrote {args.count} declarations ({size / 1024 / 1024:.1f} MB) to {args.output}")
+    if args.split is not None:
+        corpus.write_split(args.split, args.count)
+        print(f"Wrote {args.count} split declarations to {args.split}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Byte-level access to HATVP declaration dumps."""
+
+from .compression import open_input
+from .index import IndexedDeclarations, build_index, index_path_for
+from .manifest import IncrementalWriter, changed_names
+from .packed import SQLiteDeclarations, ZipDeclarations, open_store_writer
+from .sources import DirectorySource, open_source
+from .spans import (
+    declaration_filename,
+    declaration_key,
+    iter_declaration_spans,
+    wrap_declaration,
+)
+
+__all__ = [
+    "DirectorySource",
+    "IncrementalWriter",
+    "IndexedDeclarations",
+    "SQLiteDeclarations",
+    "ZipDeclarations",
+    "build_index",
+    "changed_names",
+    "declaration_filename",
+    "declaration_key",
+    "index_path_for",
+    "iter_declaration_spans",
+    "open_input",
+    "open_source",
+    "open_store_writer",
+    "wrap_declaration",
+]
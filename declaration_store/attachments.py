@@ -0,0 +1,115 @@
+"""Drop or externalise base64 attachment payloads in declaration bytes.
+
+Declarations carry their PDF receipts inline::
+
+    <attachedFiles>
+        <attachedFiles>
+            <fileName>...</fileName>
+            <serverFileName>...</serverFileName>
+            <base64EncodedContent>JVBERi0x...</base64EncodedContent>
+        </attachedFiles>
+    </attachedFiles>
+
+The payloads can dwarf the rest of the declaration. :func:`strip_attachments`
+empties every ``<base64EncodedContent>`` element at the byte level, before
+any parser turns the blob into a string, and can write the decoded files to
+a sidecar directory on the way.
+
+It works on a declaration's bytes once the span scanner has read them, so
+the payloads no longer reach the split files, stores or parsers, but peak
+memory while splitting still grows with the largest declaration, payloads
+included.
+"""
+
+from __future__ import annotations
+
+import base64
+import re
+from pathlib import Path
+from typing import Optional, Set
+
+OPEN_CONTENT = b"<base64EncodedContent>"
+CLOSE_CONTENT = b"</base64EncodedContent>"
+EMPTY_CONTENT = b"<base64EncodedContent />"
+
+_SERVER_NAME_RE = re.compile(rb"<serverFileName>([^<]*)</serverFileName>")
+_FILE_NAME_RE = re.compile(rb"<fileName>([^<]*)</fileName>")
+_UNSAFE_RE = re.compile(r"[^\w.-]+")
+
+
+def _safe_name(name: str) -> str:
+    return _UNSAFE_RE.sub("_", Path(name.strip()).name).strip("._")
+
+
+def attachment_filename(server_name: str, file_name: str, prefix: str, index: int) -> str:
+    """Return the sidecar name: ``serverFileName``, else ``{prefix}-{index}-{fileName}``."""
+    name = _safe_name(server_name)
+    if name:
+        return name
+    fallback = _safe_name(file_name) or "attachment"
+    return f"{prefix}-{index}-{fallback}" if prefix else f"{index}-{fallback}"
+
+
+def unique_filename(name: str, taken: Set[str]) -> str:
+    """Return ``name``, or ``{stem}-{n}{suffix}`` if it is in ``taken``; record the result."""
+    candidate = name
+    n = 1
+    while candidate in taken:
+        n += 1
+        path = Path(name)
+        candidate = f"{path.stem}-{n}{path.suffix}"
+    taken.add(candidate)
+    return candidate
+
+
+def strip_attachments(
+    data: bytes,
+    directory: Optional[Path] = None,
+    prefix: str = "",
+    written: Optional[Set[str]] = None,
+) -> bytes:
+    """Return ``data`` with every attachment payload removed.
+
+    With ``directory`` set, each payload is decoded and written there under
+    :func:`attachment_filename`; ``prefix`` (e.g. ``{uuid}-{version}``)
+    names attachments that have no ``serverFileName``. Names already in
+    ``written`` (the files of earlier calls in the same run) get a ``-2``,
+    ``-3``… suffix instead of overwriting them. Bytes without payloads are
+    returned unchanged.
+    """
+    start = data.find(OPEN_CONTENT)
+    if start == -1:
+        return data
+    if directory is not None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        if written is None:
+            written = set()
+    pieces = []
+    pos = 0
+    index = 0
+    while start != -1:
+        body = start + len(OPEN_CONTENT)
+        end = data.find(CLOSE_CONTENT, body)
+        if end == -1:
+            break
+        if directory is not None:
+            item = data.rfind(b"<attachedFiles>", 0, start)
+            header = data[max(item, pos) : start]
+            server = _SERVER_NAME_RE.search(header)
+            file_name = _FILE_NAME_RE.search(header)
+            name = attachment_filename(
+                server.group(1).decode("utf-8") if server else "",
+                file_name.group(1).decode("utf-8") if file_name else "",
+                prefix,
+                index,
+            )
+            name = unique_filename(name, written)
+            (directory / name).write_bytes(base64.b64decode(memoryview(data)[body:end]))
+        pieces.append(data[pos:start])
+        pieces.append(EMPTY_CONTENT)
+        pos = end + len(CLOSE_CONTENT)
+        index += 1
+        start = data.find(OPEN_CONTENT, pos)
+    pieces.append(data[pos:])
+    return b"".join(pieces)
@@ -0,0 +1,167 @@
+"""Streaming input for compressed declaration dumps.
+
+``.gz``, ``.bz2`` and ``.xz`` use the standard library; ``.zst`` needs the
+optional ``zstandard`` package. Decompression runs in a background thread
+that fills a bounded queue, so it overlaps with parsing in the caller (the
+decompressors release the GIL while they work).
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import queue
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+from .spans import CHUNK_SIZE
+
+COMPRESSED_SUFFIXES = {".gz", ".bz2", ".xz", ".zst"}
+
+
+def is_compressed(path: Path) -> bool:
+    """Return ``True`` if ``path`` has a supported compression suffix."""
+    return Path(path).suffix.lower() in COMPRESSED_SUFFIXES
+
+
+def _decompressor(raw: BinaryIO, suffix: str) -> BinaryIO:
+    if suffix == ".gz":
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if suffix == ".bz2":
+        return bz2.BZ2File(raw, mode="rb")
+    if suffix == ".xz":
+        return lzma.LZMAFile(raw, mode="rb")
+    if suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ImportError("Reading .zst dumps requires the 'zstandard' package") from exc
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    raise ValueError(f"Unsupported compression: {suffix}")
+
+
+class _CountingReader:
+    """Pass reads through to ``raw`` and report their sizes to ``callback``."""
+
+    def __init__(self, raw: BinaryIO, callback: Callable[[int], None]) -> None:
+        self._raw = raw
+        self._callback = callback
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self._callback(len(data))
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self._raw.close()
+
+    def __enter__(self) -> "_CountingReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ThreadedReader:
+    """Read ``stream`` ahead in a background thread.
+
+    ``read(size)`` returns at most ``size`` bytes, possibly fewer, and
+    ``b""`` once the stream is exhausted. Errors raised while reading are
+    re-raised in the consumer.
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = CHUNK_SIZE, depth: int = 8) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)
+        self._closed = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._pump, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> None:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _pump(self) -> None:
+        try:
+            while not self._closed.is_set():
+                chunk = self._stream.read(self._chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except BaseException as exc:  # surfaced in read()
+            self._put(exc)
+
+    def _next_chunk(self) -> None:
+        item = self._queue.get()
+        if isinstance(item, BaseException):
+            self._eof = True
+            raise item
+        if not item:
+            self._eof = True
+        self._pending = memoryview(item)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            parts = [bytes(self._pending)]
+            self._pending = memoryview(b"")
+            while not self._eof:
+                self._next_chunk()
+                parts.append(bytes(self._pending))
+            self._pending = memoryview(b"")
+            return b"".join(parts)
+        if not self._pending and not self._eof:
+            self._next_chunk()
+        data = bytes(self._pending[:size])
+        self._pending = self._pending[size:]
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self._closed.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()
+        self._stream.close()
+
+    def __enter__(self) -> "ThreadedReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_input(
+    path: Path, progress: Optional[Callable[[int], None]] = None, threaded: bool = True
+) -> BinaryIO:
+    """Open a dump for streaming binary reads, decompressing if needed.
+
+    ``progress`` receives the number of bytes read from the file on disk
+    (compressed bytes for compressed dumps), so it can drive a progress bar
+    sized with ``os.path.getsize``.
+    """
+    path = Path(path)
+    raw: BinaryIO = open(path, "rb")
+    if progress is not None:
+        raw = _CountingReader(raw, progress)
+    suffix = path.suffix.lower()
+    if suffix not in COMPRESSED_SUFFIXES:
+        return raw
+    stream = _decompressor(raw, suffix)
+    return ThreadedReader(stream) if threaded else stream
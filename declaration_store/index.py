@@ -0,0 +1,169 @@
+"""Byte-offset index over a bulk ``declarations.xml`` dump.
+
+The index maps ``(uuid, declarationVersion)`` to the offset and length of
+the declaration in the dump, so records can be served straight from a
+memory-mapped file instead of from thousands of split files.
+
+Compressed dumps (``.gz``, ``.bz2``, ``.xz``, ``.zst``) are indexed by
+streaming them; offsets then refer to the decompressed bytes, and records can
+only be read sequentially.
+"""
+
+from __future__ import annotations
+
+import csv
+import mmap
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .compression import is_compressed, open_input
+from .spans import declaration_filename, declaration_key, iter_declaration_spans, wrap_declaration
+
+INDEX_FIELDS = ["uuid", "declarationVersion", "offset", "length"]
+
+Key = Tuple[str, str]
+
+
+def index_path_for(xml_path: Path) -> Path:
+    """Return the default index location for ``xml_path``."""
+    xml_path = Path(xml_path)
+    return xml_path.with_name(xml_path.name + ".index.csv")
+
+
+def iter_index_entries(stream: BinaryIO) -> Iterator[Tuple[str, str, int, int]]:
+    """Yield ``(uuid, version, offset, length)`` for each declaration."""
+    for offset, data in iter_declaration_spans(stream):
+        uuid, version = declaration_key(data)
+        if uuid and version:
+            yield uuid, version, offset, len(data)
+
+
+def write_index(entries, index_path: Path) -> int:
+    """Write index ``entries`` to ``index_path`` and return their count."""
+    count = 0
+    with Path(index_path).open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(INDEX_FIELDS)
+        for entry in entries:
+            writer.writerow(entry)
+            count += 1
+    return count
+
+
+def build_index(xml_path: Path, index_path: Optional[Path] = None) -> Path:
+    """Scan ``xml_path`` once and write its offset index.
+
+    Returns the path of the written index.
+    """
+    index_path = Path(index_path) if index_path is not None else index_path_for(xml_path)
+    with open_input(xml_path) as f:
+        write_index(iter_index_entries(f), index_path)
+    return index_path
+
+
+def read_index(index_path: Path) -> Dict[Key, Tuple[int, int]]:
+    """Load an index as ``{(uuid, version): (offset, length)}`` in file order.
+
+    Later entries for a repeated key replace earlier ones, as the splitter
+    overwrites files in that case.
+    """
+    entries: Dict[Key, Tuple[int, int]] = {}
+    with Path(index_path).open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            key = (row["uuid"], row["declarationVersion"])
+            entries[key] = (int(row["offset"]), int(row["length"]))
+    return entries
+
+
+class IndexedDeclarations:
+    """Memory-mapped reader serving declarations from a bulk dump.
+
+    The index is built on first use when it is missing or older than the
+    dump. Records are returned wrapped exactly like the files written by
+    ``script_to_split_declarations.py --raw``, and iteration follows the
+    order of the dump for sequential reads.
+
+    A compressed dump cannot be memory-mapped: iteration decompresses it in
+    one pass, and random access through ``get``/``read`` raises
+    ``ValueError``.
+    """
+
+    def __init__(self, xml_path: Path, index_path: Optional[Path] = None) -> None:
+        self.xml_path = Path(xml_path)
+        self.index_path = Path(index_path) if index_path is not None else index_path_for(xml_path)
+        if (
+            not self.index_path.exists()
+            or self.index_path.stat().st_mtime < self.xml_path.stat().st_mtime
+        ):
+            build_index(self.xml_path, self.index_path)
+        self._entries = read_index(self.index_path)
+        self._names = {declaration_filename(*key): key for key in self._entries}
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self.compressed = is_compressed(self.xml_path)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_file"] = None
+        state["_mmap"] = None
+        return state
+
+    def _map(self) -> mmap.mmap:
+        if self.compressed:
+            raise ValueError(
+                f"{self.xml_path} is compressed; iterate over it or decompress it "
+                "for random access"
+            )
+        if self._mmap is None:
+            self._file = self.xml_path.open("rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+            self._file = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[Key]:
+        """Return ``(uuid, version)`` keys in dump order."""
+        return list(self._entries)
+
+    def get_raw(self, uuid: str, version: str) -> bytes:
+        """Return the bare ``<declaration>`` slice for a key."""
+        offset, length = self._entries[(uuid, version)]
+        return self._map()[offset : offset + length]
+
+    def get(self, uuid: str, version: str) -> bytes:
+        """Return the declaration for a key as a standalone document."""
+        return wrap_declaration(self.get_raw(uuid, version))
+
+    def names(self) -> List[str]:
+        """Return split-file names in dump order."""
+        return list(self._names)
+
+    def read(self, name: str) -> bytes:
+        """Return the document stored under split-file ``name``."""
+        return self.get(*self._names[name])
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        if self.compressed:
+            yield from self._iter_stream()
+            return
+        for name, key in self._names.items():
+            yield name, self.get(*key)
+
+    def _iter_stream(self) -> Iterator[Tuple[str, bytes]]:
+        with open_input(self.xml_path) as stream:
+            for offset, data in iter_declaration_spans(stream):
+                key = declaration_key(data)
+                # Skip declarations superseded later in the dump.
+                if self._entries.get(key, (None,))[0] == offset:
+                    yield declaration_filename(*key), wrap_declaration(data)
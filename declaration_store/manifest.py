@@ -0,0 +1,130 @@
+"""Content-hash manifest for incremental splits.
+
+The manifest (``manifest.csv`` in the split directory) maps each split file
+name to a hash of its content. A re-split only rewrites files whose content
+changed, so unchanged files keep their modification time, and a change list
+(``changes.csv``) tells downstream stages which declarations were added,
+changed or removed.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+MANIFEST_NAME = "manifest.csv"
+CHANGES_NAME = "changes.csv"
+
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+
+def content_hash(data: bytes) -> str:
+    """Return the hex digest used to compare declaration contents."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def read_manifest(path: Path) -> Dict[str, str]:
+    """Return ``{name: hash}`` from a manifest file, or ``{}`` if missing."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with path.open(newline="", encoding="utf-8") as f:
+        return {row["name"]: row["hash"] for row in csv.DictReader(f)}
+
+
+def read_changes(path: Path) -> Dict[str, str]:
+    """Return ``{name: status}`` from a change list, or ``{}`` if missing."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with path.open(newline="", encoding="utf-8") as f:
+        return {row["name"]: row["status"] for row in csv.DictReader(f)}
+
+
+def changed_names(output_dir: Path) -> list[str]:
+    """Return split files added or changed by the last incremental run."""
+    changes = read_changes(Path(output_dir) / CHANGES_NAME)
+    return sorted(name for name, status in changes.items() if status != REMOVED)
+
+
+def _write_rows(path: Path, header: list[str], rows) -> None:
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+class IncrementalWriter:
+    """Write split files only when their content hash changed.
+
+    Files missing from the manifest but already on disk are hashed once, so
+    the first incremental run over an existing split does not rewrite it.
+    With ``prune`` set, every ``.xml`` file of the directory that is not
+    part of the current export is deleted, including files left behind by
+    earlier runs without ``prune``.
+    """
+
+    def __init__(self, output_dir: Path, prune: bool = False) -> None:
+        self.output_dir = Path(output_dir)
+        self.prune = prune
+        self.previous = read_manifest(self.output_dir / MANIFEST_NAME)
+        self.current: Dict[str, str] = {}
+        self.changes: Dict[str, str] = {}
+        self._baseline: Dict[str, Optional[str]] = {}
+
+    def write(self, name: str, data: bytes) -> bool:
+        """Store ``data`` under ``name``; return ``True`` if the file was written."""
+        digest = content_hash(data)
+        path = self.output_dir / name
+        if name not in self._baseline:
+            baseline = self.previous.get(name)
+            if baseline is None and path.exists():
+                baseline = content_hash(path.read_bytes())
+            self._baseline[name] = baseline
+        baseline = self._baseline[name]
+        on_disk = self.current.get(name, baseline)
+        self.current[name] = digest
+        if digest == baseline:
+            self.changes.pop(name, None)
+        else:
+            self.changes[name] = ADDED if baseline is None else CHANGED
+        if on_disk == digest and path.exists():
+            return False
+        path.write_bytes(data)
+        return True
+
+    def finish(self) -> Dict[str, str]:
+        """Handle removals, save manifest and change list, return the changes."""
+        stale = set(self.previous)
+        if self.prune:
+            stale.update(p.name for p in self.output_dir.glob("*.xml"))
+        for name in sorted(stale - set(self.current)):
+            self.changes[name] = REMOVED
+            if self.prune:
+                (self.output_dir / name).unlink(missing_ok=True)
+        _write_rows(
+            self.output_dir / MANIFEST_NAME,
+            ["name", "hash"],
+            sorted(self.current.items()),
+        )
+        _write_rows(
+            self.output_dir / CHANGES_NAME,
+            ["name", "status"],
+            sorted(self.changes.items()),
+        )
+        return dict(self.changes)
+
+    def summary(self) -> str:
+        """Return a one-line count of added, changed, removed and unchanged files."""
+        counts = {status: 0 for status in (ADDED, CHANGED, REMOVED)}
+        for status in self.changes.values():
+            counts[status] += 1
+        unchanged = len(self.current) - counts[ADDED] - counts[CHANGED]
+        return (
+            f"{counts[ADDED]} added, {counts[CHANGED]} changed, "
+            f"{counts[REMOVED]} removed, {unchanged} unchanged"
+        )
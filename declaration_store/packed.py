@@ -0,0 +1,208 @@
+"""Packed declaration stores: one file instead of thousands.
+
+Two layouts are supported, both holding the same standalone documents as
+the split directory:
+
+* an uncompressed zip (``.zip``) whose members are the split file names,
+* a SQLite database (``.sqlite``/``.db``) with a ``declarations`` table
+  keyed by ``(uuid, version)`` storing the XML as a blob.
+
+Members are stored in the order they are written (dump order for the
+splitter) and read back in that order, so a full scan is one sequential
+pass over the file.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import warnings
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+ZIP_SUFFIXES = {".zip"}
+SQLITE_SUFFIXES = {".sqlite", ".sqlite3", ".db"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS declarations (
+    name TEXT PRIMARY KEY,
+    uuid TEXT NOT NULL,
+    version TEXT NOT NULL,
+    xml BLOB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS declarations_key ON declarations (uuid, version);
+"""
+
+
+class ZipStoreWriter:
+    """Stream declarations into an uncompressed zip archive.
+
+    A declaration written twice keeps its last content: the archive is
+    rewritten without the superseded members when it is closed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_STORED)
+        self._names: set = set()
+        self._duplicates = False
+
+    def write(self, name: str, uuid: str, version: str, data: bytes) -> None:
+        if name in self._names:
+            self._duplicates = True
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)
+                self._zip.writestr(name, data)
+            return
+        self._names.add(name)
+        self._zip.writestr(name, data)
+
+    def close(self) -> None:
+        self._zip.close()
+        if self._duplicates:
+            self._drop_superseded()
+
+    def _drop_superseded(self) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with zipfile.ZipFile(self.path) as src, zipfile.ZipFile(
+            tmp, "w", compression=zipfile.ZIP_STORED
+        ) as dst:
+            last = {info.filename: info for info in src.infolist()}
+            for info in src.infolist():
+                if last[info.filename] is info:
+                    dst.writestr(info, src.read(info))
+        os.replace(tmp, self.path)
+
+    def __enter__(self) -> "ZipStoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SQLiteStoreWriter:
+    """Insert declarations into a SQLite blob table."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.unlink(missing_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def write(self, name: str, uuid: str, version: str, data: bytes) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO declarations (name, uuid, version, xml) VALUES (?, ?, ?, ?)",
+            (name, uuid, version, data),
+        )
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "SQLiteStoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_store_writer(path: Path):
+    """Return a zip or SQLite store writer based on the suffix of ``path``."""
+    suffix = Path(path).suffix.lower()
+    if suffix in ZIP_SUFFIXES:
+        return ZipStoreWriter(path)
+    if suffix in SQLITE_SUFFIXES:
+        return SQLiteStoreWriter(path)
+    raise ValueError(f"Unsupported packed store: {path}")
+
+
+class ZipDeclarations:
+    """Read declarations from a zip archive written by :class:`ZipStoreWriter`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._zip: Optional[zipfile.ZipFile] = None
+        with zipfile.ZipFile(self.path) as zf:
+            infos = sorted(zf.infolist(), key=lambda info: info.header_offset)
+            self._names = [info.filename for info in infos if info.filename.endswith(".xml")]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_zip"] = None
+        return state
+
+    def _archive(self) -> zipfile.ZipFile:
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path)
+        return self._zip
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def names(self) -> List[str]:
+        """Return member names in archive order."""
+        return list(self._names)
+
+    def read(self, name: str) -> bytes:
+        return self._archive().read(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        zf = self._archive()
+        for name in self._names:
+            yield name, zf.read(name)
+
+
+class SQLiteDeclarations:
+    """Read declarations from a SQLite store written by :class:`SQLiteStoreWriter`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._names = [
+            row[0] for row in self._db().execute("SELECT name FROM declarations ORDER BY rowid")
+        ]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        return state
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def read(self, name: str) -> bytes:
+        row = self._db().execute("SELECT xml FROM declarations WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    def get(self, uuid: str, version: str) -> bytes:
+        """Return the document stored for ``(uuid, version)``."""
+        row = self._db().execute(
+            "SELECT xml FROM declarations WHERE uuid = ? AND version = ?", (uuid, version)
+        ).fetchone()
+        if row is None:
+            raise KeyError((uuid, version))
+        return row[0]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        yield from self._db().execute("SELECT name, xml FROM declarations ORDER BY rowid")
@@ -0,0 +1,136 @@
+"""Parallel processing of a bulk dump in byte ranges.
+
+The dump is cut into ranges whose boundaries fall on ``<declaration>``
+opening tags, so each range can be scanned independently by a worker
+process. Results are merged in range order, which keeps the output
+identical to a sequential run.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .spans import (
+    CHUNK_SIZE,
+    OPEN_TAG,
+    OPEN_TERMINATORS,
+    declaration_filename,
+    declaration_key,
+    iter_declaration_spans,
+    wrap_declaration,
+)
+
+Entry = Tuple[str, str, int, int]
+
+
+def _next_declaration(f, pos: int, size: int) -> int:
+    """Return the offset of the first ``<declaration`` tag at or after ``pos``."""
+    f.seek(pos)
+    carry = b""
+    base = pos
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            return size
+        buf = carry + chunk
+        start = 0
+        while True:
+            i = buf.find(OPEN_TAG, start)
+            after = i + len(OPEN_TAG)
+            if i < 0 or after >= len(buf):
+                break
+            if buf[after] in OPEN_TERMINATORS:
+                return base + i
+            start = after
+        keep = min(len(buf), len(OPEN_TAG))
+        carry = buf[-keep:]
+        base += len(buf) - keep
+
+
+def shard_ranges(xml_path: Path, shards: int) -> List[Tuple[int, int]]:
+    """Split ``xml_path`` into at most ``shards`` aligned ``(start, end)`` ranges."""
+    size = os.path.getsize(xml_path)
+    bounds = []
+    with open(xml_path, "rb") as f:
+        for i in range(shards):
+            bounds.append(_next_declaration(f, size * i // shards, size))
+    bounds.append(size)
+    ranges = []
+    for start, end in zip(bounds, bounds[1:]):
+        if start < end:
+            ranges.append((start, end))
+    return ranges
+
+
+def scan_range(
+    xml_path: Path, start: int, end: int, output_dir: Optional[Path] = None
+) -> Tuple[List[Entry], int]:
+    """Return index entries for declarations starting in ``[start, end)``.
+
+    Also returns the number of declarations scanned, including those
+    without a uuid or version. When ``output_dir`` is given each declaration
+    is also written there as ``{uuid}-{version}.xml`` (same layout as the
+    raw splitter).
+    """
+    entries: List[Entry] = []
+    scanned = 0
+    with open(xml_path, "rb") as f:
+        f.seek(start)
+        for offset, data in iter_declaration_spans(f, offset=start, end=end):
+            scanned += 1
+            uuid, version = declaration_key(data)
+            if not (uuid and version):
+                continue
+            if output_dir is not None:
+                path = Path(output_dir) / declaration_filename(uuid, version)
+                path.write_bytes(wrap_declaration(data))
+            entries.append((uuid, version, offset, len(data)))
+    return entries, scanned
+
+
+def _scan_range_job(job) -> Tuple[List[Entry], int]:
+    return scan_range(*job)
+
+
+def scan_parallel(
+    xml_path: Path,
+    workers: int,
+    output_dir: Optional[Path] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> Tuple[List[Entry], int]:
+    """Scan ``xml_path`` with ``workers`` processes.
+
+    Returns the index entries in order and the number of declarations
+    scanned, which like the sequential scan includes those without a key.
+    ``progress`` is called with the byte size of each finished range. When
+    files are written, declarations repeated across ranges are rewritten
+    from their last occurrence after the pool finishes so the result never
+    depends on worker timing.
+    """
+    ranges = shard_ranges(xml_path, max(1, workers) * 4)
+    jobs = [(xml_path, start, end, output_dir) for start, end in ranges]
+    seen = {}
+    merged: List[Entry] = []
+    scanned = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for (start, end), (entries, count) in zip(ranges, pool.map(_scan_range_job, jobs)):
+            scanned += count
+            for entry in entries:
+                key = entry[:2]
+                seen[key] = seen.get(key, 0) + 1
+            merged.extend(entries)
+            if progress is not None:
+                progress(end - start)
+
+    if output_dir is not None:
+        last = {entry[:2]: entry for entry in merged if seen[entry[:2]] > 1}
+        if last:
+            with open(xml_path, "rb") as f:
+                for uuid, version, offset, length in last.values():
+                    f.seek(offset)
+                    path = Path(output_dir) / declaration_filename(uuid, version)
+                    path.write_bytes(wrap_declaration(f.read(length)))
+    return merged, scanned
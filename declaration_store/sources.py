@@ -0,0 +1,76 @@
+"""Uniform access to declarations stored as split files or in a bulk dump.
+
+A source exposes ``names()`` (split-file names, e.g.
+``{uuid}-{version}.xml``), ``read(name)`` returning the document bytes, and
+iteration over ``(name, bytes)`` pairs. Every source yields the same
+standalone ``<declarations>`` documents, so extractors do not need to know
+where the records come from.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .compression import COMPRESSED_SUFFIXES
+from .index import IndexedDeclarations
+from .packed import SQLITE_SUFFIXES, ZIP_SUFFIXES, SQLiteDeclarations, ZipDeclarations
+
+
+class DirectorySource:
+    """Declarations stored as one XML file each in a directory.
+
+    ``names`` restricts the source to the given files, e.g. the added and
+    changed entries of an incremental split's change list.
+    """
+
+    def __init__(
+        self, decl_dir: Path, pattern: str = "*.xml", names: Optional[Iterable[str]] = None
+    ) -> None:
+        self.decl_dir = Path(decl_dir)
+        self.pattern = pattern
+        self._names: List[str] | None = sorted(names) if names is not None else None
+
+    def names(self) -> List[str]:
+        """Return file names in sorted order."""
+        if self._names is None:
+            self._names = sorted(p.name for p in self.decl_dir.glob(self.pattern))
+        return list(self._names)
+
+    def read(self, name: str) -> bytes:
+        return (self.decl_dir / name).read_bytes()
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        for name in self.names():
+            yield name, self.read(name)
+
+
+DeclarationSource = Union[
+    DirectorySource, IndexedDeclarations, ZipDeclarations, SQLiteDeclarations
+]
+
+
+def open_source(location: Union[str, Path, DeclarationSource]) -> DeclarationSource:
+    """Return a declaration source for ``location``.
+
+    Directories are read file by file; a bulk ``.xml`` dump is served through
+    its offset index, and compressed dumps (``.xml.gz`` etc.) are streamed
+    sequentially; ``.zip`` and ``.sqlite``/``.db`` files are read as
+    packed stores. Source objects are returned unchanged.
+    """
+    if not isinstance(location, (str, Path)):
+        return location
+    path = Path(location)
+    if path.is_dir():
+        return DirectorySource(path)
+    suffix = path.suffix.lower()
+    if suffix == ".xml" or suffix in COMPRESSED_SUFFIXES:
+        return IndexedDeclarations(path)
+    if suffix in ZIP_SUFFIXES:
+        return ZipDeclarations(path)
+    if suffix in SQLITE_SUFFIXES:
+        return SQLiteDeclarations(path)
+    raise ValueError(f"Unsupported declaration source: {path}")
@@ -0,0 +1,131 @@
+"""Locate ``<declaration>`` elements directly in the bytes of a bulk dump.
+
+The HATVP export is a flat ``<declarations>`` root holding thousands of
+non-nested ``<declaration>`` children. Scanning for the opening and closing
+tags is enough to recover each record as an exact slice of the source, which
+avoids building an element tree just to serialise it again.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import BinaryIO, Iterator, Tuple
+
+CHUNK_SIZE = 1 << 20
+
+OPEN_TAG = b"<declaration"
+CLOSE_TAG = b"</declaration>"
+# Bytes allowed right after ``<declaration`` (this excludes ``<declarations``).
+OPEN_TERMINATORS = frozenset(b"> \t\r\n/")
+
+# Standalone file layout produced by the splitter.
+XML_HEADER = b"<?xml version='1.0' encoding='utf-8'?>\n"
+WRAPPER_OPEN = b"<declarations>"
+WRAPPER_CLOSE = b"</declarations>"
+
+_UUID_RE = re.compile(rb"<uuid>\s*([^<]*?)\s*</uuid>")
+_VERSION_RE = re.compile(rb"<declarationVersion>\s*([^<]*?)\s*</declarationVersion>")
+
+
+def _find_open(buf: bytearray, pos: int, eof: bool) -> Tuple[int, bool]:
+    """Return ``(index, complete)`` of the next ``<declaration`` tag.
+
+    ``complete`` is ``False`` when the match sits at the end of ``buf`` and
+    more input is needed to tell it apart from ``<declarations``.
+    """
+    while True:
+        i = buf.find(OPEN_TAG, pos)
+        if i < 0:
+            return -1, True
+        after = i + len(OPEN_TAG)
+        if after >= len(buf):
+            return (-1, True) if eof else (i, False)
+        if buf[after] in OPEN_TERMINATORS:
+            return i, True
+        pos = after
+
+
+def iter_declaration_spans(
+    stream: BinaryIO, chunk_size: int = CHUNK_SIZE, offset: int = 0, end: int | None = None
+) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, data)`` for each ``<declaration>`` in ``stream``.
+
+    ``data`` runs from ``<declaration`` up to and including
+    ``</declaration>`` and ``offset`` is its position in the stream, counted
+    from ``offset`` (the position ``stream`` is at when passed in). When
+    ``end`` is given, only declarations starting before that offset are
+    returned.
+
+    Raises ``ValueError`` if the stream ends inside a declaration.
+    """
+    buf = bytearray()
+    base = offset  # stream offset of buf[0]
+    pos = 0
+    start = -1
+    eof = False
+
+    def fill(keep_from: int) -> None:
+        nonlocal base, pos, start, eof
+        if keep_from:
+            del buf[:keep_from]
+            base += keep_from
+            pos -= keep_from
+            if start >= 0:
+                start -= keep_from
+        chunk = stream.read(chunk_size)
+        if chunk:
+            buf.extend(chunk)
+        else:
+            eof = True
+
+    while True:
+        if start < 0:
+            i, complete = _find_open(buf, pos, eof)
+            if i < 0:
+                if eof:
+                    return
+                fill(max(len(buf) - len(OPEN_TAG), pos, 0))
+                pos = max(pos, 0)
+                continue
+            if not complete:
+                pos = i
+                fill(i)
+                continue
+            if end is not None and base + i >= end:
+                return
+            start = i
+            pos = i + len(OPEN_TAG)
+        j = buf.find(CLOSE_TAG, pos)
+        if j < 0:
+            if eof:
+                raise ValueError(f"Unterminated <declaration> at byte {base + start}")
+            pos = max(start + len(OPEN_TAG), len(buf) - len(CLOSE_TAG) + 1)
+            fill(start)
+            continue
+        stop = j + len(CLOSE_TAG)
+        yield base + start, bytes(memoryview(buf)[start:stop])
+        pos = stop
+        start = -1
+
+
+def declaration_key(data: bytes) -> Tuple[str, str]:
+    """Return ``(uuid, declarationVersion)`` read from a declaration slice.
+
+    Missing fields are returned as empty strings.
+    """
+    uuid = _UUID_RE.search(data)
+    version = _VERSION_RE.search(data)
+    return (
+        uuid.group(1).decode("utf-8") if uuid else "",
+        version.group(1).decode("utf-8") if version else "",
+    )
+
+
+def declaration_filename(uuid: str, version: str) -> str:
+    """Return the split file name used for a declaration."""
+    return f"{uuid}-{version}.xml"
+
+
+def wrap_declaration(data: bytes) -> bytes:
+    """Return ``data`` as a standalone ``<declarations>`` document."""
+    return b"".join((XML_HEADER, WRAPPER_OPEN, data, WRAPPER_CLOSE))
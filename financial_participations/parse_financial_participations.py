@@ -1,79 +1,55 @@
+import argparse
 import csv
+import sys
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from declaration_store import open_source
+from full_pipeline.backends import get_backend
+from full_pipeline.records import (  # noqa: F401 - helpers re-exported for callers
+    FINANCIAL_PARTICIPATION_FIELDS,
+    child_text,
+    clean_text,
+    find_child,
+    localname,
+)
 
-def localname(tag: str) -> str:
-    """Return tag name without namespace."""
-    return tag.split("}", 1)[-1] if "}" in tag else tag
+BACKEND = get_backend()
 
 
-def find_child(parent: ET.Element, wanted: str):
-    """Return first child element with given localname."""
-    for ch in parent:
-        if localname(ch.tag) == wanted:
-            return ch
-    return None
+def parse_file(path: Path, data: bytes = None):
+    """Yield dictionaries for each participationFinanciere item in a file.
 
-
-def clean_text(s: str) -> str:
-    """Normalize whitespace and special spaces."""
-    if not s:
-        return ""
-    return (
-        s.replace("\u202f", " ")  # narrow no-break space
-         .replace("\u00a0", " ")  # no-break space
-         .replace("\n", " ")
-         .strip()
-    )
-
-
-def child_text(parent: ET.Element, tag: str) -> str:
-    """Get direct child text by tag name (namespace agnostic)."""
-    child = find_child(parent, tag)
-    return clean_text(child.text) if (child is not None and child.text) else ""
-
-
-def parse_file(path: Path):
-    """Yield dictionaries for each participationFinanciere item in a file."""
-    tree = ET.parse(path)
-    root = tree.getroot()
-    for pf in root.iter():
-        if localname(pf.tag) != "participationFinanciereDto":
-            continue
-        items_container = find_child(pf, "items")
-        if items_container is None:
-            continue
-        for item in items_container:
-            if localname(item.tag) != "items":
-                continue
-            yield {
-                "file": path.name,
-                "nomSociete": child_text(item, "nomSociete"),
-                "evaluation": child_text(item, "evaluation"),
-                "capitalDetenu": child_text(item, "capitalDetenu"),
-                "nombreParts": child_text(item, "nombreParts"),
-                "remuneration": child_text(item, "remuneration"),
-            }
+    When ``data`` holds the document bytes, ``path`` only provides the name.
+    """
+    root = BACKEND.parse_declaration(path, data)
+    return BACKEND.financial_participation_records(root, path.name)
 
 
 def main() -> None:
-    input_dir = Path("split_declarations")
+    parser = argparse.ArgumentParser(description="Extract financial participations")
+    parser.add_argument(
+        "--source",
+        default="split_declarations",
+        help="Directory of split files or bulk declarations.xml (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    source = open_source(args.source)
     output_csv = Path("participations.csv")
 
-    paths = sorted(input_dir.glob("*.xml"))
     output_csv.parent.mkdir(parents=True, exist_ok=True)
 
-    fieldnames = ["file", "nomSociete", "evaluation", "capitalDetenu", "nombreParts", "remuneration"]
     with output_csv.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=FINANCIAL_PARTICIPATION_FIELDS)
         writer.writeheader()
-        for path in paths:
+        for name, data in source:
             try:
-                for row in parse_file(path):
+                for row in parse_file(Path(name), data):
                     writer.writerow(row)
             except ET.ParseError as e:
-                print(f"Warning: failed to parse {path.name}: {e}")
+                print(f"Warning: failed to parse {name}: {e}")
 
     print(f"✅ Wrote {output_csv}")
 
@@ -1,19 +1,25 @@
-"""Pipeline library for PII extraction and analysis."""
+"""Pipeline library for PII extraction and analysis.
 
-from .pii_pipeline import (
-    DeclarationPipeline,
-    GenderAnalyzer,
-    SpouseOccupationAnalyzer,
-    GenderDiscriminationAnalyzer,
-    AgePyramidBuilder,
-    ReportFigureGenerator,
-)
+The classes below are imported from :mod:`full_pipeline.pii_pipeline` on
+first use, so light modules such as :mod:`full_pipeline.dates` can be
+imported without loading the analysis stack (matplotlib, seaborn,
+gender_guesser).
+"""
+
+from importlib import import_module
 
 __all__ = [
     "DeclarationPipeline",
+    "ExtractedData",
     "GenderAnalyzer",
     "SpouseOccupationAnalyzer",
     "GenderDiscriminationAnalyzer",
     "AgePyramidBuilder",
     "ReportFigureGenerator",
 ]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return getattr(import_module(".pii_pipeline", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
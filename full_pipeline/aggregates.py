@@ -0,0 +1,121 @@
+"""Mergeable partial counts behind the gender and spouse occupation analyses.
+
+The analyses only need a few count tables, whose size grows with the number
+of distinct names and occupations rather than with the number of rows:
+
+* :class:`GenderTally` counts personal records per ``civilite``, first name,
+  guessed gender and declared gender;
+* :class:`OccupationCounts` counts spouse activities per raw occupation,
+  spouse gender and deposit year.
+
+Both are built with :meth:`update` from one batch of rows at a time (e.g.
+each :class:`~full_pipeline.batches.RecordBatch` of
+``DeclarationPipeline.iter_batches``) and combined with :meth:`merge`, e.g.
+the tallies sent back by worker processes. Counts are the same in any merge
+order; merging in source order also keeps ties in the order a single pass
+over all rows gives them, so the summaries are identical to the analyzers'.
+
+A declaration's spouse activities are joined with the personal record of the
+same batch; batches built from whole files keep the two together.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List
+
+import pandas as pd
+
+from .dates import DEPOSIT_FORMAT, parse_dates
+
+GENDER_KEYS = ["civilite", "first_name", "gender_guess", "gender"]
+OCCUPATION_KEYS = ["activiteProf", "spouse_gender", "year"]
+
+
+def _empty(keys: List[str]) -> pd.DataFrame:
+    return pd.DataFrame(columns=keys + ["count"]).astype({"count": "int64"})
+
+
+def _count(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Count the rows of ``df`` per ``keys``, in order of first appearance."""
+    return df.groupby(keys, sort=False, dropna=False).size().reset_index(name="count")
+
+
+def _combine(left: pd.DataFrame, right: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    if right.empty:
+        return left
+    if left.empty:
+        return right.reset_index(drop=True)
+    both = pd.concat([left, right], ignore_index=True)
+    return both.groupby(keys, sort=False, dropna=False)["count"].sum().reset_index()
+
+
+def _ranked(counts: pd.DataFrame, key: str) -> pd.Series:
+    """``value_counts`` of ``key`` weighted by ``count``, ties in first-appearance order."""
+    totals = counts.groupby(key, sort=False)["count"].sum()
+    return totals.rename("count").sort_values(ascending=False)
+
+
+@dataclass
+class GenderTally:
+    """Personal record counts per civilité, first name and gender."""
+
+    counts: pd.DataFrame = field(default_factory=lambda: _empty(GENDER_KEYS))
+
+    @property
+    def total(self) -> int:
+        return int(self.counts["count"].sum())
+
+    def update(self, gendered: pd.DataFrame) -> None:
+        """Add the rows of a ``GenderAnalyzer.analyze`` result."""
+        self.counts = _combine(self.counts, _count(gendered, GENDER_KEYS), GENDER_KEYS)
+
+    def merge(self, other: "GenderTally") -> None:
+        """Add the counts of ``other``, which covers later records."""
+        self.counts = _combine(self.counts, other.counts, GENDER_KEYS)
+
+    def gender_counts(self) -> pd.Series:
+        """Records per declared gender, as ``value_counts`` gives them."""
+        return _ranked(self.counts, "gender")
+
+    def civilite_guess(self) -> pd.DataFrame:
+        """Records per civilité and guessed gender, as ``pd.crosstab`` gives them."""
+        table = (
+            self.counts.groupby(["civilite", "gender_guess"])["count"]
+            .sum()
+            .unstack(fill_value=0)
+        )
+        return table.astype("int64")
+
+    def first_names(self) -> pd.Series:
+        """Records per title-cased first name, most frequent first."""
+        counts = self.counts.assign(first_name=self.counts["first_name"].str.title())
+        return _ranked(counts, "first_name")
+
+
+@dataclass
+class OccupationCounts:
+    """Spouse activity counts per occupation, spouse gender and deposit year."""
+
+    counts: pd.DataFrame = field(default_factory=lambda: _empty(OCCUPATION_KEYS))
+
+    def update(self, spouse_df: pd.DataFrame, personal_df: pd.DataFrame) -> None:
+        """Add the spouse activities of a batch.
+
+        ``personal_df`` holds the batch's personal records with the
+        ``gender`` column of ``GenderAnalyzer.analyze``. Activities without
+        an occupation or deposit date, and hidden occupations, are skipped.
+        """
+        df = spouse_df.merge(
+            personal_df[["uuid", "dateDepot", "gender"]], on="uuid", how="inner"
+        )
+        df = df.dropna(subset=["activiteProf", "dateDepot"])
+        df["activiteProf"] = df["activiteProf"].astype(str).str.strip()
+        df = df[df["activiteProf"] != "[Données non publiées]"]
+        df["year"] = parse_dates(df["dateDepot"], DEPOSIT_FORMAT).dt.year
+        df["spouse_gender"] = df["gender"].map({"male": "female", "female": "male"})
+        self.counts = _combine(self.counts, _count(df, OCCUPATION_KEYS), OCCUPATION_KEYS)
+
+    def merge(self, other: "OccupationCounts") -> None:
+        """Add the counts of ``other``, which covers later records."""
+        self.counts = _combine(self.counts, other.counts, OCCUPATION_KEYS)
@@ -0,0 +1,268 @@
+"""Pluggable XML backends for the record extractors.
+
+Two backends expose the same interface: ``parse(data)`` (bytes to root
+element, raising ``xml.etree.ElementTree.ParseError`` on malformed input),
+``parse_declaration(path, data=None)`` (the same after dropping attachment
+payloads) and one method per dataset named like the functions of
+:mod:`full_pipeline.records`.
+
+* ``etree`` uses the standard library and the functions of ``records``.
+* ``lxml`` uses lxml with XPath expressions compiled once per backend and
+  C-level tag filters; it follows the same lookup rules, so both produce
+  identical records.
+
+``get_backend("auto")`` picks lxml when it is installed.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import xml.etree.ElementTree as ET
+
+from declaration_store.attachments import strip_attachments
+
+from . import records
+from .records import clean_text, collapse
+
+try:  # pragma: no cover - optional dependency
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover - optional dependency
+    lxml_etree = None
+
+BACKENDS = ("auto", "etree", "lxml")
+
+
+class EtreeBackend:
+    """Standard-library ElementTree backend."""
+
+    name = "etree"
+
+    @staticmethod
+    def parse(data: bytes) -> ET.Element:
+        return ET.fromstring(data)
+
+    parse_declaration = staticmethod(records.parse_declaration)
+    personal_info_record = staticmethod(records.personal_info_record)
+    spouse_activity_records = staticmethod(records.spouse_activity_records)
+    stock_records = staticmethod(records.stock_records)
+    financial_participation_records = staticmethod(records.financial_participation_records)
+    external_role_records = staticmethod(records.external_role_records)
+
+
+class LxmlBackend:
+    """lxml backend.
+
+    Structural paths (``items/items``, the role sections, leaf ``montant``
+    amounts) are XPath expressions compiled once. Descendant and namespace
+    agnostic lookups use lxml's C-level tag filters, and an item's fields are
+    read in one pass over its children, which is cheaper than one XPath call
+    per field.
+    """
+
+    name = "lxml"
+
+    _PARTICIPATION_FIELDS = (
+        "nomSociete",
+        "evaluation",
+        "capitalDetenu",
+        "nombreParts",
+        "remuneration",
+    )
+
+    def __init__(self) -> None:
+        if lxml_etree is None:
+            raise ImportError("The lxml backend requires the 'lxml' package")
+        xpath = lxml_etree.XPath
+        # huge_tree lifts libxml2's limit on very large text nodes.
+        self._parser = lxml_etree.XMLParser(huge_tree=True)
+        self._first_declaration = xpath("descendant::declaration[1]")
+        self._items = xpath("items/items")
+        self._dirigeant_items = xpath("descendant::participationDirigeantDto/items/items")
+        self._benevole_items = xpath("descendant::fonctionBenevoleDto/items/items")
+        self._leaf_montants = xpath("descendant::montant[not(montant)]")
+
+    # -- parsing ----------------------------------------------------------
+
+    def parse(self, data: bytes):
+        try:
+            return lxml_etree.fromstring(data, self._parser)
+        except lxml_etree.XMLSyntaxError as exc:
+            raise ET.ParseError(str(exc)) from exc
+
+    def parse_declaration(self, path: Path, data: Optional[bytes] = None):
+        if data is None:
+            data = Path(path).read_bytes()
+        return self.parse(strip_attachments(data))
+
+    # -- helpers ----------------------------------------------------------
+
+    @staticmethod
+    def _texts(elem) -> Dict[str, str]:
+        """Map each child tag to the text of its first occurrence (``findtext``)."""
+        texts: Dict[str, str] = {}
+        if elem is None:
+            return texts
+        for child in elem:
+            tag = child.tag
+            if tag not in texts:
+                texts[tag] = child.text or ""
+        return texts
+
+    @staticmethod
+    def _unique(parent, tag: str, name: str):
+        if parent is None:
+            return None
+        found = list(parent.iterdescendants(tag))
+        if len(found) > 1:
+            raise ValueError(f"Multiple <{tag}> elements found in {name}")
+        return found[0] if found else None
+
+    def _declaration(self, root, name: str):
+        return root if root.tag == "declaration" else self._unique(root, "declaration", name)
+
+    def _remuneration(self, item) -> str:
+        elem = item.find("remuneration")
+        if elem is None:
+            return ""
+        total = 0.0
+        for m in self._leaf_montants(elem):
+            if (m.text or '').strip():
+                text = m.text.strip().replace(' ', '').replace(',', '.')
+                try:
+                    total += float(text)
+                except ValueError:
+                    continue
+        return str(total) if total else ""
+
+    # -- records ----------------------------------------------------------
+
+    def personal_info_record(self, root, name: str) -> Dict[str, str]:
+        declaration = self._declaration(root, name)
+        general = self._unique(declaration, "general", name)
+        declarant = self._unique(general, "declarant", name)
+        top = self._texts(declaration)
+        person = self._texts(declarant)
+        return {
+            "file": name,
+            "dateDepot": top.get("dateDepot", "").strip(),
+            "uuid": top.get("uuid", "").strip(),
+            "civilite": person.get("civilite", "").strip(),
+            "nom": person.get("nom", "").strip(),
+            "prenom": person.get("prenom", "").strip(),
+            "email": person.get("email", "").strip(),
+            "dateNaissance": person.get("dateNaissance", "").strip(),
+        }
+
+    def spouse_activity_records(self, root, name: str) -> List[Dict[str, str]]:
+        declaration = self._declaration(root, name)
+        uuid = self._texts(declaration).get("uuid", "").strip()
+        activ_dto = self._unique(declaration, "activProfConjointDto", name)
+        if activ_dto is None:
+            return []
+        rows = []
+        for item in self._items(activ_dto):
+            texts = self._texts(item)
+            rows.append(
+                {
+                    "uuid": uuid,
+                    "nomConjoint": collapse(texts.get("nomConjoint")),
+                    "employeurConjoint": collapse(texts.get("employeurConjoint")),
+                    "activiteProf": collapse(texts.get("activiteProf")),
+                    "commentaire": collapse(texts.get("commentaire")),
+                }
+            )
+        return rows
+
+    def stock_records(self, root) -> List[Dict[str, str]]:
+        found = self._first_declaration(root)
+        if not found:
+            return []
+        declaration = found[0]
+        pf = declaration.find("participationFinanciereDto")
+        if pf is None:
+            return []
+        uuid = self._texts(declaration).get("uuid", "")
+        rows = []
+        for item in self._items(pf):
+            texts = self._texts(item)
+            rows.append(
+                {
+                    "uuid": uuid,
+                    "nomSociete": " ".join(texts.get("nomSociete", "").split()),
+                    "evaluation": texts.get("evaluation", ""),
+                    "capitalDetenu": texts.get("capitalDetenu", ""),
+                    "nombreParts": texts.get("nombreParts", ""),
+                    "commentaire": texts.get("commentaire", ""),
+                    "remuneration": texts.get("remuneration", ""),
+                }
+            )
+        return rows
+
+    def financial_participation_records(self, root, name: str) -> Iterator[Dict[str, str]]:
+        # "{*}tag" matches the local name in any namespace, like ``localname``.
+        for pf in root.iter("{*}participationFinanciereDto"):
+            container = next(pf.iterchildren("{*}items"), None)
+            if container is None:
+                continue
+            for item in container.iterchildren("{*}items"):
+                texts: Dict[str, str] = {}
+                for child in item.iterchildren("{*}*"):
+                    local = lxml_etree.QName(child).localname
+                    if local not in texts:
+                        texts[local] = child.text
+                row = {"file": name}
+                for tag in self._PARTICIPATION_FIELDS:
+                    text = texts.get(tag)
+                    row[tag] = clean_text(text) if text else ""
+                yield row
+
+    def external_role_records(self, root, name: str) -> List[Dict[str, str]]:
+        rows = []
+        for item in self._dirigeant_items(root):
+            t = self._texts(item)
+            organization = (
+                t.get("nomSociete")
+                or t.get("nomStructure")
+                or t.get("organisme")
+                or t.get("activite")
+                or ""
+            )
+            role = (
+                t.get("activite")
+                or t.get("descriptionActivite")
+                or t.get("fonctionDirigeant")
+                or t.get("nomSociete")
+                or ""
+            )
+            rows.append(self._role(name, "participationDirigeant", organization, role, item, t))
+        for item in self._benevole_items(root):
+            t = self._texts(item)
+            organization = t.get("nomStructure") or t.get("nomSociete") or t.get("organisme") or ""
+            role = t.get("descriptionActivite") or t.get("activite") or ""
+            rows.append(self._role(name, "fonctionBenevole", organization, role, item, t))
+        return rows
+
+    def _role(
+        self, name: str, kind: str, organization: str, role: str, item, texts: Dict[str, str]
+    ) -> Dict[str, str]:
+        return {
+            "file": name,
+            "type": kind,
+            "organization": organization,
+            "role": role,
+            "remuneration": self._remuneration(item),
+            "date_start": texts.get("dateDebut") or "",
+            "date_end": texts.get("dateFin") or "",
+        }
+
+
+def get_backend(name: str = "auto"):
+    """Return an ``etree`` or ``lxml`` backend; ``auto`` prefers lxml."""
+    if name == "auto":
+        name = "lxml" if lxml_etree is not None else "etree"
+    if name == "etree":
+        return EtreeBackend()
+    if name == "lxml":
+        return LxmlBackend()
+    raise ValueError(f"Unknown XML backend: {name}")
@@ -0,0 +1,181 @@
+"""Record batches streamed by ``DeclarationPipeline.iter_batches`` and their sinks.
+
+A :class:`RecordBatch` holds the records of a run of declarations as one
+string-typed DataFrame per table. Name mentions are kept in long form, one
+``(name, file)`` row per hit, so batches can be written out as they come
+without holding any corpus-wide state. ``run`` aggregates the same hits into
+per-name counts.
+
+:class:`CsvSink` and :class:`ParquetSink` append batches to one file per
+table; Parquet needs the optional ``pyarrow`` package.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .records import (
+    EXTERNAL_ROLE_FIELDS,
+    FINANCIAL_PARTICIPATION_FIELDS,
+    PERSONAL_INFO_FIELDS,
+    SPOUSE_ACTIVITY_FIELDS,
+    STOCK_FIELDS,
+)
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+# Table name -> columns, in the order sinks write them.
+BATCH_TABLES: Dict[str, Tuple[str, ...]] = {
+    "personal_info": tuple(PERSONAL_INFO_FIELDS),
+    "spouse_activities": tuple(SPOUSE_ACTIVITY_FIELDS),
+    "stocks": tuple(STOCK_FIELDS),
+    "financial_participations": tuple(FINANCIAL_PARTICIPATION_FIELDS),
+    "external_roles": tuple(EXTERNAL_ROLE_FIELDS),
+    "organization_mentions": ("organization", "file"),
+    "people_mentions": ("person", "file"),
+}
+
+
+def _table(rows: List[Dict[str, str]], columns: Tuple[str, ...]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=list(columns), dtype="string")
+
+
+def _hit_rows(hits: Dict[str, List[str]], label: str) -> List[Dict[str, str]]:
+    return [{label: name, "file": file} for name, files in hits.items() for file in files]
+
+
+@dataclass
+class RecordBatch:
+    """Records extracted from ``files``, one DataFrame per table."""
+
+    files: List[str]
+    personal_info: pd.DataFrame
+    spouse_activities: pd.DataFrame
+    stocks: pd.DataFrame
+    financial_participations: pd.DataFrame
+    external_roles: pd.DataFrame
+    organization_mentions: pd.DataFrame
+    people_mentions: pd.DataFrame
+
+    @classmethod
+    def from_rows(
+        cls,
+        files: List[str],
+        rows: Dict[str, List[Dict[str, str]]],
+        organization_hits: Dict[str, List[str]],
+        people_hits: Dict[str, List[str]],
+    ) -> "RecordBatch":
+        """Build a batch from per-table row dicts and ``name -> files`` hits."""
+        rows = dict(rows)
+        rows["organization_mentions"] = _hit_rows(organization_hits, "organization")
+        rows["people_mentions"] = _hit_rows(people_hits, "person")
+        return cls(
+            files,
+            **{name: _table(rows.get(name, []), columns) for name, columns in BATCH_TABLES.items()},
+        )
+
+    def tables(self) -> Dict[str, pd.DataFrame]:
+        """Return ``table name -> DataFrame`` in :data:`BATCH_TABLES` order."""
+        return {name: getattr(self, name) for name in BATCH_TABLES}
+
+
+def _check_tables(tables: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    tables = tuple(BATCH_TABLES if tables is None else tables)
+    unknown = set(tables) - set(BATCH_TABLES)
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))}")
+    return tables
+
+
+class CsvSink:
+    """Append batches to ``directory/<table>.csv``.
+
+    Files are created with their header when the sink opens, so tables that
+    never receive a row still get one.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        tables: Optional[Iterable[str]] = None,
+        encoding: str = "utf-8",
+        lineterminator: str = "\r\n",
+    ) -> None:
+        self.directory = Path(directory)
+        self.tables = _check_tables(tables)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files = {}
+        self._writers = {}
+        for name in self.tables:
+            handle = open(self.directory / f"{name}.csv", "w", newline="", encoding=encoding)
+            writer = csv.writer(handle, lineterminator=lineterminator)
+            writer.writerow(BATCH_TABLES[name])
+            self._files[name] = handle
+            self._writers[name] = writer
+
+    def write(self, batch: RecordBatch) -> None:
+        for name in self.tables:
+            df = getattr(batch, name)
+            self._writers[name].writerows(df.fillna("").itertuples(index=False, name=None))
+
+    def close(self) -> None:
+        for handle in self._files.values():
+            handle.close()
+        self._files = {}
+
+    def __enter__(self) -> "CsvSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ParquetSink:
+    """Append batches to ``directory/<table>.parquet``, one row group per batch."""
+
+    def __init__(
+        self, directory: Union[str, Path], tables: Optional[Iterable[str]] = None
+    ) -> None:
+        if pq is None:
+            raise ImportError("ParquetSink requires the 'pyarrow' package")
+        self.directory = Path(directory)
+        self.tables = _check_tables(tables)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._schemas = {
+            name: pa.schema([(column, pa.string()) for column in BATCH_TABLES[name]])
+            for name in self.tables
+        }
+        self._writers = {
+            name: pq.ParquetWriter(self.directory / f"{name}.parquet", schema)
+            for name, schema in self._schemas.items()
+        }
+
+    def write(self, batch: RecordBatch) -> None:
+        for name in self.tables:
+            df = getattr(batch, name)
+            if len(df):
+                table = pa.Table.from_pandas(
+                    df, schema=self._schemas[name], preserve_index=False
+                )
+                self._writers[name].write_table(table)
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def __enter__(self) -> "ParquetSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
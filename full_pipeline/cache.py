@@ -0,0 +1,128 @@
+"""On-disk cache of per-file extraction results.
+
+:class:`ExtractionCache` is a SQLite table mapping each declaration file to
+the content hash it had when it was last parsed and the records and mention
+hits extracted from it, stored as JSON. ``DeclarationPipeline`` hashes each
+file, reuses the stored results when the hash matches and only parses the
+files that are new or changed. After reading its whole source it drops the
+entries of files that are gone (:meth:`ExtractionCache.retain`), so the
+cache does not grow with every export.
+
+Results also depend on the pipeline settings (requested datasets, NER name
+lists, extractor version), summarised by :func:`cache_fingerprint`. A cache
+opened with a different fingerprint is emptied first, so stale results are
+never mixed with fresh ones.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+from declaration_store.manifest import content_hash
+
+# Bump when the record extractors change what they return for a document.
+CACHE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS extractions (
+    name TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+# SQLite's default limit on host parameters is 999.
+_LOOKUP_BATCH = 500
+
+
+def cache_fingerprint(**settings) -> str:
+    """Return a hash of the JSON-serialisable settings results depend on."""
+    settings["version"] = CACHE_VERSION
+    return content_hash(json.dumps(settings, sort_keys=True).encode("utf-8"))
+
+
+class ExtractionCache:
+    """Per-file extraction results keyed by file name and content hash."""
+
+    def __init__(self, path: Union[str, Path], fingerprint: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path)
+        # The cache can always be rebuilt, so trade durability for fewer syncs.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != fingerprint:
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                (fingerprint,),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+
+    def get_many(self, keys: Sequence[Tuple[str, str]]) -> Dict[str, dict]:
+        """Return ``{name: payload}`` for the ``(name, hash)`` pairs stored as is."""
+        wanted = dict(keys)
+        found: Dict[str, dict] = {}
+        names = list(wanted)
+        for start in range(0, len(names), _LOOKUP_BATCH):
+            batch = names[start : start + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT name, hash, payload FROM extractions WHERE name IN ({placeholders})",
+                batch,
+            )
+            for name, digest, payload in rows:
+                if wanted[name] == digest:
+                    found[name] = json.loads(payload)
+        self.hits += len(found)
+        self.misses += len(wanted) - len(found)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, str, dict]]) -> None:
+        """Store ``(name, hash, payload)`` entries, replacing older ones."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO extractions (name, hash, payload) VALUES (?, ?, ?)",
+            (
+                (name, digest, json.dumps(payload, ensure_ascii=False))
+                for name, digest, payload in entries
+            ),
+        )
+        self._conn.commit()
+
+    def retain(self, names: Iterable[str]) -> int:
+        """Delete the entries of files not in ``names``; return how many were deleted."""
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (name TEXT PRIMARY KEY)")
+        self._conn.execute("DELETE FROM keep")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO keep (name) VALUES (?)", ((name,) for name in names)
+        )
+        deleted = self._conn.execute(
+            "DELETE FROM extractions WHERE name NOT IN (SELECT name FROM keep)"
+        ).rowcount
+        self._conn.execute("DROP TABLE keep")
+        self._conn.commit()
+        return deleted
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ExtractionCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,108 @@
+"""Typed Arrow tables and Parquet files for extracted datasets.
+
+``DeclarationPipeline.run`` returns every field as a string, exactly as it
+appears in the XML. :func:`to_arrow` converts a dataset to an Arrow table
+with real types:
+
+* low-cardinality columns (:data:`CATEGORY_COLUMNS`) are dictionary encoded;
+* date columns (:data:`~full_pipeline.dates.DATE_COLUMNS`) are parsed with
+  their fixed HATVP format (:func:`~full_pipeline.dates.parse_dates`) into
+  ``timestamp[ms]`` or ``date32``; values that do not match the format
+  become null;
+* numeric columns (mention counts) keep their type and everything else is
+  ``string``.
+
+:func:`to_frame` turns such a table back into pandas with categorical,
+``datetime64`` and Arrow-backed string columns, and :func:`write_parquet` /
+:func:`read_parquet` persist one dataset per file. Requires the optional
+``pyarrow`` package.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from .dates import DATE_COLUMNS, parse_dates
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+# Dataset -> columns stored as dictionary-encoded strings.
+CATEGORY_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "personal_info": ("civilite",),
+    "spouse_activities": ("activiteProf",),
+    "external_roles": ("type",),
+}
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Typed datasets require the 'pyarrow' package")
+
+
+def _strings(series: pd.Series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    return pa.array(series, type=pa.string(), from_pandas=True)
+
+
+def _date_array(series: pd.Series, fmt: str):
+    series = parse_dates(series, fmt)
+    # Parquet has no second unit, so timestamps are stored in milliseconds.
+    array = pa.array(series.dt.floor("s"), type=pa.timestamp("ms"), from_pandas=True)
+    return array if "%H" in fmt else array.cast(pa.date32())
+
+
+def to_arrow(df: pd.DataFrame, dataset: str) -> "pa.Table":
+    """Return ``df`` (one dataset of ``ExtractedData``) as a typed Arrow table."""
+    _require_pyarrow()
+    categories = CATEGORY_COLUMNS.get(dataset, ())
+    dates = DATE_COLUMNS.get(dataset, {})
+    arrays = []
+    for column in df.columns:
+        series = df[column]
+        if column in dates:
+            array = _date_array(series, dates[column])
+        elif column in categories:
+            array = _strings(series).dictionary_encode()
+        elif is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            array = pa.array(series, from_pandas=True)
+        else:
+            array = _strings(series)
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, names=[str(column) for column in df.columns])
+
+
+def to_frame(table: "pa.Table") -> pd.DataFrame:
+    """Convert a table from :func:`to_arrow` to pandas, keeping its types."""
+    _require_pyarrow()
+    string = pd.StringDtype("pyarrow")
+    return table.to_pandas(
+        date_as_object=False,
+        types_mapper={pa.string(): string, pa.large_string(): string}.get,
+    )
+
+
+def typed_frame(df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+    """Return ``df`` with the column types of :func:`to_arrow`."""
+    return to_frame(to_arrow(df, dataset))
+
+
+def write_parquet(df: pd.DataFrame, dataset: str, path: Union[str, Path]) -> None:
+    """Write ``df`` to a Parquet file with the types of :func:`to_arrow`."""
+    _require_pyarrow()
+    pq.write_table(to_arrow(df, dataset), Path(path))
+
+
+def read_parquet(path: Union[str, Path]) -> pd.DataFrame:
+    """Read a file written by :func:`write_parquet` as a typed DataFrame."""
+    _require_pyarrow()
+    return to_frame(pq.read_table(Path(path)))
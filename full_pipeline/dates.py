@@ -0,0 +1,50 @@
+"""Fixed-format date parsing shared by the extraction and analysis code.
+
+HATVP exports write deposit dates as ``31/12/2021 18:05:00`` and birth
+dates as ``31/12/1960``; the mandate list (``liste.csv``) uses ISO dates.
+:func:`parse_dates` parses such a column with its fixed format, once per
+distinct value, and returns ``datetime64`` values (``NaT`` where a value
+does not match). Columns that are already ``datetime64`` are returned as
+they are, so analyzers can take either the string datasets of
+``DeclarationPipeline.run`` or datasets whose dates were parsed once with
+:func:`with_parsed_dates` / ``ExtractedData.with_dates``.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import pandas as pd
+
+DEPOSIT_FORMAT = "%d/%m/%Y %H:%M:%S"
+BIRTH_FORMAT = "%d/%m/%Y"
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
+# Dataset -> {column: strptime format}; formats with a time give timestamps.
+DATE_COLUMNS: Dict[str, Dict[str, str]] = {
+    "personal_info": {"dateDepot": DEPOSIT_FORMAT, "dateNaissance": BIRTH_FORMAT},
+}
+
+
+def parse_dates(values: pd.Series, fmt: str) -> pd.Series:
+    """Return ``values`` parsed with ``fmt`` as ``datetime64``.
+
+    Each distinct string is parsed once; values that do not match ``fmt``
+    become ``NaT``. ``datetime64`` input is returned unchanged.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=fmt, errors="coerce")
+    result = parsed.to_numpy().take(codes)
+    result[codes < 0] = None
+    return pd.Series(result, index=values.index, name=values.name, dtype=parsed.dtype)
+
+
+def with_parsed_dates(df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+    """Return a copy of ``df`` with the :data:`DATE_COLUMNS` of ``dataset`` parsed."""
+    data = df.copy()
+    for column, fmt in DATE_COLUMNS.get(dataset, {}).items():
+        if column in data.columns:
+            data[column] = parse_dates(data[column], fmt)
+    return data
@@ -0,0 +1,161 @@
+"""First-name gender guesses resolved once per distinct name.
+
+Declarations repeat the same few thousand first names across tens of
+thousands of rows, so :func:`guess_genders` factorizes the names, looks up
+each distinct one and broadcasts the answers back to the rows. Answers are
+the ones ``gender_guesser``'s ``Detector(case_sensitive=False).get_gender``
+gives.
+
+Building a ``Detector`` parses its whole dictionary file, so the answers for
+every name it knows are precomputed into :data:`GENDER_TABLE`, a gzipped
+text file with one line per gender listing its names. :func:`gender_table`
+loads it once per process; when the file is missing or was built from
+another ``gender_guesser`` version the table is computed from the detector
+instead. Rebuild the file after upgrading ``gender_guesser`` with::
+
+    python full_pipeline/gender.py
+
+:class:`GenderCache` keeps the answers in a JSON file between runs. It is
+keyed by the lower-cased name, which is all the case-insensitive detector
+looks at, and is emptied when the ``gender_guesser`` version changes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+from gender_guesser.detector import Detector
+
+# Bump when the way names are resolved changes.
+GENDER_CACHE_VERSION = 1
+
+GENDER_TABLE = Path(__file__).resolve().parent / "gender_table.tsv.gz"
+
+# Answer for names the dictionary does not contain.
+UNKNOWN = "unknown"
+
+
+def _source_version() -> str:
+    try:
+        return f"gender-guesser {metadata.version('gender-guesser')}"
+    except metadata.PackageNotFoundError:  # pragma: no cover - vendored copy
+        return "gender-guesser unknown"
+
+
+def _fingerprint() -> str:
+    return f"{GENDER_CACHE_VERSION}:{_source_version()}"
+
+
+@lru_cache(maxsize=None)
+def get_detector() -> Detector:
+    """Return the process-wide case-insensitive ``Detector``."""
+    return Detector(case_sensitive=False)
+
+
+def detector_table() -> Dict[str, str]:
+    """Return ``{name: get_gender(name)}`` for every name the detector knows."""
+    detector = get_detector()
+    return {name: detector.get_gender(name) for name in detector.names}
+
+
+def build_gender_table(path: Union[str, Path] = GENDER_TABLE) -> int:
+    """Write :func:`detector_table` to ``path``; return the number of names."""
+    groups: Dict[str, list] = {}
+    for name, gender in sorted(detector_table().items()):
+        groups.setdefault(gender, []).append(name)
+    lines = [f"# {_source_version()}"]
+    lines += ["\t".join([gender] + names) for gender, names in sorted(groups.items())]
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    Path(path).write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    return sum(len(names) for names in groups.values())
+
+
+def read_gender_table(path: Union[str, Path] = GENDER_TABLE) -> Optional[Dict[str, str]]:
+    """Load a table written by :func:`build_gender_table`.
+
+    Returns ``None`` when the file is missing or was built from another
+    ``gender_guesser`` version.
+    """
+    try:
+        lines = gzip.decompress(Path(path).read_bytes()).decode("utf-8").splitlines()
+    except FileNotFoundError:
+        return None
+    if not lines or lines[0] != f"# {_source_version()}":
+        return None
+    table: Dict[str, str] = {}
+    for line in lines[1:]:
+        gender, *names = line.split("\t")
+        table.update(dict.fromkeys(names, gender))
+    return table
+
+
+@lru_cache(maxsize=None)
+def gender_table() -> Dict[str, str]:
+    """Return the process-wide lower-cased name -> gender table."""
+    table = read_gender_table()
+    return table if table is not None else detector_table()
+
+
+class GenderCache:
+    """Name -> gender answers persisted as a JSON file."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.fingerprint = _fingerprint()
+        self.names: Dict[str, str] = {}
+        self.dirty = False
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("fingerprint") == self.fingerprint:
+                self.names = stored["names"]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str) -> Optional[str]:
+        return self.names.get(name.lower())
+
+    def set(self, name: str, gender: str) -> None:
+        self.names[name.lower()] = gender
+        self.dirty = True
+
+    def save(self) -> None:
+        """Write the cache if it changed since it was loaded."""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "names": self.names}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def guess_genders(first_names: pd.Series, cache: Optional[GenderCache] = None) -> pd.Series:
+    """Return ``Detector.get_gender`` for each name, resolving each distinct name once."""
+    codes, uniques = pd.factorize(first_names, use_na_sentinel=False)
+    genders = np.empty(len(uniques), dtype=object)
+    table = None
+    for i, name in enumerate(uniques):
+        gender = cache.get(name) if cache is not None and isinstance(name, str) else None
+        if gender is None:
+            if table is None:
+                table = gender_table()
+            gender = table.get(name.lower(), UNKNOWN)
+            if cache is not None:
+                cache.set(name, gender)
+        genders[i] = gender
+    return pd.Series(genders.take(codes), index=first_names.index, name=first_names.name)
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_gender_table()} names to {GENDER_TABLE}")
@@ -0,0 +1,109 @@
+"""Multi-pattern name matching for the mention tables.
+
+:class:`MentionMatcher` compiles a list of names into an Aho-Corasick
+automaton once and then reports every name occurring in a document in a
+single scan, instead of one ``name in text`` search per name. Matches are
+plain substring matches, overlapping and nested names included, so the
+result is exactly ``{name for name in names if name in text}``.
+
+The C implementation from the optional ``pyahocorasick`` package is used
+when it is installed; otherwise a pure-Python automaton is built.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+try:  # pragma: no cover - optional dependency
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+
+class MentionMatcher:
+    """Find which of ``names`` occur as substrings of a text."""
+
+    def __init__(self, names: Iterable[str], use_c: bool = True) -> None:
+        self.names: List[str] = list(dict.fromkeys(names))
+        # The empty string is a substring of every text.
+        self._always = [name for name in self.names if name == ""]
+        patterns = [name for name in self.names if name]
+        self._automaton = None
+        if use_c and ahocorasick is not None and patterns:
+            automaton = ahocorasick.Automaton()
+            for name in patterns:
+                automaton.add_word(name, name)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            self._build(patterns)
+
+    def _build(self, patterns: List[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[str]] = [[]]
+        for name in patterns:
+            state = 0
+            for ch in name:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(name)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        # Jump over text that cannot start a match while at the root.
+        starts = "".join(sorted(goto[0]))
+        self._start_re = re.compile(f"[{re.escape(starts)}]") if starts else None
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of names occurring in ``text``."""
+        found: Set[str] = set(self._always)
+        if self._automaton is not None:
+            for _, name in self._automaton.iter(text):
+                found.add(name)
+            return found
+        if self._start_re is None:
+            return found
+
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        search = self._start_re.search
+        state = 0
+        i = 0
+        n = len(text)
+        while i < n:
+            if state == 0:
+                m = search(text, i)
+                if m is None:
+                    break
+                i = m.start()
+                state = root[text[i]]
+            else:
+                ch = text[i]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+            i += 1
+        return found
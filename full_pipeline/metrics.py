@@ -0,0 +1,133 @@
+"""Stage timings and throughput counters for pipeline runs.
+
+:class:`PipelineMetrics` accumulates, for each named stage, wall time, CPU
+time, the number of calls and the files, bytes and records the stage
+handled. ``DeclarationPipeline`` fills one per run (``pipeline.metrics``)
+with these stages:
+
+* ``read``: loading declaration bytes from the source;
+* ``cache``: hashing files and extraction-cache lookups and writes;
+* ``mentions``: scanning each document for organization and people names;
+* ``parse``: pruning unused sections and parsing the XML;
+* ``records``: building the dataset rows from the parsed tree;
+* ``frames``: turning the rows into DataFrames at the end of ``run``;
+* ``run``: the whole call.
+
+CPU time comes from :func:`time.process_time`, so it covers the process
+that ran the stage. With a process pool, worker metrics are merged into
+the parent and their wall times add up to busy time across workers.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Union
+
+
+@dataclass
+class StageMetrics:
+    """Totals for one stage."""
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+    files: int = 0
+    bytes: int = 0
+    records: int = 0
+
+    def add(self, other: "StageMetrics") -> None:
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.calls += other.calls
+        self.files += other.files
+        self.bytes += other.bytes
+        self.records += other.records
+
+    def as_dict(self) -> dict:
+        """Return the totals plus files/s, records/s and MB/s over wall time."""
+        wall = max(self.wall, 1e-9)
+        data = asdict(self)
+        data["files_per_s"] = self.files / wall
+        data["records_per_s"] = self.records / wall
+        data["mb_per_s"] = self.bytes / (1024 * 1024) / wall
+        return data
+
+
+class PipelineMetrics:
+    """Per-stage metrics, in the order stages were first recorded."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageMetrics] = {}
+
+    def __getitem__(self, name: str) -> StageMetrics:
+        return self.stages[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.stages
+
+    def _stage(self, name: str) -> StageMetrics:
+        if name not in self.stages:
+            self.stages[name] = StageMetrics()
+        return self.stages[name]
+
+    def record(
+        self,
+        name: str,
+        wall: float,
+        cpu: float,
+        calls: int = 1,
+        files: int = 0,
+        bytes: int = 0,
+        records: int = 0,
+    ) -> None:
+        """Add a measurement taken by the caller to stage ``name``."""
+        self._stage(name).add(StageMetrics(wall, cpu, calls, files, bytes, records))
+
+    @contextmanager
+    def stage(
+        self, name: str, files: int = 0, bytes: int = 0, records: int = 0
+    ) -> Iterator[StageMetrics]:
+        """Time the ``with`` block as one call of stage ``name``.
+
+        The yielded :class:`StageMetrics` can be updated inside the block
+        with counts that are only known at the end.
+        """
+        counts = StageMetrics(calls=1, files=files, bytes=bytes, records=records)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield counts
+        finally:
+            counts.wall = time.perf_counter() - wall
+            counts.cpu = time.process_time() - cpu
+            self._stage(name).add(counts)
+
+    def merge(self, other: "PipelineMetrics") -> None:
+        """Add the stages of ``other``, e.g. metrics sent back by a worker."""
+        for name, stage in other.stages.items():
+            self._stage(name).add(stage)
+
+    def to_dict(self) -> Dict[str, dict]:
+        return {name: stage.as_dict() for name, stage in self.stages.items()}
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        """Write :meth:`to_dict` to ``path``."""
+        with Path(path).open("w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+    def summary(self) -> str:
+        """Return a plain-text table with one line per stage."""
+        header = f"{'stage':<28} {'wall s':>8} {'cpu s':>8} {'files':>7} {'MB':>7} {'files/s':>9} {'rec/s':>9}"
+        lines = [header, "-" * len(header)]
+        for name, stage in self.stages.items():
+            data = stage.as_dict()
+            lines.append(
+                f"{name:<28} {stage.wall:8.2f} {stage.cpu:8.2f} {stage.files:7d} "
+                f"{stage.bytes / (1024 * 1024):7.1f} {data['files_per_s']:9.0f} "
+                f"{data['records_per_s']:9.0f}"
+            )
+        return "\n".join(lines)
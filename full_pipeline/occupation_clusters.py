@@ -0,0 +1,242 @@
+"""Fuzzy clustering of free-text occupations.
+
+Spouse occupations are typed by hand, so "professeur des écoles",
+"professeure des ecoles" and "prof. des écoles" are different strings for
+the same job. :class:`OccupationClusterer` maps each spelling to a canonical
+one:
+
+1. every value is reduced to a key (:func:`occupation_key`: lower-case,
+   no accents, "[Données non publiées]" markers removed, punctuation
+   replaced by spaces); equal keys are one cluster;
+2. distinct keys are visited from the most to the least frequent. Each is
+   compared with the canonical keys found so far and joins the most similar
+   one, or becomes canonical itself. Two keys match when the
+   :class:`difflib.SequenceMatcher` ratio of their letters (spaces ignored)
+   reaches ``threshold``, or when they have the same two or more words up
+   to abbreviations: each word of one starts the same word of the other
+   ("prof des ecoles");
+3. comparisons are limited by a blocking index of character trigrams: only
+   the ``max_candidates`` canonical keys sharing the most trigrams with a key
+   are scored, so the cost grows with the number of keys rather than with
+   its square.
+
+Keys shorter than ``min_length`` only match exactly, since a couple of
+edits already turn one short word into another ("agent", "argent").
+
+The raw -> canonical mapping can be kept in a JSON file (``cache``): known
+values are looked up directly and new ones are matched against the
+canonical keys already stored, so clusters stay stable across runs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .occupations import normalize_job
+
+# Bump when keys or scoring change.
+CLUSTER_VERSION = 1
+
+_HIDDEN = re.compile(r"\[?donnees? non publiees?\]?")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def occupation_key(text: str) -> str:
+    """Return the comparison key of an occupation."""
+    return _NON_ALNUM.sub(" ", _HIDDEN.sub(" ", normalize_job(text))).strip()
+
+
+def occupation_label(text: str) -> str:
+    """Return the displayed form of an occupation: normalised, markers removed."""
+    normalized = normalize_job(text)
+    return " ".join(_HIDDEN.sub(" ", normalized).split()) or normalized
+
+
+def _abbreviates(short: List[str], long: List[str]) -> bool:
+    """Whether each word of ``short`` starts the same word of ``long``."""
+    return short != long and all(
+        len(s) >= 3 and l.startswith(s) for s, l in zip(short, long)
+    )
+
+
+def _trigrams(key: str) -> set:
+    padded = f" {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _BlockingIndex:
+    """Canonical keys indexed by their character trigrams."""
+
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+    def add(self, key: str) -> None:
+        for gram in _trigrams(key):
+            self.postings[gram].append(len(self.keys))
+        self.keys.append(key)
+
+    def candidates(self, key: str, limit: int) -> List[str]:
+        """Return up to ``limit`` keys sharing the most of ``key``'s rarer trigrams.
+
+        Similar keys share most of their trigrams, so probing the rarest
+        half finds them while skipping the long postings of common ones
+        (" de", "es ", ...).
+        """
+        grams = sorted(_trigrams(key), key=lambda gram: len(self.postings.get(gram, ())))
+        shared: Counter = Counter()
+        for gram in grams[: max(4, len(grams) // 2)]:
+            shared.update(self.postings.get(gram, ()))
+        return [self.keys[i] for i, _ in shared.most_common(limit)]
+
+
+class OccupationClusterer:
+    """Map occupation spellings to canonical occupations."""
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        min_length: int = 6,
+        max_candidates: int = 20,
+        cache: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.threshold = threshold
+        self.min_length = min_length
+        self.max_candidates = max_candidates
+        self.cache = Path(cache) if cache is not None else None
+        # raw value -> canonical key, and canonical key -> label.
+        self.mapping: Dict[str, str] = {}
+        self.labels: Dict[str, str] = {}
+        self.index = _BlockingIndex()
+        if self.cache is not None and self.cache.exists():
+            self._load()
+
+    def _fingerprint(self) -> str:
+        return f"{CLUSTER_VERSION}:{self.threshold}:{self.min_length}:{self.max_candidates}"
+
+    def _load(self) -> None:
+        with self.cache.open(encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("fingerprint") != self._fingerprint():
+            return
+        self.mapping = stored["mapping"]
+        self.labels = stored["labels"]
+        for key in self.labels:
+            self.index.add(key)
+
+    def save(self) -> None:
+        """Write the mapping to ``cache``."""
+        if self.cache is None:
+            return
+        self.cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache.with_name(self.cache.name + ".tmp")
+        data = {"fingerprint": self._fingerprint(), "mapping": self.mapping, "labels": self.labels}
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.cache)
+
+    def _match(self, key: str) -> Optional[str]:
+        if key in self.labels:
+            return key
+        if len(key) < self.min_length:
+            return None
+        words = key.split()
+        letters = key.replace(" ", "")
+        best, best_score = None, self.threshold
+        for candidate in self.index.candidates(key, self.max_candidates):
+            if len(candidate) < self.min_length:
+                continue
+            other = candidate.split()
+            if len(words) > 1 and len(other) == len(words) and (
+                _abbreviates(words, other) or _abbreviates(other, words)
+            ):
+                return candidate
+            target = candidate.replace(" ", "")
+            # 2 * min / total bounds the ratio from above.
+            if 2 * min(len(letters), len(target)) / (len(letters) + len(target)) < best_score:
+                continue
+            matcher = SequenceMatcher(None, letters, target, autojunk=False)
+            if matcher.quick_ratio() < best_score:
+                continue
+            score = matcher.ratio()
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def fit(self, values: pd.Series, weights: Optional[pd.Series] = None) -> "OccupationClusterer":
+        """Assign a canonical occupation to every string in ``values`` not seen yet.
+
+        ``weights`` gives the number of occurrences each value stands for,
+        e.g. for values taken from a count table; by default each counts once.
+        """
+        present = values.notna().to_numpy()
+        values = values[present].astype(str)
+        if weights is None:
+            counts = values.value_counts()
+        else:
+            counts = (
+                pd.Series(np.asarray(weights)[present], index=values.index)
+                .groupby(values.to_numpy(), sort=False)
+                .sum()
+                .sort_values(ascending=False)
+            )
+        new = counts[~counts.index.isin(list(self.mapping))]
+        if new.empty:
+            return self
+        keys = pd.Series([occupation_key(raw) for raw in new.index], index=new.index)
+        labels = pd.Series([occupation_label(raw) for raw in new.index], index=new.index)
+        weights = new.groupby(keys.to_numpy()).sum()
+        # Most frequent keys first; ties in key order so results are stable.
+        order = sorted(weights.index, key=lambda key: (-weights[key], key))
+        # The label of a new canonical key is its most frequent spelling.
+        label_of = labels.groupby(keys.to_numpy()).first()
+        canonical: Dict[str, str] = {}
+        for key in order:
+            match = self._match(key)
+            if match is None:
+                match = key
+                self.labels[key] = label_of[key]
+                self.index.add(key)
+            canonical[key] = match
+        for raw, key in keys.items():
+            self.mapping[raw] = canonical[key]
+        return self
+
+    def canonicalize(self, values: pd.Series, weights: Optional[pd.Series] = None) -> pd.Series:
+        """Return the canonical occupation of each value as a categorical.
+
+        Unseen values are clustered first (see :meth:`fit` for ``weights``)
+        and the cache, if any, is updated.
+        Canonical occupations are lower-case and unaccented like
+        ``normalize_jobs`` output, without "[Données non publiées]" markers.
+        """
+        known = len(self.mapping)
+        self.fit(values, weights)
+        if len(self.mapping) != known:
+            self.save()
+        codes, uniques = pd.factorize(values)
+        canonical = np.array(
+            [self.labels[self.mapping[str(raw)]] for raw in uniques], dtype=object
+        )
+        categories, inverse = np.unique(canonical, return_inverse=True)
+        codes = np.where(codes < 0, -1, inverse.take(codes))
+        job = pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+        return pd.Series(job, index=values.index, name=values.name)
+
+    def clusters(self) -> pd.DataFrame:
+        """Return the mapping as a ``raw``/``canonical`` table."""
+        return pd.DataFrame(
+            {
+                "raw": list(self.mapping),
+                "canonical": [self.labels[key] for key in self.mapping.values()],
+            }
+        )
@@ -0,0 +1,177 @@
+"""Normalisation and classification of free-text occupations.
+
+Spouse occupations repeat heavily: a few thousand distinct spellings cover
+every row. :func:`normalize_jobs` lower-cases and strips accents once per
+distinct value and returns a categorical column, so later group-bys work on
+integer codes instead of strings. Categories are sorted, which keeps
+group-by output in the same order as with plain strings.
+
+:func:`clean_occupations` and :func:`classify_pay_grades` are the cleaning
+and keyword pay-grade heuristics of the gender discrimination analysis,
+run as pandas string operations over distinct values with precompiled
+keyword alternations.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_job(text: str) -> str:
+    """Lower-case ``text`` and drop its accents and other non-ASCII characters."""
+    return unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode("utf-8")
+
+
+def normalize_jobs(values: pd.Series) -> pd.Series:
+    """Return :func:`normalize_job` of each string in ``values`` as a categorical."""
+    codes, uniques = pd.factorize(values)
+    normalized = np.array([normalize_job(value) for value in uniques], dtype=object)
+    categories, inverse = np.unique(normalized, return_inverse=True)
+    codes = np.where(codes < 0, -1, inverse.take(codes))
+    job = pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+    return pd.Series(job, index=values.index, name=values.name)
+
+
+def job_counts(job: pd.Series, weights: Optional[pd.Series] = None) -> pd.Series:
+    """``value_counts`` of a :func:`normalize_jobs` column.
+
+    Categories are counted in the order they first appear, as
+    ``value_counts`` does for strings, so ties keep the same order. With
+    ``weights``, each row counts for its weight instead of once.
+    """
+    codes = job.cat.codes.to_numpy()
+    valid = codes >= 0
+    codes = codes[valid]
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.int64)[valid]
+    present, first = np.unique(codes, return_index=True)
+    order = present[np.argsort(first, kind="stable")]
+    counts = np.bincount(codes, weights, minlength=len(job.cat.categories))
+    counts = counts.astype(np.int64)[order]
+    index = pd.Index(job.cat.categories.take(order), dtype=object, name=job.name)
+    return pd.Series(counts, index=index, name="count").sort_values(ascending=False)
+
+
+# ---------------------------------------------------------------------------
+# Cleaning and pay grades
+# ---------------------------------------------------------------------------
+
+PLACEHOLDER_VALUES = {"", "-", "/", "0", "na", "n/a", "none", "null", "neant"}
+
+PLACEHOLDER_SUBSTRINGS = [
+    "donnees non publiees",
+    "donnee non publiee",
+    "sans profession",
+    "sans activite",
+    "sans emploi",
+    "retraite",
+]
+
+HIGH_PAY_KEYWORDS = [
+    "directeur",
+    "director",
+    "manager",
+    "chef",
+    "president",
+    "medecin",
+    "doctor",
+    "ingenieur",
+    "ingenieure",
+    "professeur",
+    "avocat",
+    "notaire",
+    "architect",
+    "entrepreneur",
+    "pharmacien",
+    "pilote",
+]
+
+LOW_PAY_KEYWORDS = [
+    "assistant",
+    "assistante",
+    "secretaire",
+    "vendeur",
+    "vendeuse",
+    "agent",
+    "employe",
+    "employee",
+    "caissier",
+    "caissiere",
+    "serveur",
+    "serveuse",
+    "aide",
+    "infirmier",
+    "infirmiere",
+    "technicien",
+    "ouvrier",
+    "artisan",
+    "animateur",
+    "animatrice",
+]
+
+_QUOTES = re.compile(r"[\"']")
+_SPACES = re.compile(r"\s+")
+_LETTER = re.compile(r"[a-z]")
+
+
+def _keywords(words: List[str]) -> "re.Pattern[str]":
+    return re.compile("|".join(map(re.escape, words)))
+
+
+_PLACEHOLDER_RE = _keywords(PLACEHOLDER_SUBSTRINGS)
+_HIGH_PAY_RE = _keywords(HIGH_PAY_KEYWORDS)
+_LOW_PAY_RE = _keywords(LOW_PAY_KEYWORDS)
+
+
+def _per_unique(values: pd.Series, func) -> pd.Series:
+    """Apply ``func`` (uniques Series -> array) to distinct values and broadcast back."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = np.asarray(func(pd.Series(uniques, dtype=object)), dtype=object)
+    return pd.Series(mapped.take(codes), index=values.index, name=values.name)
+
+
+def _clean_unique(occupations: pd.Series) -> np.ndarray:
+    text = occupations.astype(str).str.strip().str.lower().str.replace(_QUOTES, "", regex=True)
+    text = text.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    text = text.str.replace(_SPACES, " ", regex=True)
+    drop = (
+        occupations.isna()
+        | ~text.str.contains(_LETTER)
+        | text.str.contains(_PLACEHOLDER_RE)
+        | text.isin(PLACEHOLDER_VALUES)
+    )
+    return np.where(drop.to_numpy(), None, text.to_numpy(dtype=object))
+
+
+def clean_occupations(values: pd.Series) -> pd.Series:
+    """Normalise occupation text, with ``None`` for blanks and placeholders.
+
+    Strips, lower-cases, removes quotes and accents and collapses spaces;
+    values without letters, placeholders ("données non publiées", "sans
+    profession", ...) and retirees become ``None``. Each distinct value is
+    cleaned once.
+    """
+    return _per_unique(values, _clean_unique)
+
+
+def _pay_unique(jobs: pd.Series) -> np.ndarray:
+    jobs = jobs.astype(str)
+    return np.select(
+        [jobs.str.contains(_HIGH_PAY_RE).to_numpy(), jobs.str.contains(_LOW_PAY_RE).to_numpy()],
+        ["high", "low"],
+        "unknown",
+    )
+
+
+def classify_pay_grades(jobs: pd.Series) -> pd.Series:
+    """Return "high", "low" or "unknown" for each cleaned occupation.
+
+    An occupation containing any of :data:`HIGH_PAY_KEYWORDS` is "high",
+    otherwise one containing any of :data:`LOW_PAY_KEYWORDS` is "low".
+    """
+    return _per_unique(jobs, _pay_unique)
@@ -2,118 +2,575 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, Optional, Dict, List, Tuple
-import re
-import unicodedata
+from typing import Iterable, Iterator, Optional, Dict, List, Tuple, Union
+import time
 import xml.etree.ElementTree as ET
 
 import pandas as pd
 from tqdm import tqdm
-from gender_guesser.detector import Detector
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from declaration_store import open_source
+from declaration_store.manifest import content_hash
+from declaration_store.sources import DeclarationSource
+
+from . import columnar
+from .aggregates import GenderTally, OccupationCounts
+from .backends import get_backend
+from .batches import RecordBatch
+from .cache import ExtractionCache, cache_fingerprint
+from .dates import BIRTH_FORMAT, parse_dates, with_parsed_dates
+from .gender import GenderCache, get_detector, guess_genders
+from .mentions import MentionMatcher
+from .occupation_clusters import OccupationClusterer
+from .occupations import (
+    HIGH_PAY_KEYWORDS,
+    LOW_PAY_KEYWORDS,
+    classify_pay_grades,
+    clean_occupations,
+    job_counts,
+    normalize_jobs,
+)
+from .metrics import PipelineMetrics
+from .sections import DATASETS, SectionPruner
+from .records import (
+    EXTERNAL_ROLE_FIELDS,
+    FINANCIAL_PARTICIPATION_FIELDS,
+    PERSONAL_INFO_FIELDS,
+    SPOUSE_ACTIVITY_FIELDS,
+    STOCK_FIELDS,
+)
+
 # ---------------------------------------------------------------------------
 # Extraction utilities
 # ---------------------------------------------------------------------------
 
 @dataclass
 class ExtractedData:
-    """Container for extracted datasets."""
+    """Container for extracted datasets.
+
+    ``run`` fills every column with the strings found in the XML.
+    :meth:`with_dates` parses the date columns, :meth:`typed` converts the
+    datasets to categorical, date and Arrow string columns (see
+    :mod:`full_pipeline.columnar`), and
+    :meth:`to_parquet` / :meth:`read_parquet` persist them with those types.
+    """
 
     personal_info: pd.DataFrame
     spouse_activities: pd.DataFrame
     organization_mentions: pd.DataFrame
     people_mentions: pd.DataFrame
+    stocks: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=STOCK_FIELDS))
+    financial_participations: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(columns=FINANCIAL_PARTICIPATION_FIELDS)
+    )
+    external_roles: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(columns=EXTERNAL_ROLE_FIELDS)
+    )
+
+    def typed(self) -> "ExtractedData":
+        """Return a copy with typed, dictionary-encoded and Arrow-backed columns."""
+        return ExtractedData(
+            **{name: columnar.typed_frame(df, name) for name, df in vars(self).items()}
+        )
+
+    def with_dates(self) -> "ExtractedData":
+        """Return a copy whose date columns are parsed to ``datetime64``.
+
+        Dates are parsed once with their fixed HATVP formats (see
+        :mod:`full_pipeline.dates`); the analyzers use such columns as they
+        are instead of parsing the strings again.
+        """
+        return ExtractedData(
+            **{name: with_parsed_dates(df, name) for name, df in vars(self).items()}
+        )
+
+    def to_parquet(self, directory: Union[str, Path]) -> None:
+        """Write each dataset to ``directory/<dataset>.parquet`` with typed columns."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, df in vars(self).items():
+            columnar.write_parquet(df, name, directory / f"{name}.parquet")
+
+    @classmethod
+    def read_parquet(cls, directory: Union[str, Path]) -> "ExtractedData":
+        """Load datasets written by :meth:`to_parquet` as typed DataFrames."""
+        directory = Path(directory)
+        return cls(
+            **{
+                name: columnar.read_parquet(directory / f"{name}.parquet")
+                for name in cls.__dataclass_fields__
+            }
+        )
+
+
+_ROW_LISTS = ("personal_rows", "spouse_rows", "stock_rows", "participation_rows", "role_rows")
+
+
+@dataclass
+class _PartialExtraction:
+    """Rows and name-mention hits extracted from a run of files."""
+
+    personal_rows: List[Dict[str, str]] = field(default_factory=list)
+    spouse_rows: List[Dict[str, str]] = field(default_factory=list)
+    stock_rows: List[Dict[str, str]] = field(default_factory=list)
+    participation_rows: List[Dict[str, str]] = field(default_factory=list)
+    role_rows: List[Dict[str, str]] = field(default_factory=list)
+    organization_hits: Dict[str, List[str]] = field(default_factory=dict)
+    people_hits: Dict[str, List[str]] = field(default_factory=dict)
+    metrics: PipelineMetrics = field(default_factory=PipelineMetrics)
+
+    def row_count(self) -> int:
+        return sum(len(getattr(self, attr)) for attr in _ROW_LISTS)
+
+    def extend(self, other: "_PartialExtraction") -> None:
+        """Append the results of ``other``, which covers later files."""
+        self.metrics.merge(other.metrics)
+        self.personal_rows.extend(other.personal_rows)
+        self.spouse_rows.extend(other.spouse_rows)
+        self.stock_rows.extend(other.stock_rows)
+        self.participation_rows.extend(other.participation_rows)
+        self.role_rows.extend(other.role_rows)
+        for hits, more in (
+            (self.organization_hits, other.organization_hits),
+            (self.people_hits, other.people_hits),
+        ):
+            for name, files in more.items():
+                hits.setdefault(name, []).extend(files)
+
+    def to_payload(self) -> dict:
+        """Return the results of a single file as JSON-serialisable data."""
+        payload = {attr: getattr(self, attr) for attr in _ROW_LISTS}
+        payload["organizations"] = list(self.organization_hits)
+        payload["people"] = list(self.people_hits)
+        return payload
+
+    @classmethod
+    def from_payload(cls, name: str, payload: dict) -> "_PartialExtraction":
+        """Rebuild the results of file ``name`` from :meth:`to_payload` data."""
+        part = cls(**{attr: payload[attr] for attr in _ROW_LISTS})
+        part.organization_hits = {org: [name] for org in payload["organizations"]}
+        part.people_hits = {person: [name] for person in payload["people"]}
+        return part
+
+    def to_batch(self, files: List[str]) -> RecordBatch:
+        """Return these results as the :class:`RecordBatch` of ``files``."""
+        return RecordBatch.from_rows(
+            files,
+            {
+                "personal_info": self.personal_rows,
+                "spouse_activities": self.spouse_rows,
+                "stocks": self.stock_rows,
+                "financial_participations": self.participation_rows,
+                "external_roles": self.role_rows,
+            },
+            self.organization_hits,
+            self.people_hits,
+        )
+
+
+class _FileExtractor:
+    """Parse documents and collect the requested datasets and mentions."""
+
+    def __init__(
+        self,
+        organization_names: List[str],
+        people_names: List[str],
+        datasets: Iterable[str] = DATASETS,
+        backend: str = "auto",
+    ) -> None:
+        self.organizations = MentionMatcher(organization_names)
+        self.people = MentionMatcher(people_names)
+        self.datasets = frozenset(datasets)
+        self.pruner = SectionPruner(self.datasets)
+        self.backend = get_backend(backend)
+
+    def extract(self, items: Iterable[Tuple[str, bytes]]) -> _PartialExtraction:
+        """Parse each ``(name, bytes)`` document once and collect every dataset.
+
+        Time spent scanning mentions, parsing and building rows is added to
+        the ``metrics`` of the result.
+        """
+        wanted = self.datasets
+        backend = self.backend
+        part = _PartialExtraction()
+        clock, cpu_clock = time.perf_counter, time.process_time
+        # [wall, cpu] totals of the mentions, parse and records stages.
+        mentions, parse, build = [0.0, 0.0], [0.0, 0.0], [0.0, 0.0]
+        files = nbytes = parsed = records = 0
+        for xml_file, data in items:
+            files += 1
+            nbytes += len(data)
+            wall, cpu = clock(), cpu_clock()
+            text = data.decode("utf-8", errors="ignore")
+            for name in self.organizations.find(text):
+                part.organization_hits.setdefault(name, []).append(xml_file)
+            for name in self.people.find(text):
+                part.people_hits.setdefault(name, []).append(xml_file)
+            wall, cpu = _lap(mentions, wall, cpu)
+
+            try:
+                root = backend.parse(self.pruner.prune(data))
+            except ET.ParseError:
+                _lap(parse, wall, cpu)
+                continue
+            wall, cpu = _lap(parse, wall, cpu)
+            parsed += 1
+
+            rows = part.row_count()
+            if "personal_info" in wanted:
+                part.personal_rows.append(backend.personal_info_record(root, xml_file))
+            if "spouse_activities" in wanted:
+                part.spouse_rows.extend(backend.spouse_activity_records(root, xml_file))
+            if "stocks" in wanted:
+                part.stock_rows.extend(backend.stock_records(root))
+            if "financial_participations" in wanted:
+                part.participation_rows.extend(
+                    backend.financial_participation_records(root, xml_file)
+                )
+            if "external_roles" in wanted:
+                part.role_rows.extend(backend.external_role_records(root, xml_file))
+            records += part.row_count() - rows
+            _lap(build, wall, cpu)
+
+        metrics = part.metrics
+        metrics.record("mentions", *mentions, calls=files, files=files, bytes=nbytes)
+        metrics.record("parse", *parse, calls=files, files=files, bytes=nbytes)
+        metrics.record("records", *build, calls=parsed, files=parsed, records=records)
+        return part
+
+
+def _lap(totals: List[float], wall: float, cpu: float) -> Tuple[float, float]:
+    """Add the time since ``(wall, cpu)`` to ``totals`` and return the new start."""
+    now, now_cpu = time.perf_counter(), time.process_time()
+    totals[0] += now - wall
+    totals[1] += now_cpu - cpu
+    return now, now_cpu
+
+
+# Per-process extractor of pool workers, set once by ``_init_worker`` so the
+# source and matchers are not pickled with every chunk.
+_WORKER_STATE: Optional[Tuple[DeclarationSource, _FileExtractor]] = None
+
+
+def _init_worker(
+    source: DeclarationSource,
+    organization_names: List[str],
+    people_names: List[str],
+    datasets: Tuple[str, ...],
+    backend: str,
+) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = (
+        source,
+        _FileExtractor(organization_names, people_names, datasets, backend),
+    )
+
+
+def _read_files(
+    source: DeclarationSource, names: List[str], metrics: PipelineMetrics
+) -> List[Tuple[str, bytes]]:
+    with metrics.stage("read", files=len(names)) as stage:
+        items = [(name, source.read(name)) for name in names]
+        stage.bytes = sum(len(data) for _, data in items)
+    return items
+
+
+def _extract_chunk(names: List[str]) -> _PartialExtraction:
+    source, extractor = _WORKER_STATE
+    metrics = PipelineMetrics()
+    part = extractor.extract(_read_files(source, names, metrics))
+    metrics.merge(part.metrics)
+    part.metrics = metrics
+    return part
+
+
+def _extract_files(names: List[str]) -> List[_PartialExtraction]:
+    source, extractor = _WORKER_STATE
+    metrics = PipelineMetrics()
+    parts = [extractor.extract([item]) for item in _read_files(source, names, metrics)]
+    if parts:  # the read time travels with the first file
+        metrics.merge(parts[0].metrics)
+        parts[0].metrics = metrics
+    return parts
 
 
 class DeclarationPipeline:
-    """Parse declaration XML files once and extract required datasets."""
+    """Parse declaration XML files once and extract required datasets.
+
+    Each file is parsed a single time and feeds every dataset: personal
+    info, spouse activities, stocks, financial participations, external
+    roles and the name mention tables.
+
+    ``decl_dir`` is a directory of split declarations, a bulk
+    ``declarations.xml`` read through its offset index, or any declaration
+    source from :mod:`declaration_store`.
+
+    ``datasets`` restricts extraction to some of ``personal_info``,
+    ``spouse_activities``, ``stocks``, ``financial_participations`` and
+    ``external_roles``; the others come back empty. Sections no requested
+    dataset reads are cut from each document before it is parsed.
+
+    ``backend`` selects the XML parser: ``etree``, ``lxml`` or ``auto``
+    (lxml when installed); both yield identical records.
+
+    ``cache`` is the path of an :class:`~full_pipeline.cache.ExtractionCache`
+    database. Files whose content hash is stored there reuse their earlier
+    results, and only new or changed files are parsed. Once the whole source
+    has been read, entries for files no longer in it are deleted; pass
+    ``prune_cache=False`` when the source is only part of the corpus (e.g.
+    the changed files of an incremental split).
+
+    Each ``run`` or ``iter_batches`` call resets ``metrics``, a
+    :class:`~full_pipeline.metrics.PipelineMetrics` with the wall time, CPU
+    time, files, bytes and records of every extraction stage.
+    """
 
     def __init__(
         self,
-        decl_dir: Path,
+        decl_dir: Union[Path, DeclarationSource],
         organization_names: Optional[Iterable[str]] = None,
         people_names: Optional[Iterable[str]] = None,
+        datasets: Iterable[str] = DATASETS,
+        backend: str = "auto",
+        cache: Optional[Union[str, Path]] = None,
+        prune_cache: bool = True,
     ) -> None:
-        self.decl_dir = Path(decl_dir)
+        self.decl_dir = decl_dir
+        self.source = open_source(decl_dir)
         self.organization_names = list(organization_names or [])
         self.people_names = list(people_names or [])
+        self.datasets = tuple(datasets)
+        unknown = set(self.datasets) - set(DATASETS)
+        if unknown:
+            raise ValueError(f"Unknown datasets: {', '.join(sorted(unknown))}")
+        self.backend = get_backend(backend).name
+        self.cache = Path(cache) if cache is not None else None
+        self.prune_cache = prune_cache
+        self.metrics = PipelineMetrics()
+
+    def run(
+        self, workers: int = 1, chunk_size: int = 64, parse_dates: bool = False
+    ) -> ExtractedData:
+        """Process all XML files and return extracted datasets.
+
+        With ``workers`` above 1, chunks of ``chunk_size`` files are parsed in
+        a process pool and merged back in source order, so the result is the
+        same as a serial run. Parallel runs need a source with random access
+        (``read(name)``), which rules out compressed dumps. ``parse_dates``
+        returns the date columns as ``datetime64`` (see
+        :meth:`ExtractedData.with_dates`) instead of the XML strings.
+        """
+        self.metrics = PipelineMetrics()
+        with self.metrics.stage("run", files=len(self.source)) as total:
+            part = _PartialExtraction()
+            for _, chunk_part in self._iter_parts(workers, chunk_size):
+                part.extend(chunk_part)
+            with self.metrics.stage("frames", records=part.row_count()):
+                data = self._build_frames(part)
+                if parse_dates:
+                    data = data.with_dates()
+            total.records = part.row_count()
+        return data
 
-    def run(self) -> ExtractedData:
-        """Process all XML files and return extracted datasets."""
-        personal_rows: List[Dict[str, str]] = []
-        spouse_rows: List[Dict[str, str]] = []
+    def _build_frames(self, part: _PartialExtraction) -> ExtractedData:
         org_mentions: Dict[str, set] = {n: set() for n in self.organization_names}
         people_mentions: Dict[str, set] = {n: set() for n in self.people_names}
+        for name, files in part.organization_hits.items():
+            org_mentions[name].update(files)
+        for name, files in part.people_hits.items():
+            people_mentions[name].update(files)
 
-        xml_files = sorted(self.decl_dir.glob("*.xml"))
-        for xml_file in tqdm(xml_files, desc="Declarations"):
-            text = xml_file.read_text(encoding="utf-8", errors="ignore")
-            for name in self.organization_names:
-                if name in text:
-                    org_mentions[name].add(xml_file.name)
-            for name in self.people_names:
-                if name in text:
-                    people_mentions[name].add(xml_file.name)
-
-            try:
-                tree = ET.parse(xml_file)
-            except ET.ParseError:
-                continue
-            root = tree.getroot()
-
-            def get_unique(parent, tag):
-                elems = parent.findall(f".//{tag}") if parent is not None else []
-                if len(elems) > 1:
-                    raise ValueError(f"Multiple <{tag}> in {xml_file}")
-                return elems[0] if elems else None
-
-            declaration = root if root.tag == "declaration" else get_unique(root, "declaration")
-            general = get_unique(declaration, "general")
-            declarant = get_unique(general, "declarant")
-
-            def get_text(elem: ET.Element | None, tag: str) -> str:
-                if elem is None:
-                    return ""
-                text = elem.findtext(tag, default="")
-                return text.strip() if text else ""
-
-            info = {
-                "file": xml_file.name,
-                "dateDepot": get_text(declaration, "dateDepot"),
-                "uuid": get_text(declaration, "uuid"),
-                "civilite": get_text(declarant, "civilite"),
-                "nom": get_text(declarant, "nom"),
-                "prenom": get_text(declarant, "prenom"),
-                "email": get_text(declarant, "email"),
-                "dateNaissance": get_text(declarant, "dateNaissance"),
-            }
-            personal_rows.append(info)
-
-            spouse_dto = get_unique(declaration, "activProfConjointDto")
-            if spouse_dto is not None:
-                for item in spouse_dto.findall("./items/items"):
-                    def clean(text: Optional[str]) -> str:
-                        return " ".join(text.split()) if text else ""
-
-                    spouse_rows.append(
-                        {
-                            "uuid": info["uuid"],
-                            "nomConjoint": clean(item.findtext("nomConjoint")),
-                            "employeurConjoint": clean(item.findtext("employeurConjoint")),
-                            "activiteProf": clean(item.findtext("activiteProf")),
-                            "commentaire": clean(item.findtext("commentaire")),
-                        }
-                    )
-
-        personal_df = pd.DataFrame(personal_rows)
-        spouse_df = pd.DataFrame(spouse_rows)
+        personal_df = pd.DataFrame(part.personal_rows, columns=PERSONAL_INFO_FIELDS)
+        spouse_df = pd.DataFrame(part.spouse_rows, columns=SPOUSE_ACTIVITY_FIELDS)
         org_df = self._mentions_to_df(org_mentions, "organization")
         people_df = self._mentions_to_df(people_mentions, "person")
-        return ExtractedData(personal_df, spouse_df, org_df, people_df)
+        return ExtractedData(
+            personal_df,
+            spouse_df,
+            org_df,
+            people_df,
+            stocks=pd.DataFrame(part.stock_rows, columns=STOCK_FIELDS),
+            financial_participations=pd.DataFrame(
+                part.participation_rows, columns=FINANCIAL_PARTICIPATION_FIELDS
+            ),
+            external_roles=pd.DataFrame(part.role_rows, columns=EXTERNAL_ROLE_FIELDS),
+        )
+
+    def iter_batches(self, batch_size: int = 1000, workers: int = 1) -> Iterator[RecordBatch]:
+        """Yield the records of each run of ``batch_size`` files as it is parsed.
+
+        Batches come in source order and nothing is kept between them, so
+        memory stays bounded by the batch size rather than the corpus; feed
+        them to a :class:`~full_pipeline.batches.CsvSink` or
+        :class:`~full_pipeline.batches.ParquetSink` to write results
+        incrementally. Mentions are reported per file (see
+        :class:`~full_pipeline.batches.RecordBatch`). ``workers`` behaves as
+        in :meth:`run`.
+        """
+        self.metrics = PipelineMetrics()
+        for names, part in self._iter_parts(workers, batch_size):
+            yield part.to_batch(names)
+
+    def _iter_parts(
+        self, workers: int, chunk_size: int
+    ) -> Iterator[Tuple[List[str], _PartialExtraction]]:
+        """Yield ``(file names, results)`` for consecutive chunks of the source."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        cache = self._open_cache()
+        try:
+            if workers > 1:
+                parts = self._iter_parts_parallel(workers, chunk_size, cache)
+            else:
+                parts = self._iter_parts_serial(chunk_size, cache)
+            seen = set()
+            for names, part in parts:
+                seen.update(names)
+                yield names, part
+            # Only reached once the whole source has been read.
+            if cache is not None and self.prune_cache:
+                with self.metrics.stage("cache"):
+                    cache.retain(seen)
+        finally:
+            if cache is not None:
+                cache.close()
+
+    def _iter_parts_serial(
+        self, chunk_size: int, cache: Optional[ExtractionCache] = None
+    ) -> Iterator[Tuple[List[str], _PartialExtraction]]:
+        extractor = _FileExtractor(
+            self.organization_names, self.people_names, self.datasets, self.backend
+        )
+        items = iter(self.source)
+        with tqdm(total=len(self.source), desc="Declarations") as pbar:
+            while True:
+                with self.metrics.stage("read") as read:
+                    chunk = list(islice(items, chunk_size))
+                    read.files = len(chunk)
+                    read.bytes = sum(len(data) for _, data in chunk)
+                if not chunk:
+                    break
+                names = [name for name, _ in chunk]
+                if cache is None:
+                    part = extractor.extract(chunk)
+                else:
+                    digests, cached, misses = self._cache_lookup(cache, chunk)
+                    fresh = [extractor.extract([item]) for item in misses]
+                    misses = [name for name, _ in misses]
+                    part = self._cache_merge(cache, names, digests, cached, misses, fresh)
+                self.metrics.merge(part.metrics)
+                yield names, part
+                pbar.update(len(chunk))
+
+    def _open_cache(self) -> Optional[ExtractionCache]:
+        if self.cache is None:
+            return None
+        fingerprint = cache_fingerprint(
+            datasets=sorted(self.datasets),
+            organizations=self.organization_names,
+            people=self.people_names,
+        )
+        return ExtractionCache(self.cache, fingerprint)
+
+    def _cache_lookup(
+        self, cache: ExtractionCache, items: List[Tuple[str, bytes]]
+    ) -> Tuple[Dict[str, str], Dict[str, dict], List[Tuple[str, bytes]]]:
+        """Hash ``items``; return the digests, cached payloads and the items to parse."""
+        with self.metrics.stage("cache", files=len(items)) as stage:
+            digests = {name: content_hash(data) for name, data in items}
+            cached = cache.get_many(list(digests.items()))
+            stage.bytes = sum(len(data) for _, data in items)
+        return digests, cached, [item for item in items if item[0] not in cached]
+
+    def _cache_merge(
+        self,
+        cache: ExtractionCache,
+        names: List[str],
+        digests: Dict[str, str],
+        cached: Dict[str, dict],
+        misses: List[str],
+        fresh: List[_PartialExtraction],
+    ) -> _PartialExtraction:
+        """Store the ``fresh`` results of ``misses`` and merge every file in order."""
+        with self.metrics.stage("cache"):
+            parsed = dict(zip(misses, fresh))
+            cache.put_many(
+                (name, digests[name], part.to_payload()) for name, part in parsed.items()
+            )
+            merged = _PartialExtraction()
+            for name in names:
+                if name in parsed:
+                    merged.extend(parsed[name])
+                else:
+                    merged.extend(_PartialExtraction.from_payload(name, cached[name]))
+        return merged
+
+    def _iter_parts_parallel(
+        self, workers: int, chunk_size: int, cache: Optional[ExtractionCache] = None
+    ) -> Iterator[Tuple[List[str], _PartialExtraction]]:
+        if getattr(self.source, "compressed", False):
+            raise ValueError("Parallel runs need an uncompressed or packed source")
+        names = self.source.names()
+        chunks = (names[i : i + chunk_size] for i in range(0, len(names), chunk_size))
+        # Keep a couple of chunks per worker in flight so the pool stays busy
+        # without buffering results the caller has not consumed yet.
+        window = 2 * workers
+        pending: deque = deque()
+
+        def submit(pool: ProcessPoolExecutor, chunk: List[str]):
+            if cache is None:
+                return chunk, None, pool.submit(_extract_chunk, chunk)
+            # Cache lookups need the content hash, so the parent reads each
+            # file once and workers only re-read the files to parse.
+            digests, cached, misses = self._cache_lookup(
+                cache, _read_files(self.source, chunk, self.metrics)
+            )
+            misses = [name for name, _ in misses]
+            future = pool.submit(_extract_files, misses) if misses else None
+            return chunk, (digests, cached, misses), future
+
+        def finish(chunk: List[str], lookup, future) -> _PartialExtraction:
+            if lookup is None:
+                part = future.result()
+            else:
+                fresh = future.result() if future is not None else []
+                part = self._cache_merge(cache, chunk, *lookup, fresh)
+            self.metrics.merge(part.metrics)
+            return part
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                self.source,
+                self.organization_names,
+                self.people_names,
+                self.datasets,
+                self.backend,
+            ),
+        ) as pool, tqdm(total=len(names), desc="Declarations") as pbar:
+            try:
+                for chunk in chunks:
+                    pending.append(submit(pool, chunk))
+                    if len(pending) >= window:
+                        task = pending.popleft()
+                        yield task[0], finish(*task)
+                        pbar.update(len(task[0]))
+                while pending:
+                    task = pending.popleft()
+                    yield task[0], finish(*task)
+                    pbar.update(len(task[0]))
+            finally:
+                for _, _, future in pending:
+                    if future is not None:
+                        future.cancel()
 
     @staticmethod
     def _mentions_to_df(mentions: Dict[str, set], label: str) -> pd.DataFrame:
@@ -133,174 +590,145 @@ class DeclarationPipeline:
 # ---------------------------------------------------------------------------
 
 class GenderAnalyzer:
-    """Add gender predictions and summary columns to personal data."""
+    """Add gender predictions and summary columns to personal data.
 
-    def __init__(self) -> None:
-        self.detector = Detector(case_sensitive=False)
+    Each distinct first name is looked up once (see
+    :mod:`full_pipeline.gender`). ``cache`` names a JSON file that keeps the
+    answers between runs.
+    """
+
+    def __init__(self, cache: Optional[Union[str, Path]] = None) -> None:
+        self.cache = GenderCache(cache) if cache is not None else None
+
+    @property
+    def detector(self):
+        return get_detector()
 
     def analyze(self, df: pd.DataFrame) -> pd.DataFrame:
         data = df.copy()
         data["first_name"] = data["prenom"].astype(str).str.split().str[0]
-        data["gender_guess"] = data["first_name"].apply(self.detector.get_gender)
+        data["gender_guess"] = guess_genders(data["first_name"], self.cache)
+        if self.cache is not None:
+            self.cache.save()
         civilite_map = {"M": "male", "M.": "male", "Mme": "female", "Mme.": "female"}
         data["gender"] = data["civilite"].map(civilite_map)
         return data
 
+    def tally(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, GenderTally]:
+        """Return :meth:`analyze` of ``df`` and the :class:`GenderTally` of its rows.
+
+        Tallies of successive batches combine with ``GenderTally.merge``.
+        """
+        data = self.analyze(df)
+        tally = GenderTally()
+        tally.update(data)
+        return data, tally
+
 # ---------------------------------------------------------------------------
 # Spouse occupation analysis
 # ---------------------------------------------------------------------------
 
 class SpouseOccupationAnalyzer:
-    """Merge spouse activities with personal info and compute gender counts."""
+    """Merge spouse activities with personal info and compute gender counts.
+
+    With an :class:`~full_pipeline.occupation_clusters.OccupationClusterer`,
+    spelling variants of an occupation are counted under its canonical form
+    instead of under each normalised spelling.
+
+    Both tables are derived from an
+    :class:`~full_pipeline.aggregates.OccupationCounts`: :meth:`count` builds
+    one per batch of rows, ``OccupationCounts.merge`` combines them and
+    :meth:`summarize` gives the same tables as :meth:`analyze` on all rows.
+    """
+
+    def __init__(self, clusterer: Optional[OccupationClusterer] = None) -> None:
+        self.clusterer = clusterer
 
     def analyze(
         self, spouse_df: pd.DataFrame, personal_df: pd.DataFrame, top_n: int = 50
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        df = spouse_df.merge(
-            personal_df[["uuid", "dateDepot", "gender"]], on="uuid", how="inner"
-        )
-        df = df.dropna(subset=["activiteProf", "dateDepot"])
-        df["activiteProf"] = df["activiteProf"].astype(str).str.strip()
-        df = df[df["activiteProf"] != "[Données non publiées]"]
-        df["job_norm"] = (
-            df["activiteProf"].str.lower().apply(
-                lambda x: unicodedata.normalize("NFKD", x).encode("ascii", "ignore").decode("utf-8")
-            )
-        )
-        df["dateDepot"] = pd.to_datetime(df["dateDepot"], dayfirst=True, errors="coerce")
-        df["year"] = df["dateDepot"].dt.year
-        df["spouse_gender"] = df["gender"].map({"male": "female", "female": "male"})
+        return self.summarize(self.count(spouse_df, personal_df), top_n)
+
+    def count(self, spouse_df: pd.DataFrame, personal_df: pd.DataFrame) -> OccupationCounts:
+        """Return the occupation counts of ``spouse_df`` joined with ``personal_df``."""
+        counts = OccupationCounts()
+        counts.update(spouse_df, personal_df)
+        return counts
+
+    def summarize(
+        self, counts: OccupationCounts, top_n: int = 50
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Return the gender counts and year trends of the top ``top_n`` occupations."""
+        df = counts.counts.copy()
+        if self.clusterer is not None:
+            df["job_norm"] = self.clusterer.canonicalize(df["activiteProf"], df["count"])
+        else:
+            df["job_norm"] = normalize_jobs(df["activiteProf"])
 
         gender_counts = (
-            df.groupby(["job_norm", "spouse_gender"])
-            .size()
+            df.groupby(["job_norm", "spouse_gender"], observed=True)["count"]
+            .sum()
             .unstack(fill_value=0)
             .reindex(columns=["male", "female"], fill_value=0)
             .reset_index()
             .rename(columns={"job_norm": "occupation"})
         )
         gender_counts.columns.name = None
-        gender_counts["occupation"] = gender_counts["occupation"].str.title()
+        gender_counts["occupation"] = gender_counts["occupation"].astype(object).str.title()
 
-        top_jobs = df["job_norm"].value_counts().head(top_n).index
+        top_jobs = job_counts(df["job_norm"], df["count"]).head(top_n).index
+        top = df[df["job_norm"].isin(top_jobs)]
         trend_df = (
-            df[df["job_norm"].isin(top_jobs)]
-            .groupby(["year", "job_norm"])
-            .size()
+            top.groupby(["year", top["job_norm"].astype(object)])["count"]
+            .sum()
             .unstack(fill_value=0)
             .sort_index()
             .rename(columns=lambda x: x.title())
         )
         return gender_counts, trend_df
 
+
+def tally_batches(
+    batches: Iterable[RecordBatch], genders: Optional[GenderAnalyzer] = None
+) -> Tuple[GenderTally, OccupationCounts]:
+    """Fold the gender and occupation counts of ``batches`` as they arrive.
+
+    With ``DeclarationPipeline.iter_batches`` each batch is counted while the
+    pool parses the next ones, and only the counts are kept, so memory is
+    bounded by the number of distinct names and occupations. Pass the
+    occupation counts to :meth:`SpouseOccupationAnalyzer.summarize`.
+    """
+    genders = genders if genders is not None else GenderAnalyzer()
+    tally, occupations = GenderTally(), OccupationCounts()
+    for batch in batches:
+        gendered, part = genders.tally(batch.personal_info)
+        tally.merge(part)
+        occupations.update(batch.spouse_activities, gendered)
+    return tally, occupations
+
 # ---------------------------------------------------------------------------
 # Gender discrimination analysis
 # ---------------------------------------------------------------------------
 
-HIGH_PAY_KEYWORDS = [
-    "directeur",
-    "director",
-    "manager",
-    "chef",
-    "president",
-    "medecin",
-    "doctor",
-    "ingenieur",
-    "ingenieure",
-    "professeur",
-    "avocat",
-    "notaire",
-    "architect",
-    "entrepreneur",
-    "pharmacien",
-    "pilote",
-]
-
-LOW_PAY_KEYWORDS = [
-    "assistant",
-    "assistante",
-    "secretaire",
-    "vendeur",
-    "vendeuse",
-    "agent",
-    "employe",
-    "employee",
-    "caissier",
-    "caissiere",
-    "serveur",
-    "serveuse",
-    "aide",
-    "infirmier",
-    "infirmiere",
-    "technicien",
-    "ouvrier",
-    "artisan",
-    "animateur",
-    "animatrice",
-]
-
-
 class GenderDiscriminationAnalyzer:
-    """Analyze spouse occupation gender counts for disparities."""
-
-    def __init__(self, top_n: int = 20) -> None:
-        self.top_n = top_n
+    """Analyze spouse occupation gender counts for disparities.
 
-    @staticmethod
-    def _clean_occupation(occ: str) -> Optional[str]:
-        if pd.isna(occ):
-            return None
-        occ = str(occ).strip().lower()
-        occ = re.sub(r"[\"']", "", occ)
-        occ = unicodedata.normalize("NFKD", occ).encode("ascii", "ignore").decode()
-        occ = re.sub(r"\s+", " ", occ)
-        if not re.search(r"[a-z]", occ):
-            return None
-        placeholders = {
-            "",
-            "-",
-            "/",
-            "0",
-            "na",
-            "n/a",
-            "none",
-            "null",
-            "neant",
-        }
-        for token in [
-            "donnees non publiees",
-            "donnee non publiee",
-            "sans profession",
-            "sans activite",
-            "sans emploi",
-        ]:
-            if token in occ:
-                return None
-        if "retraite" in occ:
-            return None
-        if occ in placeholders:
-            return None
-        return occ
+    Occupations are cleaned and given a keyword pay grade in one pass over
+    the whole table; ``top_n=None`` keeps every occupation in the top lists,
+    so the pay-grade summary covers the whole table.
+    """
 
-    @staticmethod
-    def _classify_pay(job: str) -> str:
-        for kw in HIGH_PAY_KEYWORDS:
-            if kw in job:
-                return "high"
-        for kw in LOW_PAY_KEYWORDS:
-            if kw in job:
-                return "low"
-        return "unknown"
+    def __init__(self, top_n: Optional[int] = 20) -> None:
+        self.top_n = top_n
 
     def analyze(self, counts_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         df = counts_df.copy()
-        df["occupation"] = df["occupation"].apply(self._clean_occupation)
+        df["occupation"] = clean_occupations(df["occupation"])
         df = df.dropna(subset=["occupation"])
+        df["pay_grade"] = classify_pay_grades(df["occupation"])
 
         top_male = df.sort_values("male", ascending=False).head(self.top_n).copy()
         top_female = df.sort_values("female", ascending=False).head(self.top_n).copy()
-        top_male["pay_grade"] = top_male["occupation"].apply(self._classify_pay)
-        top_female["pay_grade"] = top_female["occupation"].apply(self._classify_pay)
 
         pay_summary = (
             pd.DataFrame(
@@ -324,7 +752,7 @@ class AgePyramidBuilder:
 
     def build(self, df: pd.DataFrame, output: Path) -> None:
         df = df.copy()
-        df["birth"] = pd.to_datetime(df["dateNaissance"], format="%d/%m/%Y", errors="coerce")
+        df["birth"] = parse_dates(df["dateNaissance"], BIRTH_FORMAT)
         df = df[(df["birth"].dt.year >= 1900) & (df["birth"].dt.year <= 2020)]
         today = pd.Timestamp.today()
         df["age"] = (today - df["birth"]).dt.days // 365
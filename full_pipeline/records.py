@@ -0,0 +1,306 @@
+"""Record extractors shared by the pipeline and the per-dataset scripts.
+
+Every function takes the root of an already parsed declaration document,
+so one parse per file feeds all datasets. Each function keeps the exact
+rules of the script that originally produced its CSV (which elements are
+searched, how text is cleaned), so the outputs do not change.
+"""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import xml.etree.ElementTree as ET
+
+from declaration_store.attachments import strip_attachments
+
+PERSONAL_INFO_FIELDS = [
+    "file",
+    "dateDepot",
+    "uuid",
+    "civilite",
+    "nom",
+    "prenom",
+    "email",
+    "dateNaissance",
+]
+SPOUSE_ACTIVITY_FIELDS = [
+    "uuid",
+    "nomConjoint",
+    "employeurConjoint",
+    "activiteProf",
+    "commentaire",
+]
+STOCK_FIELDS = [
+    "uuid",
+    "nomSociete",
+    "evaluation",
+    "capitalDetenu",
+    "nombreParts",
+    "commentaire",
+    "remuneration",
+]
+FINANCIAL_PARTICIPATION_FIELDS = [
+    "file",
+    "nomSociete",
+    "evaluation",
+    "capitalDetenu",
+    "nombreParts",
+    "remuneration",
+]
+EXTERNAL_ROLE_FIELDS = [
+    "file",
+    "type",
+    "organization",
+    "role",
+    "remuneration",
+    "date_start",
+    "date_end",
+]
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def localname(tag: str) -> str:
+    """Return tag name without namespace."""
+    return tag.split("}", 1)[-1] if "}" in tag else tag
+
+
+def find_child(parent: ET.Element, wanted: str):
+    """Return first child element with given localname."""
+    for ch in parent:
+        if localname(ch.tag) == wanted:
+            return ch
+    return None
+
+
+def clean_text(s: str) -> str:
+    """Normalize whitespace and special spaces."""
+    if not s:
+        return ""
+    return (
+        s.replace("\u202f", " ")  # narrow no-break space
+         .replace("\u00a0", " ")  # no-break space
+         .replace("\n", " ")
+         .strip()
+    )
+
+
+def child_text(parent: ET.Element, tag: str) -> str:
+    """Get direct child text by tag name (namespace agnostic)."""
+    child = find_child(parent, tag)
+    return clean_text(child.text) if (child is not None and child.text) else ""
+
+
+def collapse(text: Optional[str]) -> str:
+    """Collapse internal whitespace and strip ends."""
+    return " ".join(text.split()) if text else ""
+
+
+def get_unique_desc(parent: Optional[ET.Element], tag: str, name: str):
+    """Return a single descendant element or ``None`` if missing.
+
+    Raises ``ValueError`` if more than one matching element is found.
+    """
+    if parent is None:
+        return None
+    elements = parent.findall(f".//{tag}")
+    if len(elements) > 1:
+        raise ValueError(f"Multiple <{tag}> elements found in {name}")
+    return elements[0] if elements else None
+
+
+def find_declaration(root: ET.Element, name: str) -> Optional[ET.Element]:
+    """Return the ``<declaration>`` element of a parsed document."""
+    return root if root.tag == "declaration" else get_unique_desc(root, "declaration", name)
+
+
+def _get_text(element: Optional[ET.Element], tag: str) -> str:
+    if element is None:
+        return ""
+    text = element.findtext(tag, default="")
+    return text.strip() if text else ""
+
+
+def parse_remuneration(elem: ET.Element) -> str:
+    """Sum the leaf ``<montant>`` values of a remuneration element."""
+    total = 0.0
+    if elem is None:
+        return ""
+    for m in elem.findall('.//montant'):
+        if m.find('montant') is None and (m.text or '').strip():
+            text = m.text.strip().replace(' ', '').replace(',', '.')
+            try:
+                total += float(text)
+            except ValueError:
+                continue
+    return str(total) if total else ""
+
+
+def parse_declaration(path: Path, data: Optional[bytes] = None) -> ET.Element:
+    """Parse a declaration document and return its root element.
+
+    ``data`` holds the document bytes; when omitted, ``path`` is read.
+    Attachment payloads are dropped before parsing so their base64 text is
+    never loaded into the tree.
+    """
+    if data is None:
+        data = Path(path).read_bytes()
+    return ET.fromstring(strip_attachments(data))
+
+
+# ---------------------------------------------------------------------------
+# Record extractors
+# ---------------------------------------------------------------------------
+
+def personal_info_record(root: ET.Element, name: str) -> Dict[str, str]:
+    """Return the declarant's personal fields (``PERSONAL_INFO_FIELDS``)."""
+    declaration = find_declaration(root, name)
+    general = get_unique_desc(declaration, "general", name)
+    declarant = get_unique_desc(general, "declarant", name)
+    return {
+        "file": name,
+        "dateDepot": _get_text(declaration, "dateDepot"),
+        "uuid": _get_text(declaration, "uuid"),
+        "civilite": _get_text(declarant, "civilite"),
+        "nom": _get_text(declarant, "nom"),
+        "prenom": _get_text(declarant, "prenom"),
+        "email": _get_text(declarant, "email"),
+        "dateNaissance": _get_text(declarant, "dateNaissance"),
+    }
+
+
+def spouse_activity_records(root: ET.Element, name: str) -> List[Dict[str, str]]:
+    """Return one row per ``activProfConjointDto`` item."""
+    declaration = find_declaration(root, name)
+    uuid = _get_text(declaration, "uuid")
+    activ_dto = get_unique_desc(declaration, "activProfConjointDto", name)
+    if activ_dto is None:
+        return []
+    return [
+        {
+            "uuid": uuid,
+            "nomConjoint": collapse(item.findtext("nomConjoint")),
+            "employeurConjoint": collapse(item.findtext("employeurConjoint")),
+            "activiteProf": collapse(item.findtext("activiteProf")),
+            "commentaire": collapse(item.findtext("commentaire")),
+        }
+        for item in activ_dto.findall("./items/items")
+    ]
+
+
+def stock_records(root: ET.Element) -> List[Dict[str, str]]:
+    """Return one row per ``participationFinanciereDto`` item, keyed by uuid."""
+    declaration = root.find('.//declaration')
+    if declaration is None:
+        return []
+    uuid = declaration.findtext('uuid', default='')
+    pf = declaration.find('participationFinanciereDto')
+    if pf is None:
+        return []
+    return [
+        {
+            'uuid': uuid,
+            'nomSociete': ' '.join((item.findtext('nomSociete', '') or '').split()),
+            'evaluation': item.findtext('evaluation', ''),
+            'capitalDetenu': item.findtext('capitalDetenu', ''),
+            'nombreParts': item.findtext('nombreParts', ''),
+            'commentaire': item.findtext('commentaire', ''),
+            'remuneration': item.findtext('remuneration', ''),
+        }
+        for item in pf.findall('./items/items')
+    ]
+
+
+def financial_participation_records(root: ET.Element, name: str) -> Iterator[Dict[str, str]]:
+    """Yield one row per financial participation item, keyed by file name."""
+    for pf in root.iter():
+        if localname(pf.tag) != "participationFinanciereDto":
+            continue
+        items_container = find_child(pf, "items")
+        if items_container is None:
+            continue
+        for item in items_container:
+            if localname(item.tag) != "items":
+                continue
+            yield {
+                "file": name,
+                "nomSociete": child_text(item, "nomSociete"),
+                "evaluation": child_text(item, "evaluation"),
+                "capitalDetenu": child_text(item, "capitalDetenu"),
+                "nombreParts": child_text(item, "nombreParts"),
+                "remuneration": child_text(item, "remuneration"),
+            }
+
+
+def external_role_records(root: ET.Element, name: str) -> List[Dict[str, str]]:
+    """Return management roles and voluntary functions (``EXTERNAL_ROLE_FIELDS``)."""
+    rows = []
+    for item in root.findall('.//participationDirigeantDto/items/items'):
+        organization = (
+            item.findtext('nomSociete')
+            or item.findtext('nomStructure')
+            or item.findtext('organisme')
+            or item.findtext('activite')
+            or ''
+        )
+        role = (
+            item.findtext('activite')
+            or item.findtext('descriptionActivite')
+            or item.findtext('fonctionDirigeant')
+            or item.findtext('nomSociete')
+            or ''
+        )
+        rows.append(_external_role(name, 'participationDirigeant', organization, role, item))
+    for item in root.findall('.//fonctionBenevoleDto/items/items'):
+        organization = (
+            item.findtext('nomStructure')
+            or item.findtext('nomSociete')
+            or item.findtext('organisme')
+            or ''
+        )
+        role = (
+            item.findtext('descriptionActivite')
+            or item.findtext('activite')
+            or ''
+        )
+        rows.append(_external_role(name, 'fonctionBenevole', organization, role, item))
+    return rows
+
+
+def _external_role(
+    name: str, kind: str, organization: str, role: str, item: ET.Element
+) -> Dict[str, str]:
+    return {
+        'file': name,
+        'type': kind,
+        'organization': organization,
+        'role': role,
+        'remuneration': parse_remuneration(item.find('remuneration')),
+        'date_start': item.findtext('dateDebut') or '',
+        'date_end': item.findtext('dateFin') or '',
+    }
+
+
+# ---------------------------------------------------------------------------
+# CSV output
+# ---------------------------------------------------------------------------
+
+def write_csv(
+    path: Path,
+    rows: Iterable[Dict[str, str]],
+    fieldnames: List[str],
+    encoding: str = "utf-8",
+    lineterminator: str = "\r\n",
+) -> Path:
+    """Write ``rows`` to ``path`` with the dialect used by the extraction scripts."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding=encoding) as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator=lineterminator)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
@@ -0,0 +1,119 @@
+"""Skip declaration sections a run does not need before parsing them.
+
+A declaration is a flat list of sections (``general``,
+``mandatElectifDto``, ``participationDirigeantDto``, ``attachedFiles``, ...)
+and every dataset only reads a few of them. :class:`SectionPruner` cuts the
+unneeded sections out of the document bytes, so the parser never builds
+nodes for them; the kept sections and the declaration's scalar fields stay
+untouched, and the record extractors see the same elements as before.
+
+A section is only cut when that cannot change what the extractors find:
+it must close normally, must not nest itself, and must not contain a kept
+section, a comment, CDATA or a processing instruction. Anything unusual is
+left in place.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+# Sections each dataset reads; scalar fields of <declaration> are always kept.
+DATASET_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "personal_info": ("general",),
+    "spouse_activities": ("activProfConjointDto",),
+    "stocks": ("participationFinanciereDto",),
+    "financial_participations": ("participationFinanciereDto",),
+    "external_roles": ("participationDirigeantDto", "fonctionBenevoleDto"),
+}
+DATASETS = tuple(DATASET_SECTIONS)
+
+# Sections found directly under <declaration> in HATVP exports.
+KNOWN_SECTIONS = (
+    "general",
+    "attachedFiles",
+    "activConsultantDto",
+    "activProfCinqDerniereDto",
+    "activProfConjointDto",
+    "fonctionBenevoleDto",
+    "mandatElectifDto",
+    "participationDirigeantDto",
+    "participationFinanciereDto",
+    "activCollaborateursDto",
+    "observationInteretDto",
+    "immeubleDto",
+    "sciDto",
+    "valeursNonEnBourseDto",
+    "valeursEnBourseDto",
+    "assuranceVieDto",
+    "comptesBancaireDto",
+    "bienDiverDto",
+    "vehiculeDto",
+    "fondDto",
+    "autreBienDto",
+    "bienEtrangerDto",
+    "passifDto",
+    "observationPatrimoineDto",
+    "revenuMandatDto",
+    "evenementMajeurDto",
+)
+
+
+def _alternation(tags: Iterable[str]) -> bytes:
+    return b"|".join(re.escape(tag.encode("ascii")) for tag in tags)
+
+
+class SectionPruner:
+    """Remove the sections not needed by ``datasets`` from declaration bytes."""
+
+    def __init__(self, datasets: Iterable[str] = DATASETS) -> None:
+        keep = set()
+        for dataset in datasets:
+            if dataset not in DATASET_SECTIONS:
+                raise ValueError(f"Unknown dataset: {dataset}")
+            keep.update(DATASET_SECTIONS[dataset])
+        self.keep = frozenset(keep)
+        self.skip = tuple(tag for tag in KNOWN_SECTIONS if tag not in keep)
+        self._skip_re: Optional[re.Pattern] = None
+        if self.skip:
+            self._skip_re = re.compile(rb"<(" + _alternation(self.skip) + rb")(?=[\s/>])")
+        guarded = ("declaration",) + tuple(sorted(self.keep))
+        self._guard_re = re.compile(rb"<(?:[!?]|(?:" + _alternation(guarded) + rb")[\s/>])")
+        self._nested_re = {
+            tag.encode("ascii"): re.compile(rb"<" + re.escape(tag.encode("ascii")) + rb"[\s/>]")
+            for tag in self.skip
+        }
+
+    def prune(self, data: bytes) -> bytes:
+        """Return ``data`` without the skipped sections."""
+        if self._skip_re is None:
+            return data
+        pieces = []
+        pos = 0
+        for match in self._skip_re.finditer(data):
+            start = match.start()
+            if start < pos:
+                continue
+            tag = match.group(1)
+            gt = data.find(b">", match.end())
+            if gt == -1:
+                break
+            if data.find(b'"', match.end(), gt) != -1 or data.find(b"'", match.end(), gt) != -1:
+                continue  # attributes may hide a ">"; leave the section alone
+            if data[gt - 1] == 0x2F:  # "/>": empty section
+                end = gt + 1
+            else:
+                close = data.find(b"</" + tag + b">", gt)
+                if close == -1:
+                    break
+                if self._guard_re.search(data, gt, close) or self._nested_re[tag].search(
+                    data, gt, close
+                ):
+                    continue
+                end = close + len(tag) + 3
+            pieces.append(data[pos:start])
+            pos = end
+        if not pieces:
+            return data
+        pieces.append(data[pos:])
+        return b"".join(pieces)
@@ -1,27 +1,115 @@
 """Entry point to run the full PII pipeline."""
 
+import argparse
 from pathlib import Path
+from typing import List, Optional
 
 import pandas as pd
 
+from declaration_store import DirectorySource, changed_names
+from declaration_store.manifest import CHANGES_NAME
 from full_pipeline import (
     DeclarationPipeline,
     GenderAnalyzer,
     SpouseOccupationAnalyzer,
     GenderDiscriminationAnalyzer,
 )
+from full_pipeline.records import write_csv
 
+# Dataset attribute -> (CSV path, writer options matching the standalone script).
+CSV_OUTPUTS = {
+    "personal_info": ("pii/personal_info.csv", {}),
+    "spouse_activities": ("pii/spouse_activities.csv", {}),
+    "stocks": ("stock_extract/stocks.csv", {}),
+    "financial_participations": ("financial_participations/financial_participations.csv", {}),
+    "external_roles": (
+        "external_participation/participations.csv",
+        {"encoding": "utf-8-sig", "lineterminator": "\n"},
+    ),
+}
+
+
+DECL_DIR = Path("split_declarations")
+# Where --changed-only writes its CSVs, so the full datasets are left as they are.
+DELTA_ROOT = Path("delta")
+
+# Per-file extraction results reused by later runs (see full_pipeline/cache.py).
+EXTRACTION_CACHE = Path("extraction_cache.sqlite")
+# Stage timings of the last run (see full_pipeline/metrics.py).
+METRICS_FILE = Path("pipeline_metrics.json")
+# First-name gender guesses reused by later runs (see full_pipeline/gender.py).
+GENDER_CACHE = Path("gender_cache.json")
+
+
+def write_extracted_csvs(data, root: Path = Path(".")) -> None:
+    """Write the per-dataset CSVs produced by the extraction scripts under ``root``."""
+    for attr, (path, options) in CSV_OUTPUTS.items():
+        df = getattr(data, attr)
+        write_csv(Path(root) / path, df.to_dict("records"), list(df.columns), **options)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--decl-dir",
+        type=Path,
+        default=DECL_DIR,
+        help="Directory of split declarations (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help=f"Only process the files added or changed by the last incremental split "
+        f"({CHANGES_NAME} in --decl-dir)",
+    )
+    parser.add_argument(
+        "--output-root",
+        type=Path,
+        help=f"Directory the CSVs are written under (default: the working directory, "
+        f"or {DELTA_ROOT} with --changed-only)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.changed_only:
+        if not (args.decl_dir / CHANGES_NAME).exists():
+            parser.error(f"--changed-only needs {CHANGES_NAME}; run an incremental split first")
+        names = changed_names(args.decl_dir)
+        if not names:
+            print("No added or changed declarations.")
+            return
+        source = DirectorySource(args.decl_dir, names=names)
+        root = args.output_root or DELTA_ROOT
+    else:
+        source = args.decl_dir
+        root = args.output_root or Path(".")
 
-def main() -> None:
-    decl_dir = Path("split_declarations")
     org_names = pd.read_csv("avis/NER/organizations.csv")["name"].dropna().tolist()
     people_names = pd.read_csv("avis/NER/people.csv")["name"].dropna().tolist()
-    pipeline = DeclarationPipeline(decl_dir, org_names, people_names)
+    pipeline = DeclarationPipeline(
+        source,
+        org_names,
+        people_names,
+        cache=EXTRACTION_CACHE,
+        # A delta run sees only part of the corpus; keep the rest of the cache.
+        prune_cache=not args.changed_only,
+    )
     data = pipeline.run()
+    metrics = pipeline.metrics
+    with metrics.stage("write_csvs"):
+        write_extracted_csvs(data, root)
+    # Parse dateDepot/dateNaissance once for every analyzer below.
+    with metrics.stage("dates", records=len(data.personal_info)):
+        data = data.with_dates()
+
+    with metrics.stage("GenderAnalyzer", records=len(data.personal_info)):
+        gendered = GenderAnalyzer(cache=GENDER_CACHE).analyze(data.personal_info)
+    with metrics.stage("SpouseOccupationAnalyzer", records=len(data.spouse_activities)):
+        occ_counts, _ = SpouseOccupationAnalyzer().analyze(data.spouse_activities, gendered)
+    with metrics.stage("GenderDiscriminationAnalyzer", records=len(occ_counts)):
+        GenderDiscriminationAnalyzer().analyze(occ_counts)
 
-    gendered = GenderAnalyzer().analyze(data.personal_info)
-    occ_counts, _ = SpouseOccupationAnalyzer().analyze(data.spouse_activities, gendered)
-    GenderDiscriminationAnalyzer().analyze(occ_counts)
+    metrics.write_json(METRICS_FILE)
+    print(metrics.summary())
 
 
 if __name__ == "__main__":
@@ -11,10 +11,15 @@ added features.  Generated files are not tracked in version control.
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from full_pipeline.dates import ISO_DATE_FORMAT, parse_dates
+
 
 def prepare_features(csv_path: str | Path) -> pd.DataFrame:
     """Load dataset and create basic features.
@@ -31,9 +36,9 @@ def prepare_features(csv_path: str | Path) -> pd.DataFrame:
         `mandate_type` column.
     """
     df = pd.read_csv(csv_path, sep=";", dtype=str)
-    # Parse the publication and deposit dates
-    df["date_publication"] = pd.to_datetime(df["date_publication"], errors="coerce")
-    df["date_depot"] = pd.to_datetime(df["date_depot"], errors="coerce")
+    # Parse the publication and deposit dates (ISO ``YYYY-MM-DD``)
+    df["date_publication"] = parse_dates(df["date_publication"], ISO_DATE_FORMAT)
+    df["date_depot"] = parse_dates(df["date_depot"], ISO_DATE_FORMAT)
 
     # Compute the delay in days between deposit and publication
     df["delay_days"] = (df["date_publication"] - df["date_depot"]).dt.days
@@ -1,9 +1,14 @@
 from pathlib import Path
+import sys
 
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from full_pipeline.dates import BIRTH_FORMAT, parse_dates
+
 DATA_PATH = Path("pii/personal_info_with_gender.csv")
 OUTPUT_PNG = Path("age_pyramid.png")
 
@@ -12,7 +17,7 @@ def main() -> None:
     """Load data, build age pyramid and save to PNG."""
     # Load dataset
     df = pd.read_csv(DATA_PATH)
-    df["birth"] = pd.to_datetime(df["dateNaissance"], format="%d/%m/%Y", errors="coerce")
+    df["birth"] = parse_dates(df["dateNaissance"], BIRTH_FORMAT)
 
     # Keep plausible birth years
     df = df[(df["birth"].dt.year >= 1900) & (df["birth"].dt.year <= 2020)]
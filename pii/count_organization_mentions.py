@@ -1,6 +1,13 @@
-import pandas as pd
+import sys
 from pathlib import Path
 
+import pandas as pd
+
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from declaration_store import open_source
+from full_pipeline.mentions import MentionMatcher
+
 
 def tally_mentions(names, decl_dir: Path, label: str) -> pd.DataFrame:
     """Count how many declaration XML files mention each name.
@@ -10,7 +17,8 @@ def tally_mentions(names, decl_dir: Path, label: str) -> pd.DataFrame:
     names : list[str]
         Names to search for within declaration files.
     decl_dir : Path
-        Directory containing declaration XML files.
+        Directory containing declaration XML files, a bulk
+        ``declarations.xml`` or a ``declaration_store`` source.
     label : str
         Column name for the entity (e.g., 'organization' or 'person').
 
@@ -21,14 +29,15 @@ def tally_mentions(names, decl_dir: Path, label: str) -> pd.DataFrame:
     """
 
     mentions = {name: set() for name in names}
-    for xml_file in decl_dir.glob('*.xml'):
+    matcher = MentionMatcher(names)
+    source = open_source(decl_dir)
+    for name_in_source in source.names():
         try:
-            text = xml_file.read_text(encoding='utf-8', errors='ignore')
+            text = source.read(name_in_source).decode('utf-8', errors='ignore')
         except Exception:
             continue
-        for name in names:
-            if name in text:
-                mentions[name].add(xml_file.name)
+        for name in matcher.find(text):
+            mentions[name].add(name_in_source)
 
     rows = []
     for name in names:
@@ -20,22 +20,32 @@ Missing elements simply yield blank fields, while duplicated
 """
 
 import argparse
-import csv
+import sys
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
 import pandas as pd
 
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 from extraction import compute_age_features
+from declaration_store import open_source
+from full_pipeline.backends import get_backend
+from full_pipeline.records import PERSONAL_INFO_FIELDS, write_csv
 
+BACKEND = get_backend()
 
-def extract_personal_info(xml_path: Path) -> dict:
+
+def extract_personal_info(xml_path: Path, data: bytes | None = None) -> dict:
     """Parse ``xml_path`` and return a mapping of personal fields.
 
     Parameters
     ----------
     xml_path:
         Path to a declaration XML file.
+    data:
+        Document bytes, e.g. from a ``declaration_store`` source. When given,
+        ``xml_path`` only provides the file name.
 
     Returns
     -------
@@ -53,47 +63,13 @@ def extract_personal_info(xml_path: Path) -> dict:
       returned as empty strings instead of raising an error.
     """
 
+    xml_path = Path(xml_path)
     try:
-        tree = ET.parse(xml_path)
+        root = BACKEND.parse_declaration(xml_path, data)
     except ET.ParseError as exc:  # pragma: no cover - defensive
         raise ValueError(f"Invalid XML in {xml_path}: {exc}") from exc
 
-    root = tree.getroot()
-
-    def get_unique_desc(parent, tag):
-        """Return a single descendant element or ``None`` if missing.
-
-        Raises ``ValueError`` if more than one matching element is found.
-        """
-
-        if parent is None:
-            return None
-        elements = parent.findall(f".//{tag}")
-        if len(elements) > 1:
-            raise ValueError(f"Multiple <{tag}> elements found in {xml_path}")
-        return elements[0] if elements else None
-
-    declaration = root if root.tag == "declaration" else get_unique_desc(root, "declaration")
-    general = get_unique_desc(declaration, "general")
-    declarant = get_unique_desc(general, "declarant")
-
-    def get_text(element, tag):
-        if element is None:
-            return ""
-        text = element.findtext(tag, default="")
-        return text.strip() if text else ""
-
-    info = {
-        "file": xml_path.name,
-        "dateDepot": get_text(declaration, "dateDepot"),
-        "uuid": get_text(declaration, "uuid"),
-        "civilite": get_text(declarant, "civilite"),
-        "nom": get_text(declarant, "nom"),
-        "prenom": get_text(declarant, "prenom"),
-        "email": get_text(declarant, "email"),
-        "dateNaissance": get_text(declarant, "dateNaissance"),
-    }
-    return info
+    return BACKEND.personal_info_record(root, xml_path.name)
 
 
 def main() -> None:
@@ -105,30 +81,23 @@ def main() -> None:
         action="store_true",
         help="Compute age columns and save to personal_info_enriched.csv",
     )
+    parser.add_argument(
+        "--source",
+        default="split_declarations",
+        help="Directory of split files or bulk declarations.xml (default: %(default)s)",
+    )
     args = parser.parse_args()
 
-    decl_dir = Path("split_declarations")
+    source = open_source(args.source)
 
     output_dir = Path("pii")
     output_dir.mkdir(exist_ok=True)
     output_file = output_dir / "personal_info.csv"
-    fieldnames = [
-        "file",
-        "dateDepot",
-        "uuid",
-        "civilite",
-        "nom",
-        "prenom",
-        "email",
-        "dateNaissance",
-    ]
-
-    with output_file.open("w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for xml_file in sorted(decl_dir.glob("*.xml")):
-            info = extract_personal_info(xml_file)
-            writer.writerow(info)
+    write_csv(
+        output_file,
+        (extract_personal_info(Path(name), data) for name, data in source),
+        PERSONAL_INFO_FIELDS,
+    )
 
     if args.enrich:
         df = pd.read_csv(output_file)
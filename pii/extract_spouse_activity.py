@@ -16,18 +16,30 @@ The script extracts these fields along with the declaration ``uuid`` and
 stores the results in ``pii/spouse_activities.csv``.
 """
 
-import csv
+import argparse
+import sys
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from declaration_store import open_source
+from full_pipeline.backends import get_backend
+from full_pipeline.records import SPOUSE_ACTIVITY_FIELDS, write_csv
 
-def extract_spouse_activities(xml_path: Path) -> list[dict]:
+BACKEND = get_backend()
+
+
+def extract_spouse_activities(xml_path: Path, data: bytes | None = None) -> list[dict]:
     """Return spouse activity entries from ``xml_path``.
 
     Parameters
     ----------
     xml_path:
         Path to a declaration XML file.
+    data:
+        Document bytes, e.g. from a ``declaration_store`` source. When given,
+        ``xml_path`` is not read.
 
     Returns
     -------
@@ -37,72 +49,35 @@ def extract_spouse_activities(xml_path: Path) -> list[dict]:
     """
 
     try:
-        tree = ET.parse(xml_path)
+        root = BACKEND.parse_declaration(xml_path, data)
     except ET.ParseError as exc:  # pragma: no cover - defensive
         raise ValueError(f"Invalid XML in {xml_path}: {exc}") from exc
 
-    root = tree.getroot()
-
-    def get_unique_desc(parent, tag):
-        """Return a single descendant element or ``None`` if missing.
-
-        Raises ``ValueError`` if more than one matching element is found.
-        """
-
-        if parent is None:
-            return None
-        elements = parent.findall(f".//{tag}")
-        if len(elements) > 1:
-            raise ValueError(f"Multiple <{tag}> elements found in {xml_path}")
-        return elements[0] if elements else None
-
-    declaration = root if root.tag == "declaration" else get_unique_desc(root, "declaration")
-    uuid = declaration.findtext("uuid", default="").strip() if declaration is not None else ""
-
-    activ_dto = get_unique_desc(declaration, "activProfConjointDto")
-    if activ_dto is None:
-        return []
-
-    def clean(text: str) -> str:
-        """Collapse internal whitespace and strip ends."""
-
-        return " ".join(text.split()) if text else ""
-
-    activities = []
-    for item in activ_dto.findall("./items/items"):
-        activities.append(
-            {
-                "uuid": uuid,
-                "nomConjoint": clean(item.findtext("nomConjoint")),
-                "employeurConjoint": clean(item.findtext("employeurConjoint")),
-                "activiteProf": clean(item.findtext("activiteProf")),
-                "commentaire": clean(item.findtext("commentaire")),
-            }
-        )
-
-    return activities
+    return BACKEND.spouse_activity_records(root, str(xml_path))
 
 
 def main() -> None:
-    decl_dir = Path("split_declarations")
+    parser = argparse.ArgumentParser(description="Extract spouse activities")
+    parser.add_argument(
+        "--source",
+        default="split_declarations",
+        help="Directory of split files or bulk declarations.xml (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    source = open_source(args.source)
 
     output_dir = Path("pii")
     output_dir.mkdir(exist_ok=True)
     output_file = output_dir / "spouse_activities.csv"
-    fieldnames = [
-        "uuid",
-        "nomConjoint",
-        "employeurConjoint",
-        "activiteProf",
-        "commentaire",
-    ]
-
-    with output_file.open("w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for xml_file in sorted(decl_dir.glob("*.xml")):
-            for activity in extract_spouse_activities(xml_file):
-                writer.writerow(activity)
+    write_csv(
+        output_file,
+        (
+            activity
+            for name, data in source
+            for activity in extract_spouse_activities(Path(name), data)
+        ),
+        SPOUSE_ACTIVITY_FIELDS,
+    )
 
 
 if __name__ == "__main__":
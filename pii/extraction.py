@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import pandas as pd
 
+from full_pipeline.dates import BIRTH_FORMAT, DEPOSIT_FORMAT, parse_dates
 
 # Age bands in ten-year increments. Individuals younger than 20 are
 # excluded as the dataset focuses on adult officials.
@@ -28,7 +29,7 @@ def compute_age_features(df: pd.DataFrame) -> pd.DataFrame:
     df:
         DataFrame containing at least ``dateDepot`` and ``dateNaissance``
         columns formatted as ``"%d/%m/%Y %H:%M:%S"`` and ``"%d/%m/%Y"``
-        respectively.
+        respectively, or already parsed to ``datetime64``.
 
     Returns
     -------
@@ -37,12 +38,8 @@ def compute_age_features(df: pd.DataFrame) -> pd.DataFrame:
     """
 
     data = df.copy()
-    deposit = pd.to_datetime(
-        data["dateDepot"], format="%d/%m/%Y %H:%M:%S", errors="coerce"
-    )
-    birth = pd.to_datetime(
-        data["dateNaissance"], format="%d/%m/%Y", errors="coerce"
-    )
+    deposit = parse_dates(data["dateDepot"], DEPOSIT_FORMAT)
+    birth = parse_dates(data["dateNaissance"], BIRTH_FORMAT)
     valid = deposit.notna() & birth.notna()
     age = pd.Series(pd.NA, index=data.index, dtype="Int64")
     year_diff = deposit.dt.year - birth.dt.year
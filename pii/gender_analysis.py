@@ -1,10 +1,15 @@
 """Generate gender predictions for personal_info dataset and output stats."""
 
 import argparse
+import sys
 from pathlib import Path
 
 import pandas as pd
-from gender_guesser.detector import Detector
+
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from full_pipeline.aggregates import GenderTally
+from full_pipeline.gender import GenderCache, guess_genders
 
 
 DEFAULT_DATA = Path("pii/personal_info.csv")
@@ -20,6 +25,9 @@ def main() -> None:
     parser.add_argument(
         "--output", type=Path, default=DEFAULT_OUTPUT, help="Output CSV with gender"
     )
+    parser.add_argument(
+        "--gender-cache", type=Path, help="JSON file keeping name guesses between runs"
+    )
     args = parser.parse_args()
 
     # Load dataset
@@ -29,8 +37,10 @@ def main() -> None:
     df["first_name"] = df["prenom"].astype(str).str.split().str[0]
 
     # Guess gender from first name
-    detector = Detector(case_sensitive=False)
-    df["gender_guess"] = df["first_name"].apply(detector.get_gender)
+    cache = GenderCache(args.gender_cache) if args.gender_cache else None
+    df["gender_guess"] = guess_genders(df["first_name"], cache)
+    if cache is not None:
+        cache.save()
 
     # Map civilité to gender
     civilite_map = {"M": "male", "M.": "male", "Mme": "female", "Mme.": "female"}
@@ -40,12 +50,14 @@ def main() -> None:
     df.to_csv(args.output, index=False)
 
     # Generate stats
-    total = len(df)
-    gender_counts = df["gender"].value_counts().rename_axis("gender").to_frame("count")
+    tally = GenderTally()
+    tally.update(df)
+    total = tally.total
+    gender_counts = tally.gender_counts().to_frame("count")
     gender_counts["percent"] = (gender_counts["count"] / total * 100).round(2)
 
-    civilite_guess = pd.crosstab(df["civilite"], df["gender_guess"])
-    top_first_names = df["first_name"].str.title().value_counts().head(10)
+    civilite_guess = tally.civilite_guess()
+    top_first_names = tally.first_names().head(10)
 
     age_gender = None
     if {"age_band", "gender"}.issubset(df.columns):
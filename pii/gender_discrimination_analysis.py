@@ -1,13 +1,15 @@
 """Analyze spouse occupation data for gender disparities."""
 
 from pathlib import Path
-from typing import Optional
-import re
-import unicodedata
+import sys
 
 import matplotlib.pyplot as plt
 import pandas as pd
 
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from full_pipeline.occupations import classify_pay_grades, clean_occupations
+
 DATA_PATH = Path("spouse_occupation_gender_counts.csv")
 TOP_MALE_CSV = Path("top_male_jobs.csv")
 TOP_FEMALE_CSV = Path("top_female_jobs.csv")
@@ -17,112 +19,16 @@ FEMALE_PLOT = Path("top_female_jobs.png")
 PAY_CATEGORY_PLOT = Path("pay_category_comparison.png")
 TOP_N = 20
 
-PLACEHOLDER_VALUES = {
-    "",
-    "-",
-    "/",
-    "0",
-    "na",
-    "n/a",
-    "none",
-    "null",
-    "neant",
-}
-
-PLACEHOLDER_SUBSTRINGS = [
-    "donnees non publiees",
-    "donnee non publiee",
-    "sans profession",
-    "sans activite",
-    "sans emploi",
-]
-
-
-def clean_occupation(occ: str) -> Optional[str]:
-    """Normalize occupation text and drop placeholder values."""
-    if pd.isna(occ):
-        return None
-    occ = str(occ).strip().lower()
-    occ = re.sub(r"[\"']", "", occ)
-    occ = unicodedata.normalize("NFKD", occ).encode("ascii", "ignore").decode()
-    occ = re.sub(r"\s+", " ", occ)
-    if not re.search(r"[a-z]", occ):
-        return None
-    for token in PLACEHOLDER_SUBSTRINGS:
-        if token in occ:
-            return None
-    if "retraite" in occ:
-        return None
-    if occ in PLACEHOLDER_VALUES:
-        return None
-    return occ
-
-
-HIGH_PAY_KEYWORDS = [
-    "directeur",
-    "director",
-    "manager",
-    "chef",
-    "president",
-    "medecin",
-    "doctor",
-    "ingenieur",
-    "ingenieure",
-    "professeur",
-    "avocat",
-    "notaire",
-    "architect",
-    "entrepreneur",
-    "pharmacien",
-    "pilote",
-]
-
-LOW_PAY_KEYWORDS = [
-    "assistant",
-    "assistante",
-    "secretaire",
-    "vendeur",
-    "vendeuse",
-    "agent",
-    "employe",
-    "employee",
-    "caissier",
-    "caissiere",
-    "serveur",
-    "serveuse",
-    "aide",
-    "infirmier",
-    "infirmiere",
-    "technicien",
-    "ouvrier",
-    "artisan",
-    "animateur",
-    "animatrice",
-]
-
-
-def classify_pay(job: str) -> str:
-    """Classify job using keyword heuristics into pay categories."""
-    for kw in HIGH_PAY_KEYWORDS:
-        if kw in job:
-            return "high"
-    for kw in LOW_PAY_KEYWORDS:
-        if kw in job:
-            return "low"
-    return "unknown"
-
 
 def main() -> None:
     df = pd.read_csv(DATA_PATH)
-    df["occupation"] = df["occupation"].apply(clean_occupation)
+    df["occupation"] = clean_occupations(df["occupation"])
     df = df.dropna(subset=["occupation"])
+    df["pay_grade"] = classify_pay_grades(df["occupation"])
 
     top_male = df.sort_values("male", ascending=False).head(TOP_N).copy()
     top_female = df.sort_values("female", ascending=False).head(TOP_N).copy()
 
-    top_male["pay_grade"] = top_male["occupation"].apply(classify_pay)
-    top_female["pay_grade"] = top_female["occupation"].apply(classify_pay)
-
     top_male.to_csv(TOP_MALE_CSV, index=False)
     top_female.to_csv(TOP_FEMALE_CSV, index=False)
 
@@ -1,11 +1,16 @@
 """Analyze spouse occupations and plot trends."""
 
 from pathlib import Path
-import unicodedata
+import sys
 
 import matplotlib.pyplot as plt
 import pandas as pd
 
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from full_pipeline.dates import DEPOSIT_FORMAT, parse_dates
+from full_pipeline.occupations import job_counts, normalize_jobs
+
 SPOUSE_CSV = Path("pii/spouse_activities.csv")
 PERSONAL_CSV = Path("pii/personal_info_with_gender.csv")
 OUTPUT_PLOT = Path("spouse_occupation_trends.png")
@@ -16,9 +21,8 @@ TOP_N = 50
 def main() -> None:
     # Load datasets
     spouse_df = pd.read_csv(SPOUSE_CSV)
-    personal_df = pd.read_csv(
-        PERSONAL_CSV, parse_dates=["dateDepot"], dayfirst=True
-    )
+    personal_df = pd.read_csv(PERSONAL_CSV)
+    personal_df["dateDepot"] = parse_dates(personal_df["dateDepot"], DEPOSIT_FORMAT)
 
     # Merge on uuid and extract year from deposit date
     df = spouse_df.merge(
@@ -29,37 +33,33 @@ def main() -> None:
     df = df[df["activiteProf"] != "[Données non publiées]"]
 
     # Normalize job names for consistent counting
-    df["job_norm"] = (
-        df["activiteProf"]
-        .str.lower()
-        .apply(lambda x: unicodedata.normalize("NFKD", x).encode("ascii", "ignore").decode("utf-8"))
-    )
+    df["job_norm"] = normalize_jobs(df["activiteProf"])
     df["year"] = df["dateDepot"].dt.year
     df["spouse_gender"] = df["gender"].map({"male": "female", "female": "male"})
 
     # Compute top occupations
-    top_jobs = df["job_norm"].value_counts().head(TOP_N)
+    top_jobs = job_counts(df["job_norm"]).head(TOP_N)
     print("Top 50 spouse occupations:")
     print(top_jobs.rename(lambda x: x.title()).to_string())
 
     # Save gender counts per occupation
     gender_counts = (
-        df.groupby(["job_norm", "spouse_gender"])
+        df.groupby(["job_norm", "spouse_gender"], observed=True)
         .size()
         .unstack(fill_value=0)
         .reindex(columns=["male", "female"], fill_value=0)
         .reset_index()
         .rename(columns={"job_norm": "occupation"})
     )
-    gender_counts["occupation"] = gender_counts["occupation"].str.title()
+    gender_counts["occupation"] = gender_counts["occupation"].astype(object).str.title()
     gender_counts.to_csv(OUTPUT_CSV, index=False)
     print(f"Gender counts saved to {OUTPUT_CSV}")
 
     # Plot trends for top 5 occupations over time
     top5 = top_jobs.head(5).index
+    top = df[df["job_norm"].isin(top5)]
     trend_df = (
-        df[df["job_norm"].isin(top5)]
-        .groupby(["year", "job_norm"])
+        top.groupby(["year", top["job_norm"].astype(object)])
         .size()
         .unstack(fill_value=0)
         .sort_index()
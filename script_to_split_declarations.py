@@ -1,12 +1,37 @@
 #!/usr/bin/env python3
+"""Split the bulk HATVP ``declarations.xml`` into one file per declaration.
+
+Other modes index the dump, update a split incrementally or pack it into a
+single store; see the README and ``--help`` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
 import os
+import time
 import xml.etree.ElementTree as ET
+from typing import Iterator, Optional, Tuple
 from tqdm import tqdm
 
+from declaration_store.attachments import strip_attachments
+from declaration_store.compression import is_compressed, open_input
+from declaration_store.index import index_path_for, write_index
+from declaration_store.manifest import IncrementalWriter
+from declaration_store.packed import open_store_writer
+from declaration_store.shards import scan_parallel
+from declaration_store.spans import (
+    declaration_filename,
+    declaration_key,
+    iter_declaration_spans,
+    wrap_declaration,
+)
+
 INPUT_FILE = "declarations.xml"
 OUTPUT_DIR = "output"
+ATTACHMENTS_DIR = "attachments"
+ATTACHMENT_MODES = ("keep", "drop", "extract")
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 def localname(tag: str) -> str:
     """Strip XML namespace from a tag."""
@@ -19,31 +44,293 @@ def child_text(parent: ET.Element, wanted: str):
             return (ch.text or "").strip()
     return ""
 
-# First, count declarations for tqdm
-print("Counting declarations...")
-total = sum(1 for _, elem in ET.iterparse(INPUT_FILE, events=("end",)) if localname(elem.tag) == "declaration")
-
-# Now process and split
-print("Splitting...")
-root = None
-with tqdm(total=total, unit="decl") as pbar:
-    for event, elem in ET.iterparse(INPUT_FILE, events=("start", "end")):
-        if event == "start" and root is None:
-            root = elem  # capture the root (<declarations>)
-        if event == "end" and localname(elem.tag) == "declaration":
-            uuid = child_text(elem, "uuid")
-            version = child_text(elem, "declarationVersion")
-            if uuid and version:
-                filename = f"{uuid}-{version}.xml"
-                path = os.path.join(OUTPUT_DIR, filename)
-                # Wrap in <declarations> for valid XML
-                wrapper = ET.Element("declarations")
-                wrapper.append(ET.fromstring(ET.tostring(elem, encoding="utf-8")))
-                ET.ElementTree(wrapper).write(path, encoding="utf-8", xml_declaration=True)
-            pbar.update(1)
-            # Free memory
-            if root is not None:
-                try:
-                    root.remove(elem)
-                except ValueError:
-                    elem.clear()
+
+def attachment_filter(mode: str = "keep", directory: str = ATTACHMENTS_DIR):
+    """Return a ``(data, uuid, version) -> data`` filter for ``mode``, or ``None``."""
+    if mode == "keep":
+        return None
+    if mode == "drop":
+        return lambda data, uuid, version: strip_attachments(data)
+    if mode == "extract":
+        written = set()
+        return lambda data, uuid, version: strip_attachments(
+            data, directory, f"{uuid}-{version}", written
+        )
+    raise ValueError(f"Unknown attachment mode: {mode}")
+
+
+def report_throughput(count: int, nbytes: int, elapsed: float, verb: str = "Split") -> None:
+    """Print a one-line MB/s and declarations/s summary."""
+    elapsed = max(elapsed, 1e-9)
+    mb = nbytes / (1024 * 1024)
+    print(
+        f"{verb} {count} declarations ({mb:.1f} MB) in {elapsed:.1f}s: "
+        f"{mb / elapsed:.1f} MB/s, {count / elapsed:.0f} decl/s"
+    )
+
+
+class DeclarationScan:
+    """One pass over the declarations of a bulk dump, with progress.
+
+    Iterating yields ``(offset, (uuid, version), data)`` for every
+    declaration that has a uuid and version, after the ``attachments`` mode
+    has been applied to ``data``. ``count`` is the number of declarations
+    scanned, including those without a key.
+    """
+
+    def __init__(
+        self, input_file: str, attachments: str = "keep", attachments_dir: str = ATTACHMENTS_DIR
+    ) -> None:
+        self.input_file = input_file
+        self.strip = attachment_filter(attachments, attachments_dir)
+        self.total_bytes = os.path.getsize(input_file)
+        self.count = 0
+        self.start = time.perf_counter()
+
+    def __iter__(self) -> Iterator[Tuple[int, Tuple[str, str], bytes]]:
+        self.count = 0
+        self.start = time.perf_counter()
+        with tqdm(
+            total=self.total_bytes, unit="B", unit_scale=True, unit_divisor=1024
+        ) as pbar, open_input(self.input_file, progress=pbar.update) as source:
+            for offset, data in iter_declaration_spans(source):
+                self.count += 1
+                if self.count % 100 == 0:
+                    pbar.set_postfix_str(f"{self.count} decl", refresh=False)
+                uuid, version = declaration_key(data)
+                if not (uuid and version):
+                    continue
+                if self.strip is not None:
+                    data = self.strip(data, uuid, version)
+                yield offset, (uuid, version), data
+
+    def report(self, verb: str = "Split", count: Optional[int] = None) -> None:
+        """Print the throughput of the pass, for ``count`` declarations if given."""
+        count = self.count if count is None else count
+        report_throughput(count, self.total_bytes, time.perf_counter() - self.start, verb)
+
+
+def split_declarations(input_file: str = INPUT_FILE, output_dir: str = OUTPUT_DIR) -> int:
+    """Split ``input_file`` into ``output_dir`` in a single pass.
+
+    Returns the number of declarations encountered.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    total_bytes = os.path.getsize(input_file)
+    count = 0
+    start = time.perf_counter()
+    root = None
+    with tqdm(
+        total=total_bytes, unit="B", unit_scale=True, unit_divisor=1024
+    ) as pbar, open_input(input_file, progress=pbar.update) as source:
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start" and root is None:
+                root = elem  # capture the root (<declarations>)
+            if event == "end" and localname(elem.tag) == "declaration":
+                uuid = child_text(elem, "uuid")
+                version = child_text(elem, "declarationVersion")
+                if uuid and version:
+                    filename = f"{uuid}-{version}.xml"
+                    path = os.path.join(output_dir, filename)
+                    # Wrap in <declarations> for valid XML
+                    wrapper = ET.Element("declarations")
+                    wrapper.append(ET.fromstring(ET.tostring(elem, encoding="utf-8")))
+                    ET.ElementTree(wrapper).write(path, encoding="utf-8", xml_declaration=True)
+                count += 1
+                if count % 100 == 0:
+                    pbar.set_postfix_str(f"{count} decl", refresh=False)
+                # Free memory
+                if root is not None:
+                    try:
+                        root.remove(elem)
+                    except ValueError:
+                        elem.clear()
+    report_throughput(count, total_bytes, time.perf_counter() - start)
+    return count
+
+
+def split_declarations_raw(
+    input_file: str = INPUT_FILE,
+    output_dir: str = OUTPUT_DIR,
+    attachments: str = "keep",
+    attachments_dir: str = ATTACHMENTS_DIR,
+) -> int:
+    """Split ``input_file`` by copying each declaration's source bytes.
+
+    Output files hold the exact ``<declaration>`` slice of the input, so no
+    element tree is built. ``attachments`` is one of ``ATTACHMENT_MODES``.
+    Returns the number of declarations encountered.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    scan = DeclarationScan(input_file, attachments, attachments_dir)
+    for _, (uuid, version), data in scan:
+        path = os.path.join(output_dir, declaration_filename(uuid, version))
+        with open(path, "wb") as f:
+            f.write(wrap_declaration(data))
+    scan.report()
+    return scan.count
+
+
+def split_declarations_incremental(
+    input_file: str = INPUT_FILE,
+    output_dir: str = OUTPUT_DIR,
+    prune: bool = False,
+    attachments: str = "keep",
+    attachments_dir: str = ATTACHMENTS_DIR,
+) -> dict:
+    """Raw split writing only new or changed declarations.
+
+    Returns ``{file name: "added" | "changed" | "removed"}``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    writer = IncrementalWriter(output_dir, prune=prune)
+    scan = DeclarationScan(input_file, attachments, attachments_dir)
+    for _, (uuid, version), data in scan:
+        writer.write(declaration_filename(uuid, version), wrap_declaration(data))
+    changes = writer.finish()
+    scan.report()
+    print(writer.summary())
+    return changes
+
+
+def pack_declarations(
+    input_file: str = INPUT_FILE,
+    store_path: str = "declarations.zip",
+    attachments: str = "keep",
+    attachments_dir: str = ATTACHMENTS_DIR,
+) -> int:
+    """Copy every declaration of ``input_file`` into a zip or SQLite store."""
+    scan = DeclarationScan(input_file, attachments, attachments_dir)
+    with open_store_writer(store_path) as store:
+        for _, (uuid, version), data in scan:
+            store.write(declaration_filename(uuid, version), uuid, version, wrap_declaration(data))
+    scan.report(verb="Packed")
+    print(f"Store written to {store_path}")
+    return scan.count
+
+
+def build_declaration_index(input_file: str = INPUT_FILE, index_path: str | None = None) -> int:
+    """Write the offset index of ``input_file`` and return its entry count."""
+    index_path = index_path or index_path_for(input_file)
+    scan = DeclarationScan(input_file)
+    entries = ((uuid, version, offset, len(data)) for offset, (uuid, version), data in scan)
+    count = write_index(entries, index_path)
+    scan.report(verb="Indexed", count=count)
+    print(f"Index written to {index_path}")
+    return count
+
+
+def split_declarations_parallel(
+    input_file: str = INPUT_FILE, output_dir: str = OUTPUT_DIR, workers: int | None = None
+) -> int:
+    """Split ``input_file`` like :func:`split_declarations_raw` using ``workers`` processes."""
+    if is_compressed(input_file):
+        raise ValueError("Parallel splitting needs an uncompressed dump")
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    total_bytes = os.path.getsize(input_file)
+    start = time.perf_counter()
+    with tqdm(total=total_bytes, unit="B", unit_scale=True, unit_divisor=1024) as pbar:
+        _, count = scan_parallel(input_file, workers, output_dir, progress=pbar.update)
+    report_throughput(count, total_bytes, time.perf_counter() - start)
+    return count
+
+
+def build_declaration_index_parallel(
+    input_file: str = INPUT_FILE, index_path: str | None = None, workers: int | None = None
+) -> int:
+    """Write the offset index of ``input_file`` using ``workers`` processes."""
+    if is_compressed(input_file):
+        raise ValueError("Parallel indexing needs an uncompressed dump")
+    workers = workers or os.cpu_count() or 1
+    index_path = index_path or index_path_for(input_file)
+    total_bytes = os.path.getsize(input_file)
+    start = time.perf_counter()
+    with tqdm(total=total_bytes, unit="B", unit_scale=True, unit_divisor=1024) as pbar:
+        entries, _ = scan_parallel(input_file, workers, progress=pbar.update)
+    count = write_index(entries, index_path)
+    report_throughput(count, total_bytes, time.perf_counter() - start, verb="Indexed")
+    print(f"Index written to {index_path}")
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", default=INPUT_FILE, help="Bulk XML file, optionally compressed (default: %(default)s)")
+    parser.add_argument(
+        "--output-dir", default=OUTPUT_DIR, help="Destination directory (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Copy declaration bytes verbatim instead of re-serialising them",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Write an offset index next to the input instead of split files",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; above 1 implies --raw (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rewrite new or changed declarations (implies --raw)",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="With --incremental, delete files no longer in the export",
+    )
+    parser.add_argument(
+        "--store",
+        help="Write a packed .zip or .sqlite store instead of split files",
+    )
+    parser.add_argument(
+        "--attachments",
+        choices=ATTACHMENT_MODES,
+        default="keep",
+        help="Keep, drop or extract base64 attachment payloads (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--attachments-dir",
+        default=ATTACHMENTS_DIR,
+        help="Where --attachments extract writes files (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    attachments = {"attachments": args.attachments, "attachments_dir": args.attachments_dir}
+    if args.attachments != "keep" and (args.index or args.workers > 1):
+        parser.error("--attachments needs a single-process split or --store")
+    if args.store:
+        pack_declarations(args.input, args.store, **attachments)
+        return
+    if args.incremental and args.workers > 1:
+        parser.error("--incremental runs in a single process; drop --workers")
+    if args.workers > 1 and is_compressed(args.input):
+        parser.error("compressed inputs are read by a single process; drop --workers")
+    if args.index:
+        if args.workers > 1:
+            build_declaration_index_parallel(args.input, workers=args.workers)
+        else:
+            build_declaration_index(args.input)
+        return
+    if args.incremental:
+        split_declarations_incremental(
+            args.input, args.output_dir, prune=args.prune, **attachments
+        )
+        return
+    if args.workers > 1:
+        split_declarations_parallel(args.input, args.output_dir, args.workers)
+        return
+    if args.raw or args.attachments != "keep":
+        split_declarations_raw(args.input, args.output_dir, **attachments)
+    else:
+        split_declarations(args.input, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 from pathlib import Path
+from typing import Tuple
+
 import pandas as pd
 
 
-def main() -> None:
-    base = Path(__file__).resolve().parent.parent
-    stocks_path = base / 'stock_analysis' / 'output' / 'normalized_stocks.csv'
-    pii_path = base / 'pii' / 'personal_info.csv'
-    stocks_df = pd.read_csv(stocks_path)
-    pii_df = pd.read_csv(pii_path, usecols=['uuid', 'nom', 'prenom'])
+def build_person_reports(
+    stocks_df: pd.DataFrame, pii_df: pd.DataFrame
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Return the per-person stock report and the per-sector exposure.
+
+    ``stocks_df`` is the output of ``normalize_stocks`` and ``pii_df`` needs
+    the ``uuid``, ``nom`` and ``prenom`` columns of the personal info.
+    """
     merged = stocks_df.merge(pii_df, on='uuid', how='left')
     merged['evaluation'] = pd.to_numeric(merged['evaluation'], errors='coerce')
     report = (
@@ -41,6 +45,16 @@ def main() -> None:
         .reset_index(name='herfindahl_index')
     )
     report = report.merge(hhi, on=['uuid', 'nom', 'prenom'], how='left')
+    return report, sector_exposure
+
+
+def main() -> None:
+    base = Path(__file__).resolve().parent.parent
+    stocks_path = base / 'stock_analysis' / 'output' / 'normalized_stocks.csv'
+    pii_path = base / 'pii' / 'personal_info.csv'
+    stocks_df = pd.read_csv(stocks_path)
+    pii_df = pd.read_csv(pii_path, usecols=['uuid', 'nom', 'prenom'])
+    report, sector_exposure = build_person_reports(stocks_df, pii_df)
 
     output_dir = base / 'stock_analysis' / 'output'
     output_dir.mkdir(parents=True, exist_ok=True)
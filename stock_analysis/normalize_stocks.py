@@ -64,16 +64,21 @@ def map_sector(df: pd.DataFrame) -> pd.DataFrame:
     return df.merge(sectors, on='clean_name', how='left')
 
 
-def main() -> None:
-    base = Path(__file__).resolve().parent.parent
-    df = pd.read_csv(base / 'stock_extract' / 'stocks.csv')
+def normalize_stocks(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean company names, drop unpublished holdings and join sectors."""
+    df = df.copy()
     df['clean_name'] = df['nomSociete'].apply(clean_name)
     df = df[~df['clean_name'].isin(PLACEHOLDER_NAMES)]
     df = df[~df['clean_name'].str.contains('DONNEE', na=False)]
     df = df[~df['clean_name'].str.contains('NON PUBLIE', na=False)]
     df['evaluation'] = df['evaluation'].astype(str)
     df = df[~df['evaluation'].str.contains('non', case=False, na=False)]
-    df = map_sector(df)
+    return map_sector(df)
+
+
+def main() -> None:
+    base = Path(__file__).resolve().parent.parent
+    df = normalize_stocks(pd.read_csv(base / 'stock_extract' / 'stocks.csv'))
     output_dir = base / 'stock_analysis' / 'output'
     output_dir.mkdir(parents=True, exist_ok=True)
     df.to_csv(output_dir / 'normalized_stocks.csv', index=False)
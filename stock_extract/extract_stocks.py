@@ -1,54 +1,46 @@
-import csv
+import argparse
+import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
-def extract_stock_info(xml_file: Path):
-    """Extract stock-related information from a single declaration XML file."""
-    try:
-        root = ET.parse(xml_file).getroot()
-    except ET.ParseError:
-        return []
+# Allow running the script directly without installing the package.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from declaration_store import open_source
+from full_pipeline.backends import get_backend
+from full_pipeline.records import STOCK_FIELDS, write_csv
 
-    declaration = root.find('.//declaration')
-    if declaration is None:
-        return []
+BACKEND = get_backend()
 
-    uuid = declaration.findtext('uuid', default='')
-    pf = declaration.find('participationFinanciereDto')
-    if pf is None:
+def extract_stock_info(xml_file: Path, data: bytes = None):
+    """Extract stock-related information from a single declaration XML file.
+
+    When ``data`` holds the document bytes, ``xml_file`` is not read.
+    """
+    try:
+        root = BACKEND.parse_declaration(xml_file, data)
+    except ET.ParseError:
         return []
 
-    rows = []
-    for item in pf.findall('./items/items'):
-        row = {
-            'uuid': uuid,
-            'nomSociete': ' '.join((item.findtext('nomSociete', '') or '').split()),
-            'evaluation': item.findtext('evaluation', ''),
-            'capitalDetenu': item.findtext('capitalDetenu', ''),
-            'nombreParts': item.findtext('nombreParts', ''),
-            'commentaire': item.findtext('commentaire', ''),
-            'remuneration': item.findtext('remuneration', ''),
-        }
-        rows.append(row)
-    return rows
+    return BACKEND.stock_records(root)
 
 def main():
     base_path = Path(__file__).resolve().parent.parent
-    declarations_dir = base_path / 'split_declarations'
+    parser = argparse.ArgumentParser(description='Extract declared stock holdings')
+    parser.add_argument(
+        '--source',
+        default=str(base_path / 'split_declarations'),
+        help='Directory of split files or bulk declarations.xml',
+    )
+    args = parser.parse_args()
+    source = open_source(args.source)
     output_dir = base_path / 'stock_extract'
     output_dir.mkdir(exist_ok=True)
 
     all_rows = []
-    for xml_path in declarations_dir.glob('*.xml'):
-        all_rows.extend(extract_stock_info(xml_path))
-
-    fieldnames = ['uuid', 'nomSociete', 'evaluation', 'capitalDetenu', 'nombreParts', 'commentaire', 'remuneration']
-    output_file = output_dir / 'stocks.csv'
-    with output_file.open('w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in all_rows:
-            writer.writerow(row)
+    for name, data in source:
+        all_rows.extend(extract_stock_info(Path(name), data))
+
+    write_csv(output_dir / 'stocks.csv', all_rows, STOCK_FIELDS)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from declaration_store import DirectorySource
+
+from full_pipeline import DeclarationPipeline
+
+# Number of split declarations used by the end-to-end pipeline tests.
+SAMPLE_SIZE = 300
+
+
+@pytest.fixture(scope="session")
+def sample_pipeline():
+    """``DeclarationPipeline`` over the first files of ``split_declarations``."""
+    names = sorted(p.name for p in Path("split_declarations").glob("*.xml"))[:SAMPLE_SIZE]
+    org_names = pd.read_csv("avis/NER/organizations.csv")["name"].dropna().tolist()
+    source = DirectorySource(Path("split_declarations"), names=names)
+    return DeclarationPipeline(source, org_names)
+
+
+@pytest.fixture(scope="session")
+def sample_data(sample_pipeline):
+    """String datasets of :func:`sample_pipeline`; tests must not modify them."""
+    return sample_pipeline.run()
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from full_pipeline import GenderAnalyzer, SpouseOccupationAnalyzer
+from full_pipeline.aggregates import GenderTally, OccupationCounts
+from full_pipeline.occupation_clusters import OccupationClusterer
+from full_pipeline.occupations import job_counts, normalize_jobs
+from full_pipeline.pii_pipeline import tally_batches
+
+
+@pytest.fixture(scope="module")
+def gendered():
+    personal = pd.read_csv("pii/personal_info.csv", dtype=str)
+    return GenderAnalyzer().analyze(personal)
+
+
+@pytest.fixture(scope="module")
+def spouses():
+    return pd.read_csv("pii/spouse_activities.csv", dtype=str)
+
+
+def _halves(df):
+    middle = len(df) // 2
+    return df.iloc[:middle], df.iloc[middle:]
+
+
+@pytest.mark.parametrize("clustered", [False, True])
+def test_merged_occupation_counts_match_analyze(gendered, spouses, clustered):
+    analyzer = SpouseOccupationAnalyzer(OccupationClusterer() if clustered else None)
+    expected = analyzer.analyze(spouses, gendered, top_n=30)
+
+    counts = OccupationCounts()
+    for people in _halves(gendered):
+        part = analyzer.count(spouses[spouses["uuid"].isin(people["uuid"])], people)
+        counts.merge(part)
+    result = analyzer.summarize(counts, top_n=30)
+
+    for left, right in zip(result, expected):
+        assert_frame_equal(left, right)
+
+
+def test_counts_do_not_depend_on_merge_order(gendered, spouses):
+    parts = []
+    for people in _halves(gendered):
+        counts = OccupationCounts()
+        counts.update(spouses[spouses["uuid"].isin(people["uuid"])], people)
+        parts.append(counts)
+    forward, backward = OccupationCounts(), OccupationCounts()
+    for part in parts:
+        forward.merge(part)
+    for part in reversed(parts):
+        backward.merge(part)
+
+    def totals(counts):
+        keys = ["activiteProf", "spouse_gender", "year"]
+        return counts.counts.fillna("-").set_index(keys)["count"].sort_index()
+
+    assert_series_equal(totals(forward), totals(backward))
+    assert forward.counts["count"].sum() < len(spouses)
+
+
+def test_gender_tally_matches_row_statistics(gendered):
+    tally = GenderTally()
+    for half in _halves(gendered):
+        _, part = GenderAnalyzer().tally(half)
+        tally.merge(part)
+
+    assert tally.total == len(gendered)
+    assert_series_equal(tally.gender_counts(), gendered["gender"].value_counts())
+    assert_frame_equal(
+        tally.civilite_guess(), pd.crosstab(gendered["civilite"], gendered["gender_guess"])
+    )
+    assert_series_equal(
+        tally.first_names(), gendered["first_name"].str.title().value_counts()
+    )
+    assert len(tally.counts) < len(gendered)
+
+
+def test_weighted_job_counts_match_repeated_rows():
+    jobs = pd.Series(["Juge", "Avocate", "Juge", "Medecin", "avocate"])
+    weights = pd.Series([2, 3, 1, 3, 0])
+    repeated = pd.Series(np.repeat(jobs.to_numpy(), weights.to_numpy()))
+    assert_series_equal(
+        job_counts(normalize_jobs(jobs), weights), job_counts(normalize_jobs(repeated))
+    )
+
+
+def test_tally_batches_folds_pipeline_batches(sample_pipeline, sample_data):
+    people = GenderAnalyzer().analyze(sample_data.personal_info)
+    expected = SpouseOccupationAnalyzer().analyze(sample_data.spouse_activities, people)
+
+    tally, occupations = tally_batches(sample_pipeline.iter_batches(batch_size=60))
+    result = SpouseOccupationAnalyzer().summarize(occupations)
+
+    assert tally.total == len(people)
+    assert tally.gender_counts().to_dict() == people["gender"].value_counts().to_dict()
+    for left, right in zip(result, expected):
+        assert_frame_equal(left, right, check_dtype=False, check_index_type=False)
@@ -0,0 +1,103 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from full_pipeline.backends import EtreeBackend, get_backend
+
+DECLARATION = b"""<declarations><declaration>
+  <dateDepot> 01/02/2023 </dateDepot>
+  <uuid>u-1</uuid>
+  <general><declarant>
+    <civilite>M.</civilite><nom>Dupont</nom><prenom> Jean </prenom>
+    <email/><dateNaissance>01/01/1970</dateNaissance>
+  </declarant></general>
+  <activProfConjointDto><items>
+    <items><nomConjoint>Marie  Dupont</nomConjoint><activiteProf>Avocate
+      associ\xc3\xa9e</activiteProf></items>
+    <items><employeurConjoint>[Donn\xc3\xa9es non publi\xc3\xa9es]</employeurConjoint></items>
+  </items></activProfConjointDto>
+  <participationFinanciereDto><items>
+    <items><nomSociete>ACME\xc2\xa0 SA</nomSociete><evaluation>1\xe2\x80\xaf000</evaluation>
+      <nombreParts>10</nombreParts><remuneration/></items>
+    <items><nomSociete>Foo</nomSociete></items>
+  </items></participationFinanciereDto>
+  <participationDirigeantDto><items><items>
+    <nomSociete>Bar</nomSociete>
+    <remuneration><montant><montant><annee>2020</annee><montant>1 000,5</montant></montant>
+      <montant><montant>abc</montant></montant><montant>  </montant></montant></remuneration>
+    <dateDebut>01/2020</dateDebut>
+  </items></items></participationDirigeantDto>
+  <fonctionBenevoleDto><items><items>
+    <nomStructure>Association</nomStructure><descriptionActivite>Tr\xc3\xa9sorier</descriptionActivite>
+  </items></items></fonctionBenevoleDto>
+</declaration></declarations>"""
+
+NAMESPACED = b"""<root xmlns="urn:a" xmlns:b="urn:b">
+  <participationFinanciereDto><items>
+    <items><nomSociete>Acme</nomSociete><b:evaluation>5</b:evaluation><!-- note --></items>
+  </items></participationFinanciereDto>
+  <b:participationFinanciereDto><b:items><b:items><nomSociete>Other</nomSociete></b:items></b:items></b:participationFinanciereDto>
+</root>"""
+
+
+@pytest.fixture(params=["etree", "lxml"])
+def backend(request):
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+    return get_backend(request.param)
+
+
+def records(backend, data):
+    root = backend.parse(data)
+    return {
+        "personal": backend.personal_info_record(root, "f.xml"),
+        "spouse": backend.spouse_activity_records(root, "f.xml"),
+        "stocks": backend.stock_records(root),
+        "financial": list(backend.financial_participation_records(root, "f.xml")),
+        "roles": backend.external_role_records(root, "f.xml"),
+    }
+
+
+def test_backend_extracts_declaration(backend):
+    result = records(backend, DECLARATION)
+    assert result["personal"] == {
+        "file": "f.xml",
+        "dateDepot": "01/02/2023",
+        "uuid": "u-1",
+        "civilite": "M.",
+        "nom": "Dupont",
+        "prenom": "Jean",
+        "email": "",
+        "dateNaissance": "01/01/1970",
+    }
+    assert [row["activiteProf"] for row in result["spouse"]] == ["Avocate associée", ""]
+    assert result["financial"][0]["evaluation"] == "1 000"
+    assert [row["remuneration"] for row in result["roles"]] == ["1000.5", ""]
+    assert [row["type"] for row in result["roles"]] == ["participationDirigeant", "fonctionBenevole"]
+
+
+def test_backends_produce_identical_records(backend):
+    reference = EtreeBackend()
+    for data in (DECLARATION, NAMESPACED, b"<declaration><uuid>x</uuid></declaration>"):
+        assert records(backend, data) == records(reference, data)
+
+
+def test_backend_matches_namespaced_financial_participations(backend):
+    rows = list(backend.financial_participation_records(backend.parse(NAMESPACED), "n.xml"))
+    assert [(row["nomSociete"], row["evaluation"]) for row in rows] == [("Acme", "5"), ("Other", "")]
+
+
+def test_backend_rejects_duplicate_sections(backend):
+    data = b"<declaration><general/><general/></declaration>"
+    with pytest.raises(ValueError, match="Multiple <general>"):
+        backend.personal_info_record(backend.parse(data), "dup.xml")
+
+
+def test_backend_raises_parse_error(backend):
+    with pytest.raises(ET.ParseError):
+        backend.parse(b"<declaration><uuid>x</declaration>")
+
+
+def test_get_backend_rejects_unknown_name():
+    with pytest.raises(ValueError, match="Unknown XML backend"):
+        get_backend("sax")
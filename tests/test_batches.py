@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from declaration_store import DirectorySource
+
+from full_pipeline import DeclarationPipeline
+from full_pipeline.batches import BATCH_TABLES, CsvSink, ParquetSink
+
+DATASET_TABLES = [
+    "personal_info",
+    "spouse_activities",
+    "stocks",
+    "financial_participations",
+    "external_roles",
+]
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    names = sorted(p.name for p in Path("split_declarations").glob("*.xml"))[:150]
+    org_names = pd.read_csv("avis/NER/organizations.csv")["name"].dropna().tolist()
+    source = DirectorySource(Path("split_declarations"), names=names)
+    return DeclarationPipeline(source, org_names)
+
+
+def _concat(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    return pd.concat(frames, ignore_index=True).astype(object)
+
+
+def _mention_counts(hits: pd.DataFrame) -> dict:
+    return {name: sorted(group["file"]) for name, group in hits.groupby("organization")}
+
+
+def test_iter_batches_matches_run(pipeline):
+    data = pipeline.run()
+    batches = list(pipeline.iter_batches(batch_size=40))
+
+    assert [len(batch.files) for batch in batches] == [40, 40, 40, 30]
+    for table in DATASET_TABLES:
+        expected = getattr(data, table).astype(object)
+        assert_frame_equal(_concat([getattr(b, table) for b in batches]), expected)
+
+    hits = _mention_counts(_concat([b.organization_mentions for b in batches]))
+    expected_hits = {
+        row.organization: row.filenames.split(",")
+        for row in data.organization_mentions.itertuples()
+        if row.mentions
+    }
+    assert hits == expected_hits
+
+
+def test_parallel_iter_batches_matches_serial(pipeline):
+    serial = list(pipeline.iter_batches(batch_size=25))
+    parallel = list(pipeline.iter_batches(batch_size=25, workers=2))
+    assert [b.files for b in parallel] == [b.files for b in serial]
+    for left, right in zip(parallel, serial):
+        for table in BATCH_TABLES:
+            assert_frame_equal(getattr(left, table), getattr(right, table))
+
+
+def test_csv_sink_appends_batches(pipeline, tmp_path):
+    with CsvSink(tmp_path) as sink:
+        for batch in pipeline.iter_batches(batch_size=40):
+            sink.write(batch)
+
+    data = pipeline.run()
+    for table in DATASET_TABLES:
+        written = pd.read_csv(tmp_path / f"{table}.csv", dtype=str, keep_default_na=False)
+        assert_frame_equal(written, getattr(data, table).astype(str), check_dtype=False)
+    assert sorted(p.stem for p in tmp_path.glob("*.csv")) == sorted(BATCH_TABLES)
+
+
+def test_csv_sink_writes_headers_for_empty_tables(tmp_path):
+    with CsvSink(tmp_path, tables=["stocks"]):
+        pass
+    assert (tmp_path / "stocks.csv").read_text().splitlines() == [",".join(BATCH_TABLES["stocks"])]
+
+
+def test_sink_rejects_unknown_table(tmp_path):
+    with pytest.raises(ValueError, match="Unknown tables"):
+        CsvSink(tmp_path, tables=["nope"])
+
+
+def test_parquet_sink_appends_batches(pipeline, tmp_path):
+    pytest.importorskip("pyarrow")
+    with ParquetSink(tmp_path) as sink:
+        batches = list(pipeline.iter_batches(batch_size=40))
+        for batch in batches:
+            sink.write(batch)
+
+    for table in BATCH_TABLES:
+        written = pd.read_parquet(tmp_path / f"{table}.parquet")
+        expected = _concat([getattr(b, table) for b in batches])
+        assert list(written.columns) == list(BATCH_TABLES[table])
+        assert_frame_equal(written.astype(object), expected)
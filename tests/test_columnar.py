@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from full_pipeline import (
+    ExtractedData,
+    GenderAnalyzer,
+    SpouseOccupationAnalyzer,
+)
+from full_pipeline import columnar
+
+pytest.importorskip("pyarrow")
+
+
+def test_typed_columns():
+    df = pd.DataFrame(
+        {
+            "file": ["a.xml", "b.xml", "c.xml"],
+            "dateDepot": ["08/02/2021 19:58:13", "", "31/02/2021 00:00:00"],
+            "civilite": ["M.", "Mme", "M."],
+            "dateNaissance": ["29/07/1951", "1951-07-29", None],
+        }
+    )
+    typed = columnar.typed_frame(df, "personal_info")
+
+    assert typed["dateDepot"].tolist()[0] == pd.Timestamp("2021-02-08 19:58:13")
+    assert typed["dateDepot"].isna().tolist() == [False, True, True]
+    assert typed["dateNaissance"].isna().tolist() == [False, True, True]
+    assert isinstance(typed["civilite"].dtype, pd.CategoricalDtype)
+    assert list(typed["civilite"].cat.categories) == ["M.", "Mme"]
+    assert typed["file"].dtype == pd.StringDtype("pyarrow")
+
+
+def test_parquet_round_trip(sample_data, tmp_path):
+    typed = sample_data.typed()
+    sample_data.to_parquet(tmp_path)
+    loaded = ExtractedData.read_parquet(tmp_path)
+
+    for field in vars(typed):
+        assert_frame_equal(getattr(loaded, field), getattr(typed, field))
+    # Only the date columns change value; the rest keeps the extracted strings.
+    assert_frame_equal(
+        loaded.spouse_activities.astype(object), sample_data.spouse_activities, check_dtype=False
+    )
+    assert_frame_equal(
+        loaded.personal_info.drop(columns=["dateDepot", "dateNaissance"]).astype(object),
+        sample_data.personal_info.drop(columns=["dateDepot", "dateNaissance"]),
+        check_dtype=False,
+    )
+    assert loaded.organization_mentions["mentions"].dtype == "int64"
+
+
+def test_empty_datasets_round_trip(tmp_path):
+    empty = ExtractedData(
+        pd.DataFrame(columns=["file", "dateDepot", "dateNaissance", "civilite"]),
+        pd.DataFrame(columns=["uuid", "activiteProf"]),
+        pd.DataFrame(),
+        pd.DataFrame(),
+    )
+    empty.to_parquet(tmp_path)
+    loaded = ExtractedData.read_parquet(tmp_path)
+    assert loaded.personal_info.empty and list(loaded.stocks.columns) == list(empty.stocks.columns)
+
+
+def test_analyzers_accept_typed_data(sample_data):
+    typed = sample_data.typed()
+    plain_gender = GenderAnalyzer().analyze(sample_data.personal_info)
+    typed_gender = GenderAnalyzer().analyze(typed.personal_info)
+
+    plain = SpouseOccupationAnalyzer().analyze(sample_data.spouse_activities, plain_gender)
+    result = SpouseOccupationAnalyzer().analyze(typed.spouse_activities, typed_gender)
+
+    for left, right in zip(result, plain):
+        assert_frame_equal(left, right, check_dtype=False)
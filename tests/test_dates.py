@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from full_pipeline import (
+    AgePyramidBuilder,
+    GenderAnalyzer,
+    SpouseOccupationAnalyzer,
+)
+from full_pipeline.dates import (
+    BIRTH_FORMAT,
+    DEPOSIT_FORMAT,
+    ISO_DATE_FORMAT,
+    parse_dates,
+    with_parsed_dates,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pii"))
+from extraction import compute_age_features
+
+
+def test_parse_dates_matches_fixed_format_to_datetime():
+    personal = pd.read_csv("pii/personal_info.csv", dtype=str)
+    for column, fmt in [("dateDepot", DEPOSIT_FORMAT), ("dateNaissance", BIRTH_FORMAT)]:
+        expected = pd.to_datetime(personal[column], format=fmt, errors="coerce")
+        assert_series_equal(parse_dates(personal[column], fmt), expected)
+
+
+def test_parse_dates_handles_missing_and_invalid_values():
+    values = pd.Series(["2021-09-27", None, "27/09/2021", "2021-09-27"], index=[9, 8, 7, 6])
+    parsed = parse_dates(values, ISO_DATE_FORMAT)
+    assert parsed.isna().tolist() == [False, True, True, False]
+    assert parsed[9] == pd.Timestamp("2021-09-27")
+    assert parse_dates(parsed, ISO_DATE_FORMAT) is parsed
+    assert parse_dates(values.iloc[:0], ISO_DATE_FORMAT).dtype == "datetime64[ns]"
+
+
+def test_run_with_parsed_dates(sample_pipeline, sample_data):
+    plain = sample_data
+    dated = sample_pipeline.run(parse_dates=True)
+
+    assert dated.personal_info["dateDepot"].dtype == "datetime64[ns]"
+    assert dated.personal_info["dateNaissance"].dtype == "datetime64[ns]"
+    assert_frame_equal(dated.spouse_activities, plain.spouse_activities)
+    assert_frame_equal(
+        dated.personal_info,
+        plain.with_dates().personal_info,
+    )
+
+
+def test_analyzers_reuse_parsed_dates(sample_data, tmp_path):
+    plain = sample_data
+    dated = plain.with_dates()
+    for left, right in zip(
+        SpouseOccupationAnalyzer().analyze(
+            dated.spouse_activities, GenderAnalyzer().analyze(dated.personal_info)
+        ),
+        SpouseOccupationAnalyzer().analyze(
+            plain.spouse_activities, GenderAnalyzer().analyze(plain.personal_info)
+        ),
+    ):
+        assert_frame_equal(left, right)
+    AgePyramidBuilder().build(GenderAnalyzer().analyze(dated.personal_info), tmp_path / "ages.png")
+    assert (tmp_path / "ages.png").exists()
+
+
+def test_age_features_accept_parsed_dates():
+    personal = pd.read_csv("pii/personal_info.csv", dtype=str)
+    parsed = with_parsed_dates(personal, "personal_info")
+    assert parsed["dateDepot"].dtype == "datetime64[ns]"
+
+    expected = compute_age_features(personal)
+    result = compute_age_features(parsed)
+
+    assert result["age"].notna().sum() > 0
+    assert_series_equal(result["age"], expected["age"])
+    assert_series_equal(result["age_band"], expected["age_band"])
+    assert_series_equal(result["dateNaissance"], parsed["dateNaissance"])
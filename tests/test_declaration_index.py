@@ -0,0 +1,131 @@
+import bz2
+import gzip
+import lzma
+import os
+from pathlib import Path
+
+import pytest
+
+from declaration_store import (
+    DirectorySource,
+    IndexedDeclarations,
+    ZipDeclarations,
+    open_input,
+    open_source,
+    open_store_writer,
+)
+from full_pipeline import DeclarationPipeline
+from script_to_split_declarations import pack_declarations, split_declarations_raw
+
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+
+def _declaration(uuid: str, version: str, nom: str, spouse_job: str) -> bytes:
+    return (
+        f"<declaration><dateDepot>01/02/2020 10:00:00</dateDepot><uuid>{uuid}</uuid>"
+        f"<declarationVersion>{version}</declarationVersion>"
+        f"<activProfConjointDto><items><items><activiteProf>{spouse_job}</activiteProf>"
+        f"</items></items></activProfConjointDto>"
+        f"<general><declarant><civilite>M.</civilite><nom>{nom}</nom>"
+        f"<prenom>Jean</prenom></declarant></general></declaration>"
+    ).encode("utf-8")
+
+
+@pytest.fixture
+def bulk(tmp_path) -> Path:
+    path = tmp_path / "declarations.xml"
+    path.write_bytes(
+        b"<?xml version='1.0' encoding='UTF-8'?>\n<declarations>\n\t"
+        + _declaration("u2", "1", "Martin", "Avocate")
+        + b"\n\t"
+        + _declaration("u1", "3", "Dupont", "Professeur")
+        + b"\n</declarations>\n"
+    )
+    return path
+
+
+def test_indexed_reader_serves_split_documents(bulk, tmp_path):
+    split_declarations_raw(str(bulk), str(tmp_path / "split"))
+    reader = IndexedDeclarations(bulk)
+
+    assert reader.keys() == [("u2", "1"), ("u1", "3")]
+    assert reader.index_path.exists()
+    assert ("u1", "3") in reader and len(reader) == 2
+    for name, data in reader:
+        assert data == (tmp_path / "split" / name).read_bytes()
+    assert reader.get("u1", "3") == reader.read("u1-3.xml")
+    with pytest.raises(KeyError):
+        reader.get("missing", "1")
+
+
+def test_open_source_dispatch(bulk, tmp_path):
+    assert isinstance(open_source(bulk), IndexedDeclarations)
+    assert isinstance(open_source(tmp_path), DirectorySource)
+    with pytest.raises(ValueError):
+        open_source(tmp_path / "declarations.txt")
+
+
+def test_pipeline_reads_from_index(bulk, tmp_path):
+    split_declarations_raw(str(bulk), str(tmp_path / "split"))
+    from_dir = DeclarationPipeline(tmp_path / "split", ["Martin"]).run()
+    from_index = DeclarationPipeline(bulk, ["Martin"]).run()
+
+    sort_keys = {
+        "personal_info": "uuid",
+        "spouse_activities": "uuid",
+        "organization_mentions": "organization",
+    }
+    for field, key in sort_keys.items():
+        left = getattr(from_dir, field).sort_values(key).reset_index(drop=True)
+        right = getattr(from_index, field).sort_values(key).reset_index(drop=True)
+        assert left.equals(right)
+    assert from_index.organization_mentions["filenames"].tolist() == ["u2-1.xml"]
+
+
+@pytest.mark.parametrize("store_name", ["declarations.zip", "declarations.sqlite"])
+def test_packed_store_matches_split_files(bulk, tmp_path, store_name):
+    split_declarations_raw(str(bulk), str(tmp_path / "split"))
+    store_path = tmp_path / store_name
+    assert pack_declarations(str(bulk), str(store_path)) == 2
+
+    store = open_source(store_path)
+    assert store.names() == ["u2-1.xml", "u1-3.xml"]
+    assert len(store) == 2
+    for name, data in store:
+        assert data == (tmp_path / "split" / name).read_bytes()
+        assert store.read(name) == data
+
+
+def test_zip_store_keeps_last_duplicate(tmp_path):
+    path = tmp_path / "store.zip"
+    with open_store_writer(path) as store:
+        store.write("a-1.xml", "a", "1", b"old")
+        store.write("b-1.xml", "b", "1", b"other")
+        store.write("a-1.xml", "a", "1", b"new")
+    reader = ZipDeclarations(path)
+    assert dict(reader) == {"a-1.xml": b"new", "b-1.xml": b"other"}
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+def test_compressed_dump_is_streamed(bulk, tmp_path, suffix):
+    compress = {".gz": gzip.compress, ".bz2": bz2.compress, ".xz": lzma.compress}[suffix]
+    packed = tmp_path / f"declarations.xml{suffix}"
+    packed.write_bytes(compress(bulk.read_bytes()))
+    split_declarations_raw(str(bulk), str(tmp_path / "split"))
+    split_declarations_raw(str(packed), str(tmp_path / "from_packed"))
+
+    reader = open_source(packed)
+    assert isinstance(reader, IndexedDeclarations)
+    assert reader.keys() == [("u2", "1"), ("u1", "3")]
+    for name, data in reader:
+        assert data == (tmp_path / "split" / name).read_bytes()
+        assert data == (tmp_path / "from_packed" / name).read_bytes()
+    with pytest.raises(ValueError):
+        reader.read("u1-3.xml")
+
+
+def test_threaded_reader_reports_corrupt_input(bulk, tmp_path):
+    packed = tmp_path / "declarations.xml.gz"
+    packed.write_bytes(gzip.compress(bulk.read_bytes())[:-20])
+    with open_input(packed) as stream, pytest.raises(EOFError):
+        stream.read()
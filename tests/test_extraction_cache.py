@@ -0,0 +1,118 @@
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from declaration_store import DirectorySource
+from full_pipeline import DeclarationPipeline
+from full_pipeline import pii_pipeline
+
+
+@pytest.fixture
+def decl_dir(tmp_path):
+    target = tmp_path / "decls"
+    target.mkdir()
+    for path in sorted(Path("split_declarations").glob("*.xml"))[:60]:
+        shutil.copy(path, target / path.name)
+    return target
+
+
+@pytest.fixture(scope="module")
+def org_names():
+    return pd.read_csv("avis/NER/organizations.csv")["name"].dropna().tolist()
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Record the names of the files actually parsed."""
+    names = []
+    extract = pii_pipeline._FileExtractor.extract
+
+    def counting(self, items):
+        items = list(items)
+        names.extend(name for name, _ in items)
+        return extract(self, items)
+
+    monkeypatch.setattr(pii_pipeline._FileExtractor, "extract", counting)
+    return names
+
+
+def _assert_same(left, right):
+    for field in vars(right):
+        assert_frame_equal(getattr(left, field), getattr(right, field))
+
+
+def test_warm_run_reuses_cached_results(decl_dir, org_names, tmp_path, parsed):
+    cache = tmp_path / "cache.sqlite"
+    expected = DeclarationPipeline(decl_dir, org_names).run()
+    parsed.clear()
+
+    cold = DeclarationPipeline(decl_dir, org_names, cache=cache).run(chunk_size=16)
+    assert len(parsed) == 60
+    parsed.clear()
+    warm = DeclarationPipeline(decl_dir, org_names, cache=cache).run(chunk_size=16)
+
+    assert parsed == []
+    _assert_same(cold, expected)
+    _assert_same(warm, expected)
+
+
+def test_changed_file_is_parsed_again(decl_dir, org_names, tmp_path, parsed):
+    cache = tmp_path / "cache.sqlite"
+    DeclarationPipeline(decl_dir, org_names, cache=cache).run()
+    changed = sorted(decl_dir.glob("*.xml"))[7]
+    changed.write_bytes(changed.read_bytes().replace(b"<nom>", b"<nom>X", 1))
+    parsed.clear()
+
+    warm = DeclarationPipeline(decl_dir, org_names, cache=cache).run()
+
+    assert parsed == [changed.name]
+    _assert_same(warm, DeclarationPipeline(decl_dir, org_names).run())
+
+
+def _cached_names(cache):
+    with sqlite3.connect(cache) as conn:
+        return sorted(name for (name,) in conn.execute("SELECT name FROM extractions"))
+
+
+def test_removed_files_are_dropped_from_cache(decl_dir, org_names, tmp_path):
+    cache = tmp_path / "cache.sqlite"
+    DeclarationPipeline(decl_dir, org_names, cache=cache).run()
+    removed = sorted(decl_dir.glob("*.xml"))[:5]
+    for path in removed:
+        path.unlink()
+    subset = [path.name for path in sorted(decl_dir.glob("*.xml"))[:10]]
+
+    source = DirectorySource(decl_dir, names=subset)
+    DeclarationPipeline(source, org_names, cache=cache, prune_cache=False).run()
+    assert len(_cached_names(cache)) == 60
+
+    DeclarationPipeline(decl_dir, org_names, cache=cache).run(chunk_size=16)
+    assert _cached_names(cache) == sorted(path.name for path in decl_dir.glob("*.xml"))
+
+
+def test_parallel_run_uses_cache(decl_dir, org_names, tmp_path):
+    cache = tmp_path / "cache.sqlite"
+    expected = DeclarationPipeline(decl_dir, org_names).run()
+    pipeline = DeclarationPipeline(decl_dir, org_names, cache=cache)
+    cold = pipeline.run(workers=2, chunk_size=9)
+    warm = pipeline.run(workers=2, chunk_size=9)
+
+    _assert_same(cold, expected)
+    _assert_same(warm, expected)
+    with sqlite3.connect(cache) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM extractions").fetchone() == (60,)
+
+
+def test_settings_change_invalidates_cache(decl_dir, org_names, tmp_path, parsed):
+    cache = tmp_path / "cache.sqlite"
+    DeclarationPipeline(decl_dir, org_names, cache=cache).run()
+    parsed.clear()
+
+    data = DeclarationPipeline(decl_dir, org_names[:10], cache=cache).run()
+
+    assert len(parsed) == 60
+    assert len(data.organization_mentions) == 10
@@ -0,0 +1,75 @@
+import gzip
+
+import pandas as pd
+from pandas.testing import assert_series_equal
+
+from full_pipeline import GenderAnalyzer
+from full_pipeline.gender import (
+    GenderCache,
+    build_gender_table,
+    detector_table,
+    gender_table,
+    get_detector,
+    guess_genders,
+    read_gender_table,
+)
+
+
+def _first_names() -> pd.Series:
+    df = pd.read_csv("pii/personal_info.csv", usecols=["prenom"])
+    return df["prenom"].astype(str).str.split().str[0]
+
+
+def test_matches_per_row_detector():
+    names = _first_names()
+    expected = names.apply(get_detector().get_gender)
+    assert_series_equal(guess_genders(names), expected)
+    assert guess_genders(names.iloc[:0]).empty
+
+
+def test_precompiled_table_matches_detector(tmp_path):
+    assert read_gender_table() == detector_table()
+
+    path = tmp_path / "table.tsv.gz"
+    assert build_gender_table(path) == len(get_detector().names)
+    assert read_gender_table(path) == read_gender_table()
+    assert read_gender_table(tmp_path / "missing.tsv.gz") is None
+    path.write_bytes(gzip.compress(b"# gender-guesser 0.0\nmale\tmarie\n"))
+    assert read_gender_table(path) is None
+
+
+def test_detector_is_shared():
+    assert GenderAnalyzer().detector is GenderAnalyzer().detector
+
+
+def test_cache_round_trip(tmp_path):
+    path = tmp_path / "genders.json"
+    names = pd.Series(["Marie", "JEAN", "jean", "Zzyzx"], index=[3, 1, 2, 0])
+    cache = GenderCache(path)
+    first = guess_genders(names, cache)
+    cache.save()
+    assert first.tolist() == ["female", "male", "male", "unknown"]
+    assert first.index.tolist() == [3, 1, 2, 0]
+
+    reloaded = GenderCache(path)
+    assert len(reloaded) == 3
+    gender_table.cache_clear()
+    assert_series_equal(guess_genders(names, reloaded), first)
+    # Every name came from the cache, so the table was never loaded.
+    assert gender_table.cache_info().currsize == 0
+    assert not reloaded.dirty
+
+
+def test_stale_cache_is_ignored(tmp_path):
+    path = tmp_path / "genders.json"
+    path.write_text('{"fingerprint": "old", "names": {"marie": "male"}}', encoding="utf-8")
+    assert len(GenderCache(path)) == 0
+    assert guess_genders(pd.Series(["Marie"]), GenderCache(path)).tolist() == ["female"]
+
+
+def test_analyzer_with_cache(tmp_path):
+    df = pd.read_csv("pii/personal_info.csv").head(500)
+    plain = GenderAnalyzer().analyze(df)
+    cached = GenderAnalyzer(cache=tmp_path / "genders.json").analyze(df)
+    pd.testing.assert_frame_equal(cached, plain)
+    assert (tmp_path / "genders.json").exists()
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import main
+from declaration_store.spans import iter_declaration_spans
+from script_to_split_declarations import split_declarations_incremental
+
+
+@pytest.fixture
+def run_artifacts(tmp_path, monkeypatch):
+    """Keep the caches and metrics of ``main`` out of the working directory."""
+    monkeypatch.setattr(main, "EXTRACTION_CACHE", tmp_path / "cache.sqlite")
+    monkeypatch.setattr(main, "METRICS_FILE", tmp_path / "metrics.json")
+    monkeypatch.setattr(main, "GENDER_CACHE", tmp_path / "gender.json")
+
+
+def _declarations(count):
+    decls = []
+    for path in sorted(Path("split_declarations").glob("*.xml"))[:count]:
+        with path.open("rb") as f:
+            decls.extend(data for _, data in iter_declaration_spans(f))
+    return decls
+
+
+def _split(tmp_path, decls):
+    bulk = tmp_path / "declarations.xml"
+    bulk.write_bytes(b"<declarations>" + b"\n".join(decls) + b"</declarations>")
+    return split_declarations_incremental(str(bulk), str(tmp_path / "split"), prune=True)
+
+
+def test_changed_only_processes_the_last_incremental_delta(tmp_path, run_artifacts):
+    first, second, third = _declarations(3)
+    _split(tmp_path, [first, second])
+    changes = _split(tmp_path, [first, second.replace(b"</declaration>", b" </declaration>"), third])
+    delta = sorted(name for name, status in changes.items() if status != "removed")
+    assert len(delta) == 2
+
+    main.main(
+        ["--decl-dir", str(tmp_path / "split"), "--changed-only", "--output-root", str(tmp_path / "out")]
+    )
+
+    personal = pd.read_csv(tmp_path / "out" / "pii" / "personal_info.csv", dtype=str)
+    assert sorted(personal["file"]) == delta
+    assert (tmp_path / "metrics.json").exists()
+
+
+def test_changed_only_needs_a_change_list(tmp_path, run_artifacts):
+    (tmp_path / "split").mkdir()
+    with pytest.raises(SystemExit):
+        main.main(["--decl-dir", str(tmp_path / "split"), "--changed-only"])
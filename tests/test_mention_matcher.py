@@ -0,0 +1,21 @@
+import pytest
+
+from full_pipeline.mentions import MentionMatcher
+
+
+@pytest.mark.parametrize("use_c", [False, True])
+def test_matcher_matches_substring_search(use_c):
+    names = ["EDF", "EDF Renouvelables", "Renouvelables", "Dupont", "Pont", "", "Société Générale"]
+    texts = [
+        "<nomSociete>EDF Renouvelables</nomSociete>",
+        "<nom>DUPONT</nom><nom>Dupont-Pont</nom>",
+        "Société Généraleé",
+        "",
+    ]
+    matcher = MentionMatcher(names, use_c=use_c)
+    for text in texts:
+        assert matcher.find(text) == {name for name in names if name in text}
+
+
+def test_matcher_deduplicates_names():
+    assert MentionMatcher(["A", "B", "A"], use_c=False).names == ["A", "B"]
@@ -0,0 +1,54 @@
+import json
+
+import pandas as pd
+
+from full_pipeline import GenderAnalyzer, SpouseOccupationAnalyzer
+from full_pipeline.occupation_clusters import OccupationClusterer, occupation_key
+
+
+def test_spelling_variants_share_a_canonical_form():
+    values = pd.Series(
+        ["Professeur des écoles"] * 3
+        + ["professeure des ecoles", "Prof. des écoles", "PROFESSEUR DES ECOLES [Données non publiées]"]
+        + ["Infirmière"] * 2
+        + ["infirmier", "Chef de train", "Chef de rang", "Agent", "Argent"]
+    )
+    result = OccupationClusterer().canonicalize(values)
+
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert set(result.iloc[:6]) == {"professeur des ecoles"}
+    assert set(result.iloc[6:9]) == {"infirmiere"}
+    assert result.iloc[9:].tolist() == ["chef de train", "chef de rang", "agent", "argent"]
+
+
+def test_occupation_key():
+    assert occupation_key("Prof. des Écoles [Données non publiées]") == "prof des ecoles"
+
+
+def test_cache_keeps_clusters_stable(tmp_path):
+    path = tmp_path / "clusters.json"
+    first = OccupationClusterer(cache=path)
+    first.canonicalize(pd.Series(["Infirmière", "Infirmière", "Avocat"]))
+    assert set(json.loads(path.read_text(encoding="utf-8"))["mapping"]) == {"Infirmière", "Avocat"}
+
+    # A new, more frequent spelling joins the stored cluster instead of replacing it.
+    second = OccupationClusterer(cache=path)
+    result = second.canonicalize(pd.Series(["infirmier"] * 5 + ["Avocate"]))
+    assert result.tolist() == ["infirmiere"] * 5 + ["avocat"]
+    assert len(second.clusters()) == 4
+
+    # Other settings ignore the stored mapping.
+    assert OccupationClusterer(threshold=0.95, cache=path).mapping == {}
+
+
+def test_analyzer_counts_canonical_occupations():
+    spouse = pd.read_csv("pii/spouse_activities.csv")
+    personal = GenderAnalyzer().analyze(pd.read_csv("pii/personal_info.csv"))
+    plain, _ = SpouseOccupationAnalyzer().analyze(spouse, personal)
+    clustered, _ = SpouseOccupationAnalyzer(OccupationClusterer()).analyze(spouse, personal)
+
+    assert len(clustered) < len(plain)
+    assert clustered[["male", "female"]].sum().tolist() == plain[["male", "female"]].sum().tolist()
+    teachers = clustered.set_index("occupation").loc["Professeur Des Ecoles"]
+    plain = plain.set_index("occupation")
+    assert teachers.sum() > plain.loc["Professeur Des Ecoles"].sum() + plain.loc["Professeure Des Ecoles"].sum()
@@ -0,0 +1,74 @@
+import unicodedata
+
+import pandas as pd
+from pandas.testing import assert_series_equal
+
+from full_pipeline import GenderDiscriminationAnalyzer
+from full_pipeline.occupations import (
+    classify_pay_grades,
+    clean_occupations,
+    job_counts,
+    normalize_jobs,
+)
+
+
+def _spouse_jobs() -> pd.Series:
+    df = pd.read_csv("pii/spouse_activities.csv")
+    return df["activiteProf"].dropna().astype(str).str.strip()
+
+
+def test_normalize_jobs_matches_per_row_normalization():
+    jobs = _spouse_jobs()
+    expected = jobs.str.lower().apply(
+        lambda x: unicodedata.normalize("NFKD", x).encode("ascii", "ignore").decode("utf-8")
+    )
+    result = normalize_jobs(jobs)
+
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert list(result.cat.categories) == sorted(set(expected))
+    assert_series_equal(result.astype(object), expected)
+
+
+def test_normalize_jobs_merges_spellings():
+    result = normalize_jobs(pd.Series(["Médecin", "MEDECIN", "Avocate", None], index=[4, 3, 2, 1]))
+    assert result.tolist()[:3] == ["medecin", "medecin", "avocate"]
+    assert pd.isna(result.iloc[3])
+    assert list(result.cat.categories) == ["avocate", "medecin"]
+    assert result.index.tolist() == [4, 3, 2, 1]
+
+
+def test_job_counts_match_value_counts():
+    jobs = normalize_jobs(_spouse_jobs())
+    expected = jobs.astype(object).value_counts()
+    assert_series_equal(job_counts(jobs), expected)
+    assert job_counts(jobs.iloc[:0]).empty
+
+
+def test_clean_occupations():
+    values = pd.Series(
+        [" 'Médecin'  ", "Chef  de\tprojet", "---", "Sans Profession", "NEANT", "Retraitée", None, "N/A"]
+    )
+    assert clean_occupations(values).tolist() == [
+        "medecin",
+        "chef de projet",
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+    ]
+
+
+def test_classify_pay_grades():
+    jobs = pd.Series(["directeur commercial", "assistante du directeur", "agent", "boulanger"])
+    # High-pay keywords win over low-pay ones ("directeur" in the second job).
+    assert classify_pay_grades(jobs).tolist() == ["high", "high", "low", "unknown"]
+
+
+def test_pay_summary_over_whole_table():
+    counts = pd.read_csv("pii/spouse_occupation_gender_counts.csv")
+    top_male, _, summary = GenderDiscriminationAnalyzer(top_n=None).analyze(counts)
+    cleaned = clean_occupations(counts["occupation"]).dropna()
+    assert len(top_male) == len(cleaned)
+    assert summary.loc["male"].sum() == len(cleaned)
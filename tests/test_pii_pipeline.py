@@ -4,6 +4,8 @@ import pandas as pd
 from pandas.testing import assert_frame_equal
 from PIL import Image
 
+from declaration_store import DirectorySource
+
 from full_pipeline import (
     DeclarationPipeline,
     GenderAnalyzer,
@@ -42,6 +44,19 @@ def test_pii_pipeline_matches_existing():
         ["uuid", "nomConjoint", "employeurConjoint", "activiteProf", "commentaire"],
     ).shape
 
+    for field, path in [
+        ("stocks", "stock_extract/stocks.csv"),
+        ("financial_participations", "financial_participations/financial_participations.csv"),
+    ]:
+        expected = pd.read_csv(path, dtype=str, keep_default_na=False)
+        actual = getattr(data, field)
+        assert_frame_equal(
+            _sort(actual, list(actual.columns)), _sort(expected, list(expected.columns))
+        )
+    assert list(data.external_roles.columns) == [
+        "file", "type", "organization", "role", "remuneration", "date_start", "date_end"
+    ]
+
     expected_org = pd.read_csv("organization_mentions.csv")[["organization", "mentions"]]
     assert_frame_equal(
         _sort(data.organization_mentions[["organization", "mentions"]], ["organization"]),
@@ -81,6 +96,31 @@ def test_pii_pipeline_matches_existing():
     assert_frame_equal(pay_summary, expected_pay_summary)
 
 
+def test_parallel_run_matches_serial_run():
+    decl_dir = Path("split_declarations")
+    names = sorted(p.name for p in decl_dir.glob("*.xml"))[:400]
+    org_names = pd.read_csv("avis/NER/organizations.csv")["name"].dropna().tolist()
+    source = DirectorySource(decl_dir, names=names)
+
+    serial = DeclarationPipeline(source, org_names).run()
+    parallel = DeclarationPipeline(source, org_names).run(workers=2, chunk_size=37)
+
+    for field in vars(serial):
+        assert_frame_equal(getattr(parallel, field), getattr(serial, field))
+
+
+def test_run_restricted_to_datasets():
+    names = sorted(p.name for p in Path("split_declarations").glob("*.xml"))[:200]
+    source = DirectorySource(Path("split_declarations"), names=names)
+
+    full = DeclarationPipeline(source).run()
+    partial = DeclarationPipeline(source, datasets=["personal_info", "stocks"]).run()
+
+    assert_frame_equal(partial.personal_info, full.personal_info)
+    assert_frame_equal(partial.stocks, full.stocks)
+    assert partial.spouse_activities.empty and partial.external_roles.empty
+
+
 def test_report_figure_generator_reproduces_reference_figures():
     dest = Path("spouse_occupation_gender_counts.csv")
     original_csv = dest.read_bytes() if dest.exists() else None
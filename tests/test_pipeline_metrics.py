@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+
+from declaration_store import DirectorySource
+
+from full_pipeline import DeclarationPipeline
+from full_pipeline.metrics import PipelineMetrics
+
+
+def _source(count: int) -> DirectorySource:
+    names = sorted(p.name for p in Path("split_declarations").glob("*.xml"))[:count]
+    return DirectorySource(Path("split_declarations"), names=names)
+
+
+def test_run_records_stage_metrics():
+    pipeline = DeclarationPipeline(_source(50))
+    data = pipeline.run(chunk_size=16)
+    metrics = pipeline.metrics
+
+    assert list(metrics.stages)[:4] == ["read", "mentions", "parse", "records"]
+    assert metrics["read"].files == metrics["parse"].files == 50
+    assert metrics["read"].bytes == sum(len(data) for _, data in _source(50))
+    datasets = [
+        data.personal_info,
+        data.spouse_activities,
+        data.stocks,
+        data.financial_participations,
+        data.external_roles,
+    ]
+    rows = sum(len(df) for df in datasets)
+    assert metrics["records"].records == metrics["run"].records == rows
+    stages = sum(metrics[name].wall for name in ("read", "mentions", "parse", "records", "frames"))
+    assert stages <= metrics["run"].wall
+
+
+def test_parallel_and_cached_runs_report_the_same_counts(tmp_path):
+    serial = DeclarationPipeline(_source(40))
+    serial.run()
+    parallel = DeclarationPipeline(_source(40), cache=tmp_path / "cache.sqlite")
+    parallel.run(workers=2, chunk_size=7)
+
+    for stage in ("mentions", "parse", "records"):
+        assert parallel.metrics[stage].files == serial.metrics[stage].files
+    # The parent reads every file to hash it, then workers re-read the misses.
+    assert parallel.metrics["read"].files == 80
+    assert parallel.metrics["cache"].files == 40
+
+    parallel.run(workers=2, chunk_size=7)
+    assert "parse" not in parallel.metrics
+    assert parallel.metrics["run"].records == serial.metrics["run"].records
+
+
+def test_metrics_json_and_summary(tmp_path):
+    metrics = PipelineMetrics()
+    with metrics.stage("analyze", records=10) as stage:
+        stage.files = 2
+    metrics.record("parse", wall=2.0, cpu=1.5, files=4, bytes=2 * 1024 * 1024, records=8)
+    path = tmp_path / "metrics.json"
+    metrics.write_json(path)
+
+    data = json.loads(path.read_text())
+    assert data["parse"]["files_per_s"] == 2.0
+    assert data["parse"]["mb_per_s"] == 1.0
+    assert data["analyze"]["records"] == 10 and data["analyze"]["calls"] == 1
+    lines = metrics.summary().splitlines()
+    assert lines[0].split()[0] == "stage"
+    assert [line.split()[0] for line in lines[2:]] == ["analyze", "parse"]
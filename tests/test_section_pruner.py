@@ -0,0 +1,52 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from full_pipeline.sections import SectionPruner
+
+DOC = (
+    b"<declarations><declaration><uuid>u1</uuid>"
+    b"<general><declarant><nom>Martin</nom></declarant></general>"
+    b"<mandatElectifDto><items><items><x>1</x></items></items></mandatElectifDto>"
+    b"<attachedFiles/>"
+    b"<activProfConjointDto><items><items><activiteProf>Avocate</activiteProf>"
+    b"</items></items></activProfConjointDto>"
+    b"</declaration></declarations>"
+)
+
+
+def _tags(data: bytes) -> list[str]:
+    return [child.tag for child in ET.fromstring(data).find("declaration")]
+
+
+def test_pruner_keeps_only_requested_sections():
+    assert _tags(SectionPruner(["personal_info"]).prune(DOC)) == ["uuid", "general"]
+    assert _tags(SectionPruner().prune(DOC)) == ["uuid", "general", "activProfConjointDto"]
+
+
+@pytest.mark.parametrize(
+    "section",
+    [
+        b"<mandatElectifDto><general/></mandatElectifDto>",  # holds a kept section
+        b"<mandatElectifDto><!-- </mandatElectifDto> --></mandatElectifDto>",
+        b'<mandatElectifDto note="a>b">x</mandatElectifDto>',
+    ],
+)
+def test_pruner_leaves_unusual_sections(section):
+    doc = b"<declarations><declaration>" + section + b"</declaration></declarations>"
+    assert SectionPruner(["personal_info"]).prune(doc) == doc
+
+
+def test_pruner_keeps_self_nesting_section():
+    doc = (
+        b"<declarations><declaration><mandatElectifDto><a><mandatElectifDto>x"
+        b"</mandatElectifDto></a><b/></mandatElectifDto></declaration></declarations>"
+    )
+    pruned = SectionPruner(["personal_info"]).prune(doc)
+    assert _tags(pruned) == ["mandatElectifDto"]
+    assert ET.fromstring(pruned).find(".//b") is not None
+
+
+def test_pruner_rejects_unknown_dataset():
+    with pytest.raises(ValueError):
+        SectionPruner(["nope"])
@@ -0,0 +1,170 @@
+import base64
+import io
+import os
+
+import pytest
+
+from declaration_store.attachments import strip_attachments
+from declaration_store.manifest import changed_names, read_changes
+from declaration_store.shards import shard_ranges
+from declaration_store.spans import declaration_key, iter_declaration_spans
+from script_to_split_declarations import (
+    split_declarations,
+    split_declarations_incremental,
+    split_declarations_parallel,
+    split_declarations_raw,
+)
+
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+DECL_A = (
+    b"<declaration><uuid>aaa</uuid><declarationVersion>1</declarationVersion>"
+    b"<general><declarant><nom>Dupont</nom></declarant></general></declaration>"
+)
+DECL_B = (
+    b"<declaration>\n\t\t<uuid>bbb</uuid>\n\t\t<declarationVersion>2</declarationVersion>"
+    b"\n\t\t<commentaire>caf\xc3\xa9 &amp; cr\xc3\xa8me</commentaire>\n\t</declaration>"
+)
+BULK = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<declarations>'
+    + DECL_A
+    + b"\n\t"
+    + DECL_B
+    + b"</declarations>\n"
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 13, 1 << 20])
+def test_iter_declaration_spans_chunk_boundaries(chunk_size):
+    spans = list(iter_declaration_spans(io.BytesIO(BULK), chunk_size=chunk_size))
+    assert [data for _, data in spans] == [DECL_A, DECL_B]
+    for offset, data in spans:
+        assert BULK[offset : offset + len(data)] == data
+
+
+def test_iter_declaration_spans_unterminated():
+    with pytest.raises(ValueError):
+        list(iter_declaration_spans(io.BytesIO(b"<declarations>" + DECL_A[:-5])))
+
+
+def test_declaration_key():
+    assert declaration_key(DECL_B) == ("bbb", "2")
+    assert declaration_key(b"<declaration></declaration>") == ("", "")
+
+
+def test_raw_split_matches_elementtree_split(tmp_path):
+    bulk = tmp_path / "declarations.xml"
+    bulk.write_bytes(BULK)
+    assert split_declarations(str(bulk), str(tmp_path / "tree")) == 2
+    assert split_declarations_raw(str(bulk), str(tmp_path / "raw")) == 2
+
+    names = sorted(p.name for p in (tmp_path / "tree").iterdir())
+    assert names == ["aaa-1.xml", "bbb-2.xml"]
+    for name in names:
+        assert (tmp_path / "raw" / name).read_bytes() == (tmp_path / "tree" / name).read_bytes()
+    assert DECL_B in (tmp_path / "raw" / "bbb-2.xml").read_bytes()
+
+
+def test_parallel_split_matches_raw_split(tmp_path):
+    decls = [
+        f"<declaration><uuid>u{i % 7}</uuid><declarationVersion>1</declarationVersion>"
+        f"<nom>n{i}</nom></declaration>".encode()
+        for i in range(40)
+    ]
+    # Declarations without a key are counted but not written, in both modes.
+    decls.insert(20, b"<declaration><nom>anonymous</nom></declaration>")
+    bulk = tmp_path / "declarations.xml"
+    bulk.write_bytes(b"<declarations>\n\t" + b"\n\t".join(decls) + b"\n</declarations>")
+
+    ranges = shard_ranges(bulk, 6)
+    assert ranges[0][0] == bulk.read_bytes().index(b"<declaration>")
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(ranges, ranges[1:]))
+
+    assert split_declarations_raw(str(bulk), str(tmp_path / "raw")) == 41
+    assert split_declarations_parallel(str(bulk), str(tmp_path / "par"), workers=2) == 41
+    names = sorted(p.name for p in (tmp_path / "raw").iterdir())
+    assert names == sorted(p.name for p in (tmp_path / "par").iterdir())
+    for name in names:
+        assert (tmp_path / "par" / name).read_bytes() == (tmp_path / "raw" / name).read_bytes()
+
+
+def test_incremental_split_rewrites_only_changes(tmp_path):
+    def bulk(*decls: bytes):
+        path = tmp_path / "declarations.xml"
+        path.write_bytes(b"<declarations>" + b"\n".join(decls) + b"</declarations>")
+        return str(path)
+
+    out = tmp_path / "split"
+    changes = split_declarations_incremental(bulk(DECL_A, DECL_B), str(out))
+    assert changes == {"aaa-1.xml": "added", "bbb-2.xml": "added"}
+    os.utime(out / "bbb-2.xml", (0, 0))
+
+    decl_a2 = DECL_A.replace(b"Dupont", b"Durand")
+    decl_c = DECL_A.replace(b"aaa", b"ccc")
+    changes = split_declarations_incremental(bulk(decl_a2, decl_c), str(out))
+    assert changes == {"aaa-1.xml": "changed", "bbb-2.xml": "removed", "ccc-1.xml": "added"}
+    assert (out / "bbb-2.xml").stat().st_mtime == 0
+    assert read_changes(out / "changes.csv") == changes
+    assert changed_names(out) == ["aaa-1.xml", "ccc-1.xml"]
+
+    changes = split_declarations_incremental(bulk(decl_a2, decl_c), str(out))
+    assert changes == {}
+
+    changes = split_declarations_incremental(bulk(decl_a2), str(out), prune=True)
+    assert changes == {"bbb-2.xml": "removed", "ccc-1.xml": "removed"}
+    assert sorted(p.name for p in out.glob("*.xml")) == ["aaa-1.xml"]
+
+
+def _with_attachment(uuid: str, server_name: str, payload: bytes) -> bytes:
+    return (
+        f"<declaration><uuid>{uuid}</uuid><declarationVersion>1</declarationVersion>"
+        f"<attachedFiles><attachedFiles><fileName>RECU</fileName>"
+        f"<serverFileName>{server_name}</serverFileName><base64EncodedContent>"
+    ).encode() + base64.encodebytes(payload) + (
+        b"</base64EncodedContent></attachedFiles></attachedFiles></declaration>"
+    )
+
+
+def test_strip_attachments_extracts_payloads(tmp_path):
+    data = _with_attachment("u1", "recu.pdf", b"%PDF-1") + _with_attachment("u2", "", b"%PDF-2")
+    stripped = strip_attachments(data, tmp_path, prefix="u-1")
+
+    assert b"PDF" not in stripped and stripped.count(b"<base64EncodedContent />") == 2
+    assert (tmp_path / "recu.pdf").read_bytes() == b"%PDF-1"
+    assert (tmp_path / "u-1-1-RECU").read_bytes() == b"%PDF-2"
+    assert strip_attachments(stripped) == stripped
+
+
+def test_raw_split_extracts_attachments(tmp_path):
+    src = tmp_path / "declarations.xml"
+    src.write_bytes(
+        b"<?xml version='1.0' encoding='utf-8'?>\n<declarations>"
+        + _with_attachment("u1", "", b"%PDF-1")
+        + b"</declarations>"
+    )
+    split_declarations_raw(
+        str(src), str(tmp_path / "out"), attachments="extract", attachments_dir=str(tmp_path / "att")
+    )
+
+    assert (tmp_path / "att" / "u1-1-0-RECU").read_bytes() == b"%PDF-1"
+    assert b"<base64EncodedContent />" in (tmp_path / "out" / "u1-1.xml").read_bytes()
+
+
+def test_extracted_attachments_with_same_server_name_are_kept(tmp_path):
+    src = tmp_path / "declarations.xml"
+    src.write_bytes(
+        b"<?xml version='1.0' encoding='utf-8'?>\n<declarations>"
+        + _with_attachment("u1", "recu.pdf", b"%PDF-1")
+        + _with_attachment("u2", "recu.pdf", b"%PDF-2")
+        + b"</declarations>"
+    )
+    split_declarations_raw(
+        str(src), str(tmp_path / "out"), attachments="extract", attachments_dir=str(tmp_path / "att")
+    )
+
+    assert (tmp_path / "att" / "recu.pdf").read_bytes() == b"%PDF-1"
+    assert (tmp_path / "att" / "recu-2.pdf").read_bytes() == b"%PDF-2"
+
+    data = _with_attachment("u3", "a.pdf", b"A") + _with_attachment("u3", "a.pdf", b"B")
+    strip_attachments(data, tmp_path / "one")
+    assert sorted(p.name for p in (tmp_path / "one").iterdir()) == ["a-2.pdf", "a.pdf"]
@@ -0,0 +1,38 @@
+import xml.etree.ElementTree as ET
+
+from benchmarks.synthetic_corpus import SyntheticCorpus
+from full_pipeline import DeclarationPipeline
+from script_to_split_declarations import split_declarations_raw
+
+
+def test_declarations_are_deterministic_and_parse():
+    first = list(SyntheticCorpus(seed=3).declarations(50))
+    assert first == list(SyntheticCorpus(seed=3).declarations(50))
+    assert first != list(SyntheticCorpus(seed=4).declarations(50))
+    for data in first:
+        root = ET.fromstring(data)
+        assert root.findtext("uuid")
+        assert root.find("general/declarant/nom") is not None
+
+
+def test_attachments_are_optional():
+    plain = b"".join(SyntheticCorpus(seed=1).declarations(20))
+    attached = b"".join(SyntheticCorpus(seed=1, attachments=1.0, attachment_size=1000).declarations(20))
+    assert plain.count(b"Justificatif.pdf") == 0
+    assert attached.count(b"Justificatif.pdf") == 20
+
+
+def test_bulk_dump_splits_and_extracts(tmp_path):
+    corpus = SyntheticCorpus(seed=7)
+    corpus.write_bulk(tmp_path / "declarations.xml", 40)
+    names = corpus.write_split(tmp_path / "expected", 40)
+
+    assert split_declarations_raw(str(tmp_path / "declarations.xml"), str(tmp_path / "split")) == 40
+    for name in names:
+        assert (tmp_path / "split" / name).read_bytes() == (tmp_path / "expected" / name).read_bytes()
+
+    data = DeclarationPipeline(tmp_path / "split").run()
+    assert len(data.personal_info) == 40
+    assert not data.spouse_activities.empty
+    assert not data.stocks.empty
+    assert not data.external_roles.empty